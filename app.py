@@ -1,11 +1,17 @@
 import streamlit as st
 import io
 import base64
-from pdf_processor import extract_text_from_pdf
-from translator import translate_text
+from pdf_processor import extract_text_from_pdf, get_page_count, hash_pdf, slice_pdf_pages
+from job_queue import JobQueue, get_job_queue
 from database import TranslationDatabase
-import PyPDF2  # PyPDF2 임포트 추가
-import time
+from revisions import find_prior_version
+from retention import RetentionManager, get_retention_manager
+from sections import Section, build_section_index
+from translator import warm_up_model
+import metrics
+import uuid
+from datetime import datetime, timedelta
+from typing import List
 
 # 페이지 설정
 st.set_page_config(
@@ -18,8 +24,310 @@ st.set_page_config(
 st.title("📄 PDF 논문 번역기")
 st.markdown("---")
 
-# 데이터베이스 초기화
-db = TranslationDatabase()
+# 데이터베이스 초기화 (프로세스 전체에서 한 번만 생성하고 연결 풀을 재사용)
+@st.cache_resource
+def get_database() -> TranslationDatabase:
+    database = TranslationDatabase()
+    # 압축 저장 이전의 번역 기록은 백그라운드에서 조금씩 압축
+    database.start_text_migration()
+    return database
+
+
+db = get_database()
+
+
+# 번역 작업 대기열 (워커 스레드는 서버 프로세스에서 한 번만 시작)
+@st.cache_resource
+def get_translation_job_queue() -> JobQueue:
+    return get_job_queue(db)
+
+
+job_queue = get_translation_job_queue()
+
+
+# 데이터베이스 크기 관리 (오래 열지 않은 PDF 정리와 빈 공간 반환, 서버 프로세스에서 한 번만 시작)
+@st.cache_resource
+def get_database_retention() -> RetentionManager:
+    return get_retention_manager(db)
+
+
+retention = get_database_retention()
+
+# 사이드바 번역 기록 한 페이지에 표시할 개수
+HISTORY_PAGE_SIZE = 20
+
+# 실패 후 이어서 번역하는 작업의 우선순위 (새 작업은 0)
+RESUME_JOB_PRIORITY = 1
+
+# 진행 중인 번역 작업의 상태와 미리 보기를 다시 확인하는 간격 (초)
+JOB_PROGRESS_REFRESH_SECONDS = 1
+
+
+def open_translation_record(translation_id: int):
+    """선택된 번역 기록 전체를 이때만 불러와서 세션 상태에 복원"""
+    full_record = db.get_translation_by_id(translation_id)
+    if not full_record:
+        st.warning("번역 기록을 찾을 수 없습니다.")
+        return
+    
+    st.session_state.original_text = full_record['original_text']
+    st.session_state.translated_text = full_record['translated_text']
+    st.session_state.current_translation_id = translation_id
+    st.session_state.is_loading_from_db = True
+    st.session_state.resume_job_id = None
+    st.session_state.revision_of = None
+    st.session_state.uploaded_file = None
+    st.session_state.pdf_uploaded = False
+    
+    # PDF 파일 복원 (PDF 뷰어를 위해)
+    pdf_bytes = full_record['pdf_data']
+    if pdf_bytes is not None:
+        # PDF 바이트 데이터 검증
+        if len(pdf_bytes) > 0:
+            st.session_state.uploaded_file = io.BytesIO(pdf_bytes)
+            st.session_state.pdf_uploaded = True
+        else:
+            st.warning("저장된 PDF 파일이 손상되었습니다.")
+    elif full_record['pdf_evicted']:
+        st.info("오래 열지 않은 기록이라 저장 공간 정리로 원본 PDF가 삭제되었습니다. 같은 PDF를 다시 올리면 복원됩니다.")
+
+
+# 페이지 미리보기에서 한 번에 보여줄 페이지 수
+PREVIEW_PAGE_WINDOW = 5
+
+PDF_VIEW_OPTIONS = ["페이지 미리보기 (권장)", "텍스트 보기", "PDF 전체 보기", "PDF 뷰어 (HTML iframe)"]
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def get_pdf_page_count(pdf_hash: str, _pdf_file) -> int:
+    """PDF 페이지 수 (문서 해시별로 캐시)"""
+    return get_page_count(_pdf_file.getvalue())
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_pdf_window(pdf_hash: str, start: int, end: int, _pdf_file) -> bytes:
+    """PDF에서 페이지 범위 [start, end)만 잘라낸 바이트 ((문서 해시, 페이지 범위)별로 캐시)"""
+    return slice_pdf_pages(_pdf_file.getvalue(), start, end)
+
+
+def move_preview_page(page: int, page_count: int):
+    """미리보기 시작 페이지 이동 (버튼 콜백이므로 위젯이 다시 그려지기 전에 실행됨)"""
+    st.session_state.preview_page = min(max(page, 1), page_count)
+
+
+def render_pdf_iframe(pdf_bytes: bytes):
+    """base64 data URI iframe으로 PDF 표시 (터치패드 확대/축소 및 마우스 드래그 지원)"""
+    base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
+    pdf_container = f"""
+    <div style="
+        height: 600px; 
+        overflow: auto; 
+        border: 1px solid #ddd; 
+        border-radius: 5px;
+        background-color: #f8f9fa;
+    ">
+        <iframe 
+            src="data:application/pdf;base64,{base64_pdf}#toolbar=1&navpanes=1&scrollbar=1&zoom=100" 
+            width="100%" 
+            height="100%" 
+            type="application/pdf"
+            style="border: none;"
+            allowfullscreen
+        >
+        </iframe>
+    </div>
+    """
+    st.markdown(pdf_container, unsafe_allow_html=True)
+
+
+def render_pdf_viewer(pdf_file, pdf_hash: str, original_text: str):
+    """
+    PDF 보기 방식 선택과 뷰어 표시
+
+    페이지 미리보기와 iframe 방식은 현재 페이지 범위만 잘라서 보내므로
+    문서가 길어져도 화면 조작마다 브라우저로 보내는 크기가 늘지 않는다.
+
+    Args:
+        pdf_file: PDF 파일 객체 (BytesIO 또는 업로드 파일)
+        pdf_hash: PDF 내용 해시 (잘라낸 페이지 캐시 키)
+        original_text: 텍스트 보기에 표시할 추출된 원문
+    """
+    view_option = st.radio(
+        "PDF 보기 방식 선택:",
+        PDF_VIEW_OPTIONS,
+        horizontal=True,
+        index=0 # 기본으로 '페이지 미리보기 (권장)' 선택
+    )
+
+    if view_option == "텍스트 보기":
+        st.text_area(
+            "추출된 원문 텍스트",
+            value=original_text,
+            height=600,
+            disabled=True
+        )
+        return
+
+    if view_option == "PDF 전체 보기":
+        # 문서 전체를 보내므로 큰 PDF에서는 느릴 수 있음
+        st.pdf(pdf_file.getvalue(), height=600)
+        return
+
+    page_count = get_pdf_page_count(pdf_hash, pdf_file)
+    if page_count == 0:
+        # 페이지 선택 위젯의 범위(1~0)를 만들 수 없으므로 미리보기 대신 안내만 표시
+        st.warning("PDF에 표시할 페이지가 없습니다. '텍스트 보기'로 추출된 원문을 확인하세요.")
+        return
+
+    # 다른 문서가 열리거나 보기 방식을 바꾸는 동안 위젯 상태가 지워지면 첫 페이지부터 표시
+    if st.session_state.get('preview_pdf_hash') != pdf_hash or 'preview_page' not in st.session_state:
+        st.session_state.preview_pdf_hash = pdf_hash
+        st.session_state.preview_page = 1
+    page = min(st.session_state.preview_page, page_count)
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("◀ 이전", disabled=page <= 1, use_container_width=True,
+                  on_click=move_preview_page, args=(page - PREVIEW_PAGE_WINDOW, page_count))
+    with col_page:
+        st.number_input(
+            f"시작 페이지 (전체 {page_count}쪽)",
+            min_value=1,
+            max_value=page_count,
+            key="preview_page",
+            label_visibility="collapsed"
+        )
+    with col_next:
+        st.button("다음 ▶", disabled=page + PREVIEW_PAGE_WINDOW > page_count, use_container_width=True,
+                  on_click=move_preview_page, args=(page + PREVIEW_PAGE_WINDOW, page_count))
+
+    end = min(page - 1 + PREVIEW_PAGE_WINDOW, page_count)
+    st.caption(f"{page}–{end}쪽 / 전체 {page_count}쪽")
+    window_bytes = get_pdf_window(pdf_hash, page - 1, end, pdf_file)
+
+    if view_option == "PDF 뷰어 (HTML iframe)":
+        render_pdf_iframe(window_bytes)
+    else:
+        st.pdf(window_bytes, height=600)
+
+# 번역문 뷰어에서 한 번에 보여줄 섹션 수
+SECTION_WINDOW = 3
+
+
+def get_translation_key(translated_text: str) -> tuple:
+    """
+    현재 번역문을 구분하는 키 (긴 번역문 자체를 비교하지 않기 위함)
+
+    저장된 번역은 번역 기록 id로, 진행 중이거나 실패한 작업의 일부 번역은 작업 id와 길이로 구분한다
+    (작업의 일부 번역은 완료된 청크가 늘어날 때만 바뀜).
+    """
+    translation_id = st.session_state.current_translation_id
+    if translation_id:
+        return ('translation', translation_id)
+    return ('job', st.session_state.resume_job_id or st.session_state.active_job_id, len(translated_text))
+
+
+def get_translated_sections(translated_text: str) -> List[Section]:
+    """
+    현재 번역문의 섹션 목차
+
+    번역 기록에 저장된 목차를 쓰고, 없으면 한 번 만들어 저장한다. 같은 번역문이면 세션에 둔 목차를 재사용한다.
+    """
+    key = get_translation_key(translated_text)
+    cached = st.session_state.get('section_cache')
+    if cached and cached[0] == key:
+        return cached[1]
+
+    translation_id = st.session_state.current_translation_id
+    sections = db.get_section_index(translation_id) if translation_id else None
+    if not sections or sections[-1][3] != len(translated_text):
+        sections = build_section_index(translated_text)
+        if translation_id:
+            db.save_section_index(translation_id, sections)
+
+    st.session_state.section_cache = (key, sections)
+    st.session_state.section_start = 0
+    return sections
+
+
+def move_section(start: int, section_count: int):
+    """번역문 뷰어 시작 섹션 이동 (버튼 콜백이므로 위젯이 다시 그려지기 전에 실행됨)"""
+    st.session_state.section_start = min(max(start, 0), section_count - 1)
+
+
+def render_translated_sections(translated_text: str):
+    """
+    번역문을 섹션 단위로 표시 (목차에서 고른 섹션부터 SECTION_WINDOW개만)
+
+    문서 전체 대신 보이는 섹션만 보내므로 긴 번역문에서도 화면 조작마다 다시 그리는 양이 일정하다.
+    """
+    sections = get_translated_sections(translated_text)
+    labels = [("\u3000" * max(0, level - 1)) + title for level, title, _, _ in sections]
+    st.session_state.section_start = min(st.session_state.get('section_start', 0), len(sections) - 1)
+    start = st.session_state.section_start
+
+    col_prev, col_toc, col_next = st.columns([1, 4, 1])
+    with col_prev:
+        st.button("◀ 이전", key="section_prev", disabled=start <= 0, use_container_width=True,
+                  on_click=move_section, args=(start - SECTION_WINDOW, len(sections)))
+    with col_toc:
+        st.selectbox(
+            "목차",
+            range(len(sections)),
+            format_func=lambda index: labels[index],
+            key="section_start",
+            label_visibility="collapsed"
+        )
+    with col_next:
+        st.button("다음 ▶", key="section_next", disabled=start + SECTION_WINDOW >= len(sections),
+                  use_container_width=True, on_click=move_section, args=(start + SECTION_WINDOW, len(sections)))
+
+    window = sections[start:start + SECTION_WINDOW]
+    st.caption(f"{start + 1}–{start + len(window)}번째 섹션 / 전체 {len(sections)}개")
+    with st.container(height=600, border=True):
+        st.markdown(translated_text[window[0][2]:window[-1][3]])
+
+
+def render_downloads(original_text: str, translated_text: str):
+    """다운로드 버튼 (파일 내용은 버튼을 눌렀을 때만 만들고 세션에 남기지 않음)"""
+    def markdown_content() -> str:
+        return f"""# 번역된 논문
+
+{translated_text}
+"""
+
+    def combined_content() -> str:
+        return f"""# 원문 (Original)
+
+{original_text}
+
+---
+
+# 번역본 (Translated)
+
+{translated_text}
+"""
+
+    # data에 함수를 넘기면 누를 때 별도 스레드에서 만들어 보냄 (on_click="ignore": 내려받아도 다시 실행하지 않음)
+    st.download_button(
+        label="📄 번역본 다운로드 (Markdown)",
+        data=markdown_content,
+        file_name="translated_paper.md",
+        mime="text/markdown",
+        on_click="ignore",
+        use_container_width=True
+    )
+
+    # 원문과 번역본을 함께 다운로드
+    st.download_button(
+        label="📄 원문+번역본 다운로드",
+        data=combined_content,
+        file_name="original_and_translated.md",
+        mime="text/markdown",
+        on_click="ignore",
+        use_container_width=True
+    )
+
 
 # 세션 상태 초기화
 if 'original_text' not in st.session_state:
@@ -34,6 +342,23 @@ if 'current_translation_id' not in st.session_state:
     st.session_state.current_translation_id = None
 if 'is_loading_from_db' not in st.session_state:
     st.session_state.is_loading_from_db = False
+if 'resume_job_id' not in st.session_state:
+    st.session_state.resume_job_id = None
+if 'active_job_id' not in st.session_state:
+    # 이 세션에서 대기열에 넣고 진행 상황을 확인 중인 번역 작업
+    st.session_state.active_job_id = None
+if 'revision_of' not in st.session_state:
+    # 업로드한 PDF의 이전 버전으로 보이는 번역 기록 (id, title, similarity)
+    st.session_state.revision_of = None
+if 'extracted_file_hash' not in st.session_state:
+    # 마지막으로 텍스트를 추출한 업로드 파일의 내용 해시
+    st.session_state.extracted_file_hash = None
+if 'history_cursors' not in st.session_state:
+    # 사이드바 번역 기록 페이지 커서 목록 (각 페이지 마지막 기록의 (created_at, id))
+    st.session_state.history_cursors = []
+if 'session_id' not in st.session_state:
+    # 요청 스케줄러가 세션별로 공정하게 할당량을 나누기 위한 식별자
+    st.session_state.session_id = uuid.uuid4().hex
 
 # 메인 레이아웃
 col1, col2 = st.columns([1, 1])
@@ -53,73 +378,43 @@ with col1:
     
     if uploaded_file is not None and not st.session_state.is_loading_from_db:
         try:
-            # PDF 텍스트 추출
-            with st.spinner("PDF에서 텍스트를 추출하는 중..."):
-                # .read()를 호출하면 포인터가 파일 끝으로 이동합니다.
-                # 추출 함수가 파일을 다시 읽어야 할 수 있으므로 .seek(0)가 필요할 수 있습니다.
-                uploaded_file.seek(0)
-                extracted_text = extract_text_from_pdf(uploaded_file)
-                st.session_state.original_text = extracted_text
-                st.session_state.pdf_uploaded = True
-                st.session_state.uploaded_file = uploaded_file
-                st.session_state.is_loading_from_db = False  # 새로운 파일 업로드
-            
-            st.success("PDF 텍스트 추출 완료!")
+            # 같은 PDF가 이미 추출되어 있으면 다시 추출하지 않음 (화면 조작마다 재실행되므로)
+            file_hash = hash_pdf(uploaded_file)
+            if file_hash == st.session_state.extracted_file_hash and st.session_state.original_text:
+                extracted_text = st.session_state.original_text
+            else:
+                # PDF 텍스트 추출 (다른 세션에서 추출한 적이 있으면 캐시에서 바로 가져옴)
+                with st.spinner("PDF에서 텍스트를 추출하는 중..."):
+                    # .read()를 호출하면 포인터가 파일 끝으로 이동합니다.
+                    # 추출 함수가 파일을 다시 읽어야 할 수 있으므로 .seek(0)가 필요할 수 있습니다.
+                    uploaded_file.seek(0)
+                    progress_bar = st.progress(0.0)
+                    with metrics.track_run("extraction"):
+                        extracted_text = extract_text_from_pdf(
+                            uploaded_file,
+                            on_progress=lambda done, total: progress_bar.progress(
+                                done / total, text=f"페이지 추출 중... ({done}/{total})"
+                            )
+                        )
+                    progress_bar.empty()
+                # 다른 파일이 업로드되면 이어서 번역할 작업 해제
+                if extracted_text != st.session_state.original_text:
+                    st.session_state.resume_job_id = None
+                st.session_state.extracted_file_hash = file_hash
+                
+                # 이미 번역한 논문의 새 버전이면 바뀐 문단만 번역할 수 있도록 이전 버전 기록 찾기
+                st.session_state.revision_of = find_prior_version(db, extracted_text, uploaded_file.name)
             
-            # PDF 파일을 바이트로 읽기 (st.pdf() 또는 base64 인코딩용)
-            # 텍스트 추출 후 포인터가 끝에 있을 수 있으므로 다시 0으로 이동
-            uploaded_file.seek(0)            
-            pdf_bytes = uploaded_file.read()
+            st.session_state.original_text = extracted_text
+            st.session_state.pdf_uploaded = True
+            st.session_state.uploaded_file = uploaded_file
+            st.session_state.is_loading_from_db = False  # 새로운 파일 업로드
             
-            # PDF 뷰어 옵션 제공
-            view_option = st.radio(
-                "PDF 보기 방식 선택:",
-                ["PDF 뷰어 (권장)", "텍스트 보기", "PDF 뷰어 (HTML iframe)"],
-                horizontal=True,
-                index=0 # 기본으로 'PDF 뷰어 (권장)' 선택
-            )
+            st.success("PDF 텍스트 추출 완료!")
             
-            if view_option == "PDF 뷰어 (권장)":
-                # --- 해결 방법 2: Streamlit 기본 st.pdf() 사용 (가장 안정적) ---
-                # st.pdf()는 바이트 데이터를 직접 받습니다.
-                # height 매개변수로 높이를 조절할 수 있습니다.
-                st.pdf(pdf_bytes, height=600)
-            
-            elif view_option == "PDF 뷰어 (HTML iframe)":
-                # --- 해결 방법 1: <embed> 대신 <iframe> 사용 ---
-                
-                # PDF 파일을 base64로 인코딩
-                base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-                
-                # iframe을 사용한 PDF 뷰어 (터치패드 확대/축소 및 마우스 드래그 지원)
-                pdf_container = f"""
-                <div style="
-                    height: 600px; 
-                    overflow: auto; 
-                    border: 1px solid #ddd; 
-                    border-radius: 5px;
-                    background-color: #f8f9fa;
-                ">
-                    <iframe 
-                        src="data:application/pdf;base64,{base64_pdf}#toolbar=1&navpanes=1&scrollbar=1&zoom=100" 
-                        width="100%" 
-                        height="100%" 
-                        type="application/pdf"
-                        style="border: none;"
-                        allowfullscreen
-                    >
-                    </iframe>
-                </div>
-                """
-                st.markdown(pdf_container, unsafe_allow_html=True)
-            else:
-                # 텍스트 보기
-                st.text_area(
-                    "추출된 원문 텍스트",
-                    value=extracted_text,
-                    height=600,
-                    disabled=True
-                )
+            # PDF 뷰어 (추출 후 포인터가 끝에 있을 수 있으므로 다시 0으로 이동)
+            uploaded_file.seek(0)
+            render_pdf_viewer(uploaded_file, file_hash, extracted_text)
             
         except Exception as e:
             st.error(f"PDF 처리 중 오류가 발생했습니다: {str(e)}")
@@ -127,57 +422,14 @@ with col1:
     # 데이터베이스에서 불러온 번역 기록이 있는 경우 PDF 뷰어 표시
     if st.session_state.is_loading_from_db and st.session_state.uploaded_file:
         try:
-            # 데이터베이스에서 불러온 PDF 파일 처리
-            pdf_bytes = st.session_state.uploaded_file.read()
-            st.session_state.uploaded_file.seek(0)  # 포인터 리셋
-            
             st.success("번역 기록에서 PDF를 불러왔습니다!")
             
-            # PDF 뷰어 옵션 제공
-            view_option = st.radio(
-                "PDF 보기 방식 선택:",
-                ["PDF 뷰어 (권장)", "텍스트 보기", "PDF 뷰어 (HTML iframe)"],
-                horizontal=True,
-                index=0 # 기본으로 'PDF 뷰어 (권장)' 선택
+            render_pdf_viewer(
+                st.session_state.uploaded_file,
+                hash_pdf(st.session_state.uploaded_file),
+                st.session_state.original_text
             )
             
-            if view_option == "PDF 뷰어 (권장)":
-                st.pdf(pdf_bytes, height=600)
-            
-            elif view_option == "PDF 뷰어 (HTML iframe)":
-                # PDF 파일을 base64로 인코딩
-                base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-                
-                # iframe을 사용한 PDF 뷰어 (터치패드 확대/축소 및 마우스 드래그 지원)
-                pdf_container = f"""
-                <div style="
-                    height: 600px; 
-                    overflow: auto; 
-                    border: 1px solid #ddd; 
-                    border-radius: 5px;
-                    background-color: #f8f9fa;
-                ">
-                    <iframe 
-                        src="data:application/pdf;base64,{base64_pdf}#toolbar=1&navpanes=1&scrollbar=1&zoom=100" 
-                        width="100%" 
-                        height="100%" 
-                        type="application/pdf"
-                        style="border: none;"
-                        allowfullscreen
-                    >
-                    </iframe>
-                </div>
-                """
-                st.markdown(pdf_container, unsafe_allow_html=True)
-            else:
-                # 텍스트 보기
-                st.text_area(
-                    "추출된 원문 텍스트",
-                    value=st.session_state.original_text,
-                    height=600,
-                    disabled=True
-                )
-            
         except Exception as e:
             st.error(f"PDF 처리 중 오류가 발생했습니다: {str(e)}")
     
@@ -194,114 +446,116 @@ with col1:
 with col2:
     st.subheader("🇰🇷 번역본")
     
-    # 번역 버튼
-    if st.session_state.pdf_uploaded and st.session_state.original_text:
-        if st.button("🔄 번역 시작", type="primary", use_container_width=True):
+    # 번역 버튼 (실패한 작업을 불러온 경우 이어서 번역)
+    resume_job_id = st.session_state.resume_job_id
+    if st.session_state.pdf_uploaded and st.session_state.original_text and not st.session_state.active_job_id:
+        if resume_job_id:
+            st.info("중단된 번역 작업입니다. 완료된 부분은 다시 번역하지 않고 이어서 진행합니다.")
+        
+        revision_of = st.session_state.revision_of if not resume_job_id else None
+        use_revision = False
+        if revision_of:
+            st.info(f"이전 버전으로 보이는 번역 기록이 있습니다: {revision_of['title']} "
+                    f"(원문 유사도 {revision_of['similarity']:.0%})")
+            use_revision = st.checkbox("바뀐 문단만 번역하고 나머지는 이전 번역 재사용", value=True)
+        button_label = "▶️ 이어서 번역" if resume_job_id else "🔄 번역 시작"
+        if st.button(button_label, type="primary", use_container_width=True):
             try:
-                with st.spinner("번역 중... (시간이 다소 걸릴 수 있습니다)"):
-                    translated_text = translate_text(st.session_state.original_text)
-                    st.session_state.translated_text = translated_text
-                    
-                    # 번역 기록 저장
-                    import re
-                    import datetime
-                    
-                    # 마크다운에서 제목 추출 (첫 번째 # 제목)
-                    title_match = re.search(r'^#\s+(.+)$', translated_text, re.MULTILINE)
-                    if title_match:
-                        title = title_match.group(1).strip()
-                    else:
-                        title = f"번역_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                    
-                    # PDF 바이트 데이터 준비 (업로드된 파일에서 직접 읽기)
-                    pdf_bytes = None
+                if resume_job_id:
+                    # 이미 일부 번역된 작업이므로 새 작업보다 먼저 처리
+                    job_queue.retry(resume_job_id, priority=RESUME_JOB_PRIORITY)
+                    job_id = resume_job_id
+                else:
+                    # PDF 파일 준비 (데이터베이스가 파일 객체에서 조각 단위로 직접 읽어서 저장)
+                    pdf_file = None
                     if st.session_state.uploaded_file:
-                        # 파일 포인터를 처음으로 이동
-                        st.session_state.uploaded_file.seek(0)
-                        pdf_bytes = st.session_state.uploaded_file.read()
-                        st.session_state.uploaded_file.seek(0)  # 포인터 리셋
+                        pdf_file = st.session_state.uploaded_file
+                        # 파일 크기 확인 후 포인터를 처음으로 이동
+                        pdf_file.seek(0, io.SEEK_END)
+                        pdf_size = pdf_file.tell()
+                        pdf_file.seek(0)
                         
-                        # PDF 바이트 데이터 검증
-                        if len(pdf_bytes) == 0:
+                        # PDF 데이터 검증
+                        if pdf_size == 0:
                             st.warning("PDF 파일이 비어있습니다. 번역은 저장되지만 PDF는 저장되지 않습니다.")
-                            pdf_bytes = None
+                            pdf_file = None
                     
-                    # 데이터베이스에 번역 기록 저장
-                    translation_id = db.save_translation(
-                        title=title,
-                        original_text=st.session_state.original_text,
-                        translated_text=translated_text,
-                        pdf_bytes=pdf_bytes
-                    )
-                    
-                    st.session_state.current_translation_id = translation_id
+                    # 번역 작업을 대기열에 넣음 (번역은 백그라운드 워커가 진행하므로 화면은 바로 응답)
+                    job_title = getattr(st.session_state.uploaded_file, 'name', None) or \
+                        f"번역_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                    if use_revision:
+                        job_id, _ = job_queue.submit_revision(
+                            job_title,
+                            st.session_state.original_text,
+                            revision_of['id'],
+                            pdf_file,
+                            owner=st.session_state.session_id
+                        )
+                    else:
+                        job_id = job_queue.submit(
+                            job_title,
+                            st.session_state.original_text,
+                            pdf_file,
+                            owner=st.session_state.session_id
+                        )
                 
-                st.success("번역 완료!")
+                st.session_state.active_job_id = job_id
+                st.session_state.resume_job_id = None
+                st.rerun()
                 
             except Exception as e:
-                st.error(f"번역 중 오류가 발생했습니다: {str(e)}")
+                st.error(f"번역 작업을 시작하지 못했습니다: {str(e)}")
     
-    # 번역본 표시
-    if st.session_state.translated_text:
-        # 스크롤 가능한 마크다운 컨테이너 (PDF 뷰어와 동일한 높이)
-        st.markdown("### 번역된 문서")
+    # 진행 중인 번역 작업 상태 확인 (이 부분만 주기적으로 다시 실행)
+    @st.fragment(run_every=JOB_PROGRESS_REFRESH_SECONDS)
+    def show_job_progress():
+        job_id = st.session_state.active_job_id
+        if not job_id:
+            return
         
-        # 스크롤 가능한 마크다운 뷰어 (PDF 뷰어와 정확히 같은 위치에서 시작)
-        markdown_container = f"""
-        <div style="
-            height: 600px; 
-            overflow-y: auto; 
-            border: 1px solid #ddd; 
-            border-radius: 5px;
-            padding: 15px;
-            background-color: #ffffff;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            margin-top: 60px;
-        ">
-            <div style="line-height: 1.6; color: #333333;">
-                {st.session_state.translated_text}
-            </div>
-        </div>
-        """
-        st.markdown(markdown_container, unsafe_allow_html=True)
+        job = db.get_job_status(job_id)
+        if job is None:
+            st.session_state.active_job_id = None
+            st.warning("번역 작업을 찾을 수 없습니다.")
+            return
         
-        # 다운로드 버튼
-        st.markdown("---")
-        st.subheader("📥 다운로드")
+        if job['status'] == 'completed':
+            record = db.get_translation_by_id(job['translation_id'])
+            st.session_state.active_job_id = None
+            if record:
+                st.session_state.translated_text = record['translated_text']
+                st.session_state.current_translation_id = record['id']
+            st.rerun()
         
-        # 번역본을 마크다운 형식으로 변환
-        markdown_content = f"""# 번역된 논문
-
-{st.session_state.translated_text}
-"""
+        elif job['status'] == 'failed':
+            st.session_state.active_job_id = None
+            st.session_state.resume_job_id = job_id
+            st.error(f"번역 중 오류가 발생했습니다: {job['error']}")
+            st.info("완료된 부분은 저장되었습니다. 다시 시도하면 중단된 지점부터 이어서 번역합니다.")
         
-        st.download_button(
-            label="📄 번역본 다운로드 (Markdown)",
-            data=markdown_content,
-            file_name="translated_paper.md",
-            mime="text/markdown",
-            use_container_width=True
-        )
+        elif job['status'] == 'queued':
+            st.info(f"번역 대기 중... (앞에 {job['queue_position']}개 작업)")
         
-        # 원문과 번역본을 함께 다운로드
-        combined_content = f"""# 원문 (Original)
-
-{st.session_state.original_text}
-
----
-
-# 번역본 (Translated)
-
-{st.session_state.translated_text}
-"""
+        else:
+            done, total = job['completed_chunks'], job['total_chunks']
+            st.progress(done / total if total else 0.0, text=f"번역 중... ({done}/{total} 청크)")
+            # 지금까지 번역된 부분 미리 보기 (번역 중인 청크는 응답을 받은 데까지)
+            partial = db.get_job_preview_texts(job_id)
+            if partial:
+                st.markdown("\n\n".join(partial))
+    
+    if st.session_state.active_job_id:
+        show_job_progress()
+    
+    # 번역본 표시 (섹션 단위)
+    if st.session_state.translated_text:
+        st.markdown("### 번역된 문서")
+        render_translated_sections(st.session_state.translated_text)
         
-        st.download_button(
-            label="📄 원문+번역본 다운로드",
-            data=combined_content,
-            file_name="original_and_translated.md",
-            mime="text/markdown",
-            use_container_width=True
-        )
+        # 다운로드 버튼
+        st.markdown("---")
+        st.subheader("📥 다운로드")
+        render_downloads(st.session_state.original_text, st.session_state.translated_text)
 
 # 사이드바에 사용법 안내 및 번역 기록
 with st.sidebar:
@@ -323,6 +577,8 @@ with st.sidebar:
         st.session_state.uploaded_file = None
         st.session_state.current_translation_id = None
         st.session_state.is_loading_from_db = False
+        st.session_state.resume_job_id = None
+        st.session_state.active_job_id = None
         
         # 삭제 확인 상태들도 초기화
         for key in list(st.session_state.keys()):
@@ -333,11 +589,89 @@ with st.sidebar:
     
     st.markdown("---")
     
+    # 미완료 번역 작업 섹션 (대기 중, 진행 중, 실패한 작업)
+    incomplete_jobs = db.get_incomplete_jobs()
+    if incomplete_jobs:
+        st.markdown("## ⏸️ 미완료 번역")
+        for job in incomplete_jobs:
+            col_job, col_job_delete = st.columns([4, 1])
+            is_selected = job['id'] in (st.session_state.resume_job_id, st.session_state.active_job_id)
+            
+            with col_job:
+                if st.button(
+                    f"{'▶️' if job['status'] == 'failed' else '⏳'} {job['title'][:25]}{'...' if len(job['title']) > 25 else ''}",
+                    key=f"resume_{job['id']}",
+                    use_container_width=True,
+                    type="primary" if is_selected else "secondary",
+                    help="완료된 부분부터 이어서 번역합니다" if job['status'] == 'failed' else "진행 상황을 확인합니다"
+                ):
+                    job_detail = db.get_job(job['id'])
+                    st.session_state.original_text = job_detail['original_text']
+                    # 지금까지 번역된 부분 표시
+                    st.session_state.translated_text = "\n\n".join(
+                        chunk['translated_text'] for chunk in job_detail['chunks'] if chunk['status'] == 'completed'
+                    )
+                    st.session_state.current_translation_id = None
+                    if job['status'] == 'failed':
+                        st.session_state.resume_job_id = job['id']
+                        st.session_state.active_job_id = None
+                    else:
+                        st.session_state.resume_job_id = None
+                        st.session_state.active_job_id = job['id']
+                    st.session_state.is_loading_from_db = True
+                    st.session_state.pdf_uploaded = True
+                    st.session_state.uploaded_file = io.BytesIO(job_detail['pdf_data']) if job_detail['pdf_data'] else None
+                    st.rerun()
+            
+            with col_job_delete:
+                # 워커가 번역 중인 작업은 삭제하지 않음
+                if st.button("🗑️", key=f"delete_job_{job['id']}", help="미완료 작업 삭제", type="secondary",
+                             disabled=job['status'] == 'running'):
+                    db.delete_job(job['id'])
+                    if st.session_state.resume_job_id == job['id']:
+                        st.session_state.resume_job_id = None
+                    if st.session_state.active_job_id == job['id']:
+                        st.session_state.active_job_id = None
+                    st.rerun()
+            
+            status_label = {'queued': "대기 중", 'running': "번역 중", 'failed': "실패"}.get(job['status'], "중단됨")
+            st.caption(f"{status_label} · {job['completed_chunks']}/{job['total_chunks']} 청크 완료 · {job['updated_at']}")
+        
+        st.markdown("---")
+    
+    # 번역 기록 검색 (원문/번역문 전문 검색)
+    st.markdown("## 🔍 번역 기록 검색")
+    search_query = st.text_input(
+        "검색어",
+        key="history_search",
+        placeholder="원문 또는 번역문에서 검색",
+        label_visibility="collapsed"
+    )
+    if search_query.strip():
+        search_results = db.search_translations(search_query)
+        if search_results:
+            for hit in search_results:
+                if st.button(
+                    f"🔎 {hit['title'][:25]}{'...' if len(hit['title']) > 25 else ''}",
+                    key=f"search_{hit['id']}",
+                    use_container_width=True
+                ):
+                    open_translation_record(hit['id'])
+                    st.rerun()
+                st.caption(hit['snippet'].replace("\n", " "))
+        else:
+            st.info("검색 결과가 없습니다.")
+    
+    st.markdown("---")
+    
     # 번역 기록 섹션
     st.markdown("## 📚 번역 기록")
     
-    # 데이터베이스에서 번역 기록 불러오기
-    translations = db.get_all_translations()
+    # 데이터베이스에서 번역 기록 목록 불러오기 (제목/시간만, 페이지 단위)
+    cursors = st.session_state.history_cursors
+    page = db.get_translation_summaries(limit=HISTORY_PAGE_SIZE + 1, before=cursors[-1] if cursors else None)
+    has_next_page = len(page) > HISTORY_PAGE_SIZE
+    translations = page[:HISTORY_PAGE_SIZE]
     
     if translations:
         for record in translations:
@@ -356,30 +690,7 @@ with st.sidebar:
                         use_container_width=True,
                         type="primary" if is_current else "secondary"
                     ):
-                        # 선택된 번역 기록으로 복원
-                        st.session_state.original_text = record['original_text']
-                        st.session_state.translated_text = record['translated_text']
-                        st.session_state.current_translation_id = record['id']
-                        st.session_state.is_loading_from_db = True
-                        
-                        # PDF 파일 복원 (PDF 뷰어를 위해)
-                        if record['pdf_data']:
-                            import io
-                            try:
-                                pdf_bytes = base64.b64decode(record['pdf_data'])
-                                # PDF 바이트 데이터 검증
-                                if len(pdf_bytes) > 0:
-                                    st.session_state.uploaded_file = io.BytesIO(pdf_bytes)
-                                    st.session_state.pdf_uploaded = True
-                                else:
-                                    st.warning("저장된 PDF 파일이 손상되었습니다.")
-                                    st.session_state.uploaded_file = None
-                                    st.session_state.pdf_uploaded = False
-                            except Exception as e:
-                                st.error(f"PDF 파일 복원 중 오류가 발생했습니다: {str(e)}")
-                                st.session_state.uploaded_file = None
-                                st.session_state.pdf_uploaded = False
-                        
+                        open_translation_record(record['id'])
                         st.rerun()
                 
                 with col_delete:
@@ -395,6 +706,8 @@ with st.sidebar:
                             # 실제 삭제 실행
                             if db.delete_translation(record['id']):
                                 st.success(f"'{record['title']}' 번역 기록이 삭제되었습니다.")
+                                # 삭제로 생긴 빈 공간을 백그라운드에서 반환
+                                retention.wake()
                                 # 현재 선택된 기록이 삭제된 경우 상태 초기화
                                 if st.session_state.current_translation_id == record['id']:
                                     st.session_state.original_text = ""
@@ -419,9 +732,118 @@ with st.sidebar:
                 st.warning(f"'{record['title']}' 번역 기록을 삭제하시겠습니까? 다시 삭제 버튼을 클릭하면 삭제됩니다.")
             
             st.markdown("---")
+        # 페이지 이동 (키셋 커서)
+        col_prev, col_next = st.columns(2)
+        with col_prev:
+            if cursors and st.button("◀ 최신 기록", key="history_prev", use_container_width=True):
+                st.session_state.history_cursors = cursors[:-1]
+                st.rerun()
+        with col_next:
+            if has_next_page and st.button("이전 기록 ▶", key="history_next", use_container_width=True):
+                last = translations[-1]
+                st.session_state.history_cursors = cursors + [(last['created_at'], last['id'])]
+                st.rerun()
     else:
         st.info("아직 번역 기록이 없습니다.")
     
+    # 성능 지표 (켰을 때만 조회)
+    if metrics.METRICS_ENABLED and st.toggle("📊 성능 지표 보기", key="show_metrics"):
+        store = metrics.get_metrics_store()
+        since = datetime.now() - timedelta(hours=metrics.METRICS_WINDOW_HOURS)
+        latencies = store.get_latencies(since, kind="translation")
+        wall_latencies = store.get_latencies(since, kind="translation", wall=True)
+        
+        if latencies['total']:
+            st.caption(f"최근 {metrics.METRICS_WINDOW_HOURS}시간 번역 {len(latencies['total'])}건")
+            col_p50, col_p95 = st.columns(2)
+            col_p50.metric("p50", f"{metrics.percentile(latencies['total'], 50):.1f}초")
+            col_p95.metric("p95", f"{metrics.percentile(latencies['total'], 95):.1f}초")
+            
+            # 단계별 소요 시간 (경과 시간과 동시에 실행된 워커의 시간을 모두 더한 값을 따로 표시)
+            st.dataframe(
+                [
+                    {
+                        "단계": name,
+                        "경과 p50 (초)": round(metrics.percentile(wall_latencies.get(name, []), 50), 2),
+                        "경과 p95 (초)": round(metrics.percentile(wall_latencies.get(name, []), 95), 2),
+                        "워커 합계 p50 (초)": round(metrics.percentile(values, 50), 2),
+                    }
+                    for name, values in latencies.items() if name != 'total'
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+            st.caption("경과 시간은 겹치는 시간을 한 번만 센 값이고, 워커 합계는 청크를 동시에 번역한 "
+                       "워커들의 시간을 모두 더한 값이라 전체 소요 시간보다 클 수 있습니다.")
+            
+            # 시간대별 처리량
+            hourly = store.get_hourly_throughput(since)
+            st.line_chart(
+                {
+                    "완료 건수": [row['runs'] for row in hourly],
+                    "평균 소요 시간 (초)": [row['avg_seconds'] for row in hourly],
+                },
+                height=160
+            )
+
+            # 문서별로 원문 그대로 둔 구간(참고문헌, 표, 수식 등) 덕분에 줄어든 토큰과 시간
+            st.dataframe(
+                [
+                    {
+                        "문서": run['label'] or "-",
+                        "소요 시간 (초)": round(run['total_seconds'], 1),
+                        "보낸 입력 토큰": run['input_tokens'],
+                        "그대로 둔 토큰": run['passthrough_tokens'],
+                        "절약 시간 추정 (초)": round(metrics.estimate_saved_seconds(run), 1),
+                    }
+                    for run in store.get_recent_runs(limit=10) if run['status'] == 'ok'
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+        else:
+            st.info(f"최근 {metrics.METRICS_WINDOW_HOURS}시간 동안 완료된 번역이 없습니다.")
+        
+        st.download_button(
+            label="Prometheus 형식으로 내보내기",
+            data=store.render_prometheus(),
+            file_name="translator_metrics.prom",
+            mime="text/plain",
+            use_container_width=True
+        )
+    
+    # 저장 공간 (원문/번역문 압축으로 줄어든 크기)
+    if st.toggle("💾 저장 공간 보기", key="show_storage"):
+        usage = db.get_storage_usage()
+        budget = f" / 한도 {retention.max_bytes / 1024 / 1024:.0f}MB" if retention.max_bytes > 0 else ""
+        st.caption(
+            f"사용 중 {usage['used_bytes'] / 1024 / 1024:.1f}MB{budget} · "
+            f"파일 {usage['file_bytes'] / 1024 / 1024:.1f}MB · PDF {usage['pdf_bytes'] / 1024 / 1024:.1f}MB"
+        )
+        if retention.last_result and retention.last_result['over_budget']:
+            other_mb = (retention.last_result['used_bytes'] - retention.last_result['pdf_bytes']) / 1024 / 1024
+            st.warning(
+                f"PDF를 정리해도 한도를 맞출 수 없습니다. PDF 외의 데이터(번역 기록, 캐시, 지표)가 {other_mb:.1f}MB입니다."
+            )
+        if retention.last_error:
+            st.warning(f"데이터베이스 정리 중 오류가 발생했습니다: {retention.last_error}")
+        if db.migration_error:
+            st.warning(f"기존 번역 기록 압축 중 오류가 발생했습니다: {db.migration_error}")
+        st.dataframe(
+            [
+                {
+                    "테이블": row['table'],
+                    "행 수": row['rows'],
+                    "압축 전 (MB)": round(row['raw_bytes'] / 1024 / 1024, 2),
+                    "저장 크기 (MB)": round(row['stored_bytes'] / 1024 / 1024, 2),
+                    "절약 (MB)": round(row['saved_bytes'] / 1024 / 1024, 2),
+                }
+                for row in db.get_storage_report()
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+    
     st.markdown("## ⚠️ 주의사항")
     st.markdown("""
     - 구글 제미나이 API 키가 필요합니다
@@ -440,3 +862,6 @@ with st.sidebar:
 # 푸터
 st.markdown("---")
 st.markdown("Made with ❤️ using Streamlit and Google Gemini AI")
+
+# 화면을 모두 그린 뒤 사용자가 PDF를 고르는 동안 제미나이 모델을 미리 준비 (프로세스에서 한 번만)
+warm_up_model()
@@ -0,0 +1,204 @@
+"""
+PDF 일괄 번역 명령줄 도구
+
+디렉터리(하위 디렉터리 포함) 또는 목록 파일에 있는 PDF를 워커 풀에서 번역하고
+번역 기록 데이터베이스에 저장한다. 내용 해시가 같은 PDF가 이미 저장되어 있으면 건너뛴다.
+
+실행: python batch_translate.py papers/ --workers 4
+      python batch_translate.py manifest.txt --db translations.db
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import metrics
+from database import TranslationDatabase
+from pdf_processor import extract_text_from_pdf, hash_pdf
+
+# 동시에 처리할 PDF 파일 수 (청크 단위 동시 번역은 TRANSLATION_MAX_WORKERS로 따로 조절)
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "2"))
+
+
+def collect_pdf_paths(sources: Iterable[str]) -> List[Path]:
+    """
+    번역할 PDF 경로 목록 만들기
+
+    Args:
+        sources: PDF 파일, 디렉터리(하위 디렉터리까지 탐색) 또는 목록 파일
+            (한 줄에 경로 하나, 빈 줄과 '#'으로 시작하는 줄은 무시, 상대 경로는 목록 파일 기준)
+
+    Returns:
+        List[Path]: 중복을 제거한 PDF 경로 목록 (입력 순서 유지)
+    """
+    paths = []
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            paths.extend(sorted(p for p in source.rglob("*") if p.is_file() and p.suffix.lower() == ".pdf"))
+        elif source.suffix.lower() == ".pdf":
+            paths.append(source)
+        else:
+            for line in source.read_text(encoding="utf-8").splitlines():
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    path = Path(line)
+                    paths.append(path if path.is_absolute() else source.parent / path)
+
+    return list(dict.fromkeys(paths))
+
+
+def translate_pdf_file(path: Path, db: TranslationDatabase, translate_fn: Callable[[str, str], str],
+                       claimed: set, claimed_lock: threading.Lock) -> Dict:
+    """
+    PDF 하나를 추출·번역해서 저장
+
+    Returns:
+        Dict: path, status ('done', 'skipped', 'failed'), translation_id, seconds, error,
+            passthrough_tokens/input_tokens (성능 지표 수집이 켜져 있을 때만)
+    """
+    started = time.perf_counter()
+    result = {'path': str(path), 'status': 'done', 'translation_id': None, 'error': None}
+    try:
+        with open(path, 'rb') as pdf_file:
+            pdf_hash = hash_pdf(pdf_file)
+
+            # 이미 저장된 PDF이거나 이번 실행에서 같은 내용의 파일을 처리 중이면 건너뜀
+            with claimed_lock:
+                existing_id = db.find_translation_by_pdf_hash(pdf_hash)
+                if existing_id is not None or pdf_hash in claimed:
+                    result.update(status='skipped', translation_id=existing_id)
+                    return result
+                claimed.add(pdf_hash)
+
+            try:
+                with metrics.track_run("translation", label=path.name) as run:
+                    original_text = extract_text_from_pdf(pdf_file)
+                    if not original_text:
+                        raise Exception("PDF에서 텍스트를 추출하지 못했습니다.")
+
+                    # 파일마다 세션을 나누어 요청 스케줄러가 파일 사이에 할당량을 공정하게 나누도록 함
+                    translated_text = translate_fn(original_text, f"batch:{pdf_hash[:16]}")
+                    with metrics.stage("save"):
+                        result['translation_id'] = db.save_translation(path.stem, original_text, translated_text,
+                                                                       pdf_file)
+                    if run is not None:
+                        result['passthrough_tokens'] = run.counters['passthrough_tokens']
+                        result['input_tokens'] = run.counters['input_tokens']
+            except Exception:
+                # 실패한 내용은 같은 실행에서 뒤에 오는 같은 내용의 파일이 다시 시도할 수 있도록 풀어 줌
+                with claimed_lock:
+                    claimed.discard(pdf_hash)
+                raise
+
+    except Exception as e:
+        result.update(status='failed', error=str(e))
+
+    finally:
+        result['seconds'] = time.perf_counter() - started
+
+    return result
+
+
+def run_batch(paths: List[Path], db: TranslationDatabase, workers: int = BATCH_WORKERS,
+              translate_fn: Optional[Callable[[str, str], str]] = None,
+              on_result: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    PDF 목록을 워커 풀에서 번역하는 함수
+
+    Args:
+        paths: 번역할 PDF 경로 목록
+        db: 번역 기록을 저장할 데이터베이스
+        workers: 동시에 처리할 파일 수
+        translate_fn: (원문, 세션 id)를 받아 번역문을 돌려주는 함수 (None이면 translator.translate_text)
+        on_result: 파일 하나가 끝날 때마다 결과 Dict로 호출되는 콜백
+
+    Returns:
+        Dict: results (파일별 결과 목록), elapsed_seconds (전체 소요 시간)
+    """
+    if translate_fn is None:
+        # 번역기를 바꿔 끼운 경우 제미나이 클라이언트를 불러오지 않도록 필요할 때만 임포트
+        from translator import translate_text
+        translate_fn = translate_text
+
+    claimed = set()
+    claimed_lock = threading.Lock()
+    results = []
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(translate_pdf_file, path, db, translate_fn, claimed, claimed_lock)
+                   for path in paths]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    return {'results': results, 'elapsed_seconds': time.perf_counter() - started}
+
+
+def summarize(batch: Dict) -> Dict:
+    """일괄 번역 결과에서 처리량, 지연 시간 백분위수, 실패 목록 계산"""
+    results = batch['results']
+    elapsed = batch['elapsed_seconds']
+    done = [r for r in results if r['status'] == 'done']
+    latencies = sorted(r['seconds'] for r in done)
+
+    return {
+        'total': len(results),
+        'done': len(done),
+        'skipped': sum(1 for r in results if r['status'] == 'skipped'),
+        'failed': [r for r in results if r['status'] == 'failed'],
+        'elapsed_seconds': elapsed,
+        'files_per_minute': len(done) / elapsed * 60 if elapsed > 0 else 0.0,
+        'p50_seconds': metrics.percentile(latencies, 50),
+        'p90_seconds': metrics.percentile(latencies, 90),
+        'p99_seconds': metrics.percentile(latencies, 99),
+        'max_seconds': latencies[-1] if latencies else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PDF 일괄 번역")
+    parser.add_argument("sources", nargs="+", help="PDF 파일, 디렉터리 또는 목록 파일")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="동시에 처리할 파일 수")
+    parser.add_argument("--db", default="translations.db", help="번역 기록 데이터베이스 경로")
+    args = parser.parse_args(argv)
+
+    paths = collect_pdf_paths(args.sources)
+    if not paths:
+        print("번역할 PDF가 없습니다.")
+        return 0
+
+    db = TranslationDatabase(args.db)
+    print(f"PDF {len(paths)}개 번역 시작 (워커 {args.workers}개)")
+
+    def report(result):
+        label = {'done': '완료', 'skipped': '건너뜀', 'failed': '실패'}[result['status']]
+        saved = ""
+        if result.get('passthrough_tokens'):
+            sent = result['passthrough_tokens'] + result['input_tokens']
+            saved = f", 원문 그대로 둔 구간 약 {result['passthrough_tokens']}토큰 ({result['passthrough_tokens'] / sent:.0%})"
+        print(f"[{label}] {result['path']} ({result['seconds']:.1f}초{saved})", flush=True)
+
+    summary = summarize(run_batch(paths, db, workers=args.workers, on_result=report))
+
+    print()
+    print(f"전체 {summary['total']}개: 완료 {summary['done']}, 건너뜀 {summary['skipped']}, "
+          f"실패 {len(summary['failed'])}")
+    print(f"소요 시간 {summary['elapsed_seconds']:.1f}초, 처리량 {summary['files_per_minute']:.2f}개/분")
+    print(f"파일당 소요 시간 p50 {summary['p50_seconds']:.1f}초, p90 {summary['p90_seconds']:.1f}초, "
+          f"p99 {summary['p99_seconds']:.1f}초, 최대 {summary['max_seconds']:.1f}초")
+    for failure in summary['failed']:
+        print(f"  실패: {failure['path']} - {failure['error']}")
+
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
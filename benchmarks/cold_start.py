@@ -0,0 +1,159 @@
+"""
+앱 시작(콜드 스타트) 벤치마크
+
+매번 새 파이썬 프로세스를 띄워서 다음을 측정한다 (각 항목을 --repeats번 측정한 중앙값, 밀리초).
+- app_imports: 앱이 시작할 때 불러오는 모듈(streamlit 제외)의 import 시간
+- eager_app_imports: google.generativeai, PyPDF2를 먼저 불러오는 예전 방식의 import 시간 (비교 기준)
+- first_model_cold: 미리 준비 없이 첫 번역 요청에서 제미나이 모델을 얻는 시간 (라이브러리 import 포함)
+- first_model_warm: warm_up_model()을 호출하고 --idle-seconds만큼 기다린 뒤 모델을 얻는 시간
+- per_request_setup_old: 예전처럼 요청마다 genai.configure + GenerativeModel을 만드는 시간
+- per_request_setup_reused: 재사용하는 모델을 다시 얻는 시간
+
+API 호출은 하지 않는다. google.generativeai가 설치되어 있지 않으면 모델 관련 항목은 null로 남긴다.
+
+실행: python benchmarks/cold_start.py --output cold_start.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import textwrap
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app.py가 시작할 때 불러오는 프로젝트 모듈 (streamlit은 어느 쪽이든 필요하므로 제외)
+APP_MODULES = ["pdf_processor", "job_queue", "database", "revisions", "retention", "sections", "metrics", "translator"]
+
+# 예전에 앱 시작 시 바로 불러오던 무거운 의존성
+EAGER_MODULES = ["google.generativeai", "PyPDF2"]
+
+_PRELUDE = textwrap.dedent("""
+    import importlib, importlib.util, json, os, sys, time
+    sys.path.insert(0, {root!r})
+    os.environ.setdefault("GOOGLE_API_KEY", "cold-start-benchmark")
+    os.environ["TRANSLATION_BACKEND"] = "gemini"
+
+    def has(module):
+        # 설치 여부만 확인 (불러오지 않으므로 측정에 영향 없음)
+        try:
+            return importlib.util.find_spec(module) is not None
+        except ImportError:
+            return False
+""")
+
+_CHILD_SCRIPTS = {
+    'app_imports': """
+        started = time.perf_counter()
+        for module in {app_modules!r}:
+            importlib.import_module(module)
+        print(json.dumps((time.perf_counter() - started) * 1000))
+    """,
+    'eager_app_imports': """
+        started = time.perf_counter()
+        for module in {eager_modules!r}:
+            if has(module):
+                importlib.import_module(module)
+        for module in {app_modules!r}:
+            importlib.import_module(module)
+        print(json.dumps((time.perf_counter() - started) * 1000))
+    """,
+    'first_model_cold': """
+        import translator
+        if not has("google.generativeai"):
+            print(json.dumps(None)); sys.exit(0)
+        started = time.perf_counter()
+        translator.get_gemini_model()
+        print(json.dumps((time.perf_counter() - started) * 1000))
+    """,
+    'first_model_warm': """
+        import translator
+        if not has("google.generativeai"):
+            print(json.dumps(None)); sys.exit(0)
+        translator.warm_up_model()
+        time.sleep({idle_seconds!r})
+        started = time.perf_counter()
+        translator.get_gemini_model()
+        print(json.dumps((time.perf_counter() - started) * 1000))
+    """,
+    'per_request_setup_old': """
+        if not has("google.generativeai"):
+            print(json.dumps(None)); sys.exit(0)
+        import google.generativeai as genai
+        genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+        genai.GenerativeModel("gemini-2.5-flash")
+        started = time.perf_counter()
+        for _ in range(100):
+            genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+            genai.GenerativeModel("gemini-2.5-flash")
+        print(json.dumps((time.perf_counter() - started) * 1000 / 100))
+    """,
+    'per_request_setup_reused': """
+        import translator
+        if not has("google.generativeai"):
+            print(json.dumps(None)); sys.exit(0)
+        translator.get_gemini_model()
+        started = time.perf_counter()
+        for _ in range(100):
+            translator._get_model()
+        print(json.dumps((time.perf_counter() - started) * 1000 / 100))
+    """,
+}
+
+
+def run_child(name: str, idle_seconds: float) -> Optional[float]:
+    """새 프로세스에서 측정 스크립트 하나 실행 (밀리초, 측정할 수 없으면 None)"""
+    script = _PRELUDE.format(root=ROOT) + textwrap.dedent(_CHILD_SCRIPTS[name]).format(
+        app_modules=APP_MODULES, eager_modules=EAGER_MODULES, idle_seconds=idle_seconds
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} 측정 실패:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_cold_start(repeats: int, idle_seconds: float) -> Dict[str, Optional[float]]:
+    results = {}
+    for name in _CHILD_SCRIPTS:
+        samples = [run_child(name, idle_seconds) for _ in range(repeats)]
+        samples = [sample for sample in samples if sample is not None]
+        results[name] = round(statistics.median(samples), 3) if samples else None
+        print(f"{name:<28} {'-' if results[name] is None else f'{results[name]:.1f}ms'}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="앱 시작(콜드 스타트) 벤치마크")
+    parser.add_argument("--output", default="cold_start_results.json", help="결과 JSON 파일")
+    parser.add_argument("--repeats", type=int, default=5, help="항목별 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--idle-seconds", type=float, default=3.0,
+                        help="first_model_warm에서 미리 준비를 시작한 뒤 첫 요청까지 기다리는 시간")
+    args = parser.parse_args(argv)
+
+    results = bench_cold_start(max(1, args.repeats), args.idle_seconds)
+    installed = {module: subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True).returncode == 0
+                 for module in EAGER_MODULES}
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeats': args.repeats,
+            'idle_seconds': args.idle_seconds,
+            'installed': installed,
+        },
+        'results': results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
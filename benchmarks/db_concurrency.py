@@ -0,0 +1,125 @@
+"""
+데이터베이스 동시 접근 벤치마크
+
+읽기 스레드 여러 개와 쓰기 스레드 하나를 동시에 돌려서 초당 처리량과 잠금 오류 수를 비교한다.
+- before: 매 호출마다 sqlite3.connect 후 닫는 방식 (기본 rollback journal)
+- after: TranslationDatabase (연결 풀 + WAL + busy timeout)
+
+실행: python benchmarks/db_concurrency.py --readers 8 --seconds 5
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import TranslationDatabase  # noqa: E402
+
+SAMPLE_TEXT = "Lorem ipsum dolor sit amet. " * 200
+
+
+class ConnectPerCallDatabase:
+    """기존 방식: 호출마다 새 연결 (비교용)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        conn = sqlite3.connect(db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                original_text TEXT,
+                translated_text TEXT,
+                pdf_data BLOB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def save_translation(self, title, original_text, translated_text, pdf_bytes=None):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO translations (title, original_text, translated_text, pdf_data, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (title, original_text, translated_text, pdf_bytes, datetime.now(), datetime.now()))
+        translation_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return translation_id
+
+    def get_translation_summaries(self, limit=20, before=None):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, title, created_at, updated_at FROM translations ORDER BY created_at DESC LIMIT ?',
+                       (limit,))
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+
+def run(db, readers: int, seconds: float) -> dict:
+    """읽기/쓰기 스레드를 돌려서 처리량 측정"""
+    stop = threading.Event()
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def reader():
+        while not stop.is_set():
+            try:
+                db.get_translation_summaries(limit=20)
+                key = 'reads'
+            except sqlite3.OperationalError:
+                key = 'errors'
+            with lock:
+                counts[key] += 1
+
+    def writer():
+        while not stop.is_set():
+            try:
+                db.save_translation("bench", SAMPLE_TEXT, SAMPLE_TEXT)
+                key = 'writes'
+            except sqlite3.OperationalError:
+                key = 'errors'
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'reads_per_sec': counts['reads'] / seconds,
+        'writes_per_sec': counts['writes'] / seconds,
+        'errors': counts['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터베이스 동시 접근 벤치마크")
+    parser.add_argument("--readers", type=int, default=8, help="읽기 스레드 수")
+    parser.add_argument("--seconds", type=float, default=5.0, help="측정 시간 (초)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        before = run(ConnectPerCallDatabase(os.path.join(tmp_dir, "before.db")), args.readers, args.seconds)
+        after = run(TranslationDatabase(os.path.join(tmp_dir, "after.db")), args.readers, args.seconds)
+
+    print(f"{'':8} {'reads/s':>10} {'writes/s':>10} {'errors':>8}")
+    for name, result in (("before", before), ("after", after)):
+        print(f"{name:8} {result['reads_per_sec']:>10.1f} {result['writes_per_sec']:>10.1f} {result['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+오프라인 성능 벤치마크
+
+실제 제미나이 API 대신 가짜 백엔드(fake_gemini)를 사용하고, 합성 PDF(1~500쪽)로 다음을 측정한다.
+- extraction: PDF 텍스트 추출 속도 (초당 페이지 수, 순차/프로세스 풀)
+- pipeline: 추출+번역 파이프라인 처리량 (초당 페이지/청크/문자 수)
+- database: 번역 기록 10/1k/10k건에서 저장 및 목록 조회 지연 시간
+- 각 측정의 최대 메모리 사용량 (tracemalloc, 프로세스 풀 자식 프로세스는 제외)
+
+결과는 JSON 파일로 저장되며, --baseline으로 이전 결과와 비교할 수 있다.
+
+실행: python benchmarks/suite.py --output bench.json
+      python benchmarks/suite.py --quick --baseline bench.json --max-regression 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 벤치마크가 요청 한도에 막히지 않도록 스케줄러 한도를 높임 (환경 변수로 직접 지정하면 그 값 사용)
+os.environ.setdefault("GEMINI_RPM", "1000000")
+os.environ.setdefault("GEMINI_TPM", "1000000000")
+
+import metrics  # noqa: E402
+import pipeline  # noqa: E402
+import translator  # noqa: E402
+from database import TranslationDatabase  # noqa: E402
+from fake_gemini import FakeGenerativeModel  # noqa: E402
+from pdf_processor import extract_pages  # noqa: E402
+from synthetic_pdf import make_lines, make_pdf  # noqa: E402
+
+PAGE_SIZES = [1, 10, 100, 500]
+ROW_COUNTS = [10, 1000, 10000]
+QUICK_PAGE_SIZES = [1, 10, 50]
+QUICK_ROW_COUNTS = [10, 1000]
+
+# 이전 결과와 비교할 지표 (구역, 지표 이름, 클수록 좋은지)
+COMPARED_METRICS = [
+    ("extraction", "pages_per_sec", True),
+    ("pipeline", "pages_per_sec", True),
+    ("database", "insert_p50_ms", False),
+    ("database", "list_first_page_p50_ms", False),
+    ("database", "list_deep_page_p50_ms", False),
+]
+
+
+def timed(fn: Callable) -> Tuple[object, float]:
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def peak_memory_mb(fn: Callable) -> float:
+    """fn 실행 중 파이썬 메모리 할당 최대치 (MB)"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_extraction(sizes: List[int], measure_memory: bool) -> List[Dict]:
+    results = []
+    for pages in sizes:
+        pdf_bytes = make_pdf(pages)
+        modes = [("serial", False)] + ([("parallel", True)] if pages >= 10 else [])
+        for mode, parallel in modes:
+            (texts, failed), seconds = timed(lambda: extract_pages(pdf_bytes, parallel=parallel))
+            results.append({
+                'pages': pages,
+                'mode': mode,
+                'pdf_bytes': len(pdf_bytes),
+                'chars': sum(len(text) for text in texts),
+                'failed_pages': len(failed),
+                'seconds': seconds,
+                'pages_per_sec': pages / seconds,
+                'peak_memory_mb': peak_memory_mb(lambda: extract_pages(pdf_bytes, parallel=parallel))
+                if measure_memory else None,
+            })
+            print(f"extraction {pages:>4}p {mode:8} {pages / seconds:10.1f} pages/s", flush=True)
+    return results
+
+
+def bench_pipeline(sizes: List[int], fake_options: Dict, measure_memory: bool) -> List[Dict]:
+    results = []
+    for pages in sizes:
+        pdf_bytes = make_pdf(pages, seed=pages)
+        model = FakeGenerativeModel(**fake_options)
+        translator.set_model_factory(lambda: model, backend_name="fake")
+        try:
+            result, seconds = timed(lambda: pipeline.translate_pdf(pdf_bytes, session_id="benchmark"))
+            calls = model.calls
+            peak = peak_memory_mb(lambda: pipeline.translate_pdf(pdf_bytes, session_id="benchmark")) \
+                if measure_memory else None
+        finally:
+            translator.set_model_factory(None)
+
+        results.append({
+            'pages': pages,
+            'chunks': calls,
+            'chars': len(result['original_text']),
+            'seconds': seconds,
+            'pages_per_sec': pages / seconds,
+            'chunks_per_sec': calls / seconds,
+            'chars_per_sec': len(result['original_text']) / seconds,
+            'peak_memory_mb': peak,
+        })
+        print(f"pipeline   {pages:>4}p {pages / seconds:10.1f} pages/s ({calls} chunks, {seconds:.2f}s)", flush=True)
+    return results
+
+
+def bench_database(row_counts: List[int], samples: int = 50) -> List[Dict]:
+    results = []
+    text = " ".join(make_lines(random.Random(0), 25))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = TranslationDatabase(os.path.join(tmp_dir, "bench.db"))
+        rows = 0
+        for target in row_counts:
+            # 측정용 저장 전까지 채우기
+            while rows < target - samples:
+                db.save_translation(f"paper {rows}", text, text)
+                rows += 1
+
+            insert_times = []
+            while rows < target:
+                insert_times.append(timed(lambda: db.save_translation(f"paper {rows}", text, text))[1])
+                rows += 1
+
+            first_page = [timed(lambda: db.get_translation_summaries(limit=20))[1] for _ in range(samples)]
+            middle = db.get_translation_summaries(limit=rows // 2)[-1]
+            cursor = (middle['created_at'], middle['id'])
+            deep_page = [timed(lambda: db.get_translation_summaries(limit=20, before=cursor))[1]
+                         for _ in range(samples)]
+
+            insert_times.sort()
+            first_page.sort()
+            deep_page.sort()
+            results.append({
+                'rows': rows,
+                'insert_p50_ms': metrics.percentile(insert_times, 50) * 1000,
+                'insert_p95_ms': metrics.percentile(insert_times, 95) * 1000,
+                'list_first_page_p50_ms': metrics.percentile(first_page, 50) * 1000,
+                'list_first_page_p95_ms': metrics.percentile(first_page, 95) * 1000,
+                'list_deep_page_p50_ms': metrics.percentile(deep_page, 50) * 1000,
+                'list_deep_page_p95_ms': metrics.percentile(deep_page, 95) * 1000,
+            })
+            print(f"database   {rows:>6} rows insert p50 {results[-1]['insert_p50_ms']:.2f}ms, "
+                  f"list p50 {results[-1]['list_first_page_p50_ms']:.2f}ms", flush=True)
+    return results
+
+
+def _row_key(section: str, row: Dict) -> Tuple:
+    return (section, row.get('pages', row.get('rows')), row.get('mode'))
+
+
+def compare(current: Dict, baseline: Dict, max_regression: Optional[float]) -> bool:
+    """
+    이전 결과와 비교해서 변화율 출력
+
+    Returns:
+        bool: max_regression보다 크게 나빠진 지표가 있으면 True
+    """
+    baseline_rows = {
+        _row_key(section, row): row
+        for section, rows in baseline['results'].items() for row in rows
+    }
+    regressed = False
+    print()
+    print(f"{'지표':44} {'이전':>10} {'현재':>10} {'변화':>8}")
+    for section, name, higher_is_better in COMPARED_METRICS:
+        for row in current['results'].get(section, []):
+            old_row = baseline_rows.get(_row_key(section, row))
+            if not old_row or not old_row.get(name):
+                continue
+            old, new = old_row[name], row[name]
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = ""
+            if max_regression is not None and worse > max_regression:
+                regressed = True
+                flag = " !"
+            label = f"{section} {name} {_row_key(section, row)[1]}{' ' + row['mode'] if row.get('mode') else ''}"
+            print(f"{label:44} {old:>10.2f} {new:>10.2f} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except Exception:
+        return None
+
+
+def max_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # 리눅스는 KB, macOS는 바이트 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="오프라인 성능 벤치마크")
+    parser.add_argument("--output", default="benchmark_results.json", help="결과 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--max-regression", type=float, help="이 비율보다 나빠진 지표가 있으면 종료 코드 1")
+    parser.add_argument("--quick", action="store_true", help="작은 크기로만 측정")
+    parser.add_argument("--only", choices=["extraction", "pipeline", "database"], action="append",
+                        help="일부 구역만 측정 (여러 번 지정 가능)")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 생략 (측정 시간 절반)")
+    parser.add_argument("--fake-latency", type=float, default=0.05, help="가짜 모델 응답 지연 시간 (초)")
+    parser.add_argument("--fake-tokens-per-second", type=float, default=20000, help="가짜 모델 출력 토큰 속도")
+    parser.add_argument("--fake-rate-limit-rate", type=float, default=0.0, help="가짜 모델 429 오류 확률")
+    parser.add_argument("--fake-truncation-rate", type=float, default=0.0, help="가짜 모델 출력 잘림 확률")
+    args = parser.parse_args(argv)
+
+    # 측정 결과가 번역 캐시, 번역 메모리, 성능 지표 저장에 영향받지 않도록 끔
+    translator.CACHE_ENABLED = False
+    translator.MEMORY_ENABLED = False
+    metrics.METRICS_ENABLED = False
+
+    sections = args.only or ["extraction", "pipeline", "database"]
+    page_sizes = QUICK_PAGE_SIZES if args.quick else PAGE_SIZES
+    row_counts = QUICK_ROW_COUNTS if args.quick else ROW_COUNTS
+    fake_options = {
+        'latency': args.fake_latency,
+        'tokens_per_second': args.fake_tokens_per_second,
+        'rate_limit_rate': args.fake_rate_limit_rate,
+        'truncation_rate': args.fake_truncation_rate,
+        'seed': 0,
+    }
+
+    results = {}
+    if "extraction" in sections:
+        results['extraction'] = bench_extraction(page_sizes, not args.no_memory)
+    if "pipeline" in sections:
+        results['pipeline'] = bench_pipeline(page_sizes, fake_options, not args.no_memory)
+    if "database" in sections:
+        results['database'] = bench_database(row_counts)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec="seconds"),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'quick': args.quick,
+            'fake_backend': fake_options,
+            'max_rss_mb': max_rss_mb(),
+        },
+        'results': results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
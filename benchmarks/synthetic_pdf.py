@@ -0,0 +1,75 @@
+"""
+벤치마크용 합성 논문 PDF 생성
+
+외부 라이브러리 없이 페이지마다 텍스트 줄이 들어 있는 PDF를 직접 만든다.
+다섯 페이지마다 섹션 제목("3 Results" 형식)을 넣어 청크 분할이 실제 논문과 비슷하게 동작하도록 한다.
+"""
+import random
+from typing import List
+
+WORDS = (
+    "model data training results method analysis network performance learning approach "
+    "experiment evaluation dataset accuracy baseline feature layer parameter optimization "
+    "distribution sample error function representation structure observed significant "
+    "however therefore proposed previous compared improvement across between within"
+).split()
+
+SECTION_TITLES = ["Introduction", "Related Work", "Method", "Experiments", "Results", "Discussion", "Conclusion"]
+
+
+def make_lines(rng: random.Random, count: int, words_per_line: int = 12) -> List[str]:
+    """문장처럼 보이는 텍스트 줄 목록"""
+    lines = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(words_per_line)]
+        lines.append(" ".join(words).capitalize() + ".")
+    return lines
+
+
+def make_pdf(pages: int, lines_per_page: int = 45, seed: int = 0) -> bytes:
+    """
+    합성 PDF 생성
+
+    Args:
+        pages: 페이지 수
+        lines_per_page: 페이지당 텍스트 줄 수 (줄당 약 80자)
+        seed: 난수 시드 (같은 시드면 같은 PDF)
+
+    Returns:
+        bytes: PDF 바이트
+    """
+    rng = random.Random(seed)
+    font_id = 3 + 2 * pages
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(pages))}] /Count {pages} >>",
+    ]
+
+    for page_num in range(pages):
+        lines = make_lines(rng, lines_per_page)
+        if page_num % 5 == 0:
+            section = page_num // 5
+            lines.insert(0, f"{section + 1} {SECTION_TITLES[section % len(SECTION_TITLES)]}")
+
+        text_ops = " T* ".join(f"({line}) Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 14 TL 56 770 Td {text_ops} ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * page_num} 0 R "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    output += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+               f"startxref\n{xref_offset}\n%%EOF\n").encode("latin-1")
+    return bytes(output)
@@ -1,118 +1,801 @@
 import sqlite3
-import base64
+import hashlib
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+import logging
+import lzma
+import os
+import queue
+import re
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import BinaryIO, Iterator, List, Dict, Optional, Tuple, Union
+
+# PDF를 나누어 읽고 쓸 때 한 번에 다루는 크기
+PDF_IO_CHUNK_SIZE = 1024 * 1024
+
+# 원문/번역문 저장 시 압축 방식 (zlib, lzma, none - none이면 새로 저장하는 텍스트는 압축하지 않음)
+TEXT_CODEC = os.getenv("TRANSLATION_TEXT_CODEC", "zlib").lower()
+
+# 이보다 짧은 텍스트(UTF-8 바이트)는 압축하지 않음
+TEXT_COMPRESS_MIN_BYTES = int(os.getenv("TRANSLATION_TEXT_COMPRESS_MIN_BYTES", "512"))
+
+# 압축 전에 저장된 기존 행을 압축할 때 트랜잭션 하나에서 처리하는 행 수
+TEXT_MIGRATION_BATCH_SIZE = 20
+
+# 체크포인트 후 WAL 파일을 이 크기 이하로 줄임 (바이트)
+WAL_SIZE_LIMIT_BYTES = 64 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+# 압축된 값의 머리 (방식 표시 1바이트 + 원래 UTF-8 길이 4바이트)와 방식별 압축/해제 함수
+_TEXT_HEADER = struct.Struct('<cI')
+_TEXT_CODECS = {
+    b'z': (lambda data: zlib.compress(data, 6), zlib.decompress),
+    b'x': (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+_CODEC_MARKERS = {'zlib': b'z', 'lzma': b'x'}
+
+# 압축해서 저장하는 컬럼 (테이블별)
+COMPRESSED_COLUMNS = {
+    'translations': ('original_text', 'translated_text'),
+    'translation_jobs': ('original_text',),
+}
+
+
+def compress_text(text: Optional[str], codec: Optional[str] = None) -> Union[str, bytes, None]:
+    """
+    저장할 텍스트를 압축 (방식 표시와 원래 길이를 앞에 붙인 BLOB)
+
+    짧거나 압축해도 줄지 않는 텍스트, 압축 방식이 none이면 TEXT 그대로 돌려준다.
+
+    Args:
+        text: 저장할 텍스트
+        codec: 압축 방식 (None이면 TEXT_CODEC)
+
+    Returns:
+        Union[str, bytes, None]: 압축한 BLOB 또는 원래 텍스트
+    """
+    marker = _CODEC_MARKERS.get(codec or TEXT_CODEC)
+    if text is None or marker is None:
+        return text
+
+    data = text.encode('utf-8')
+    if len(data) < TEXT_COMPRESS_MIN_BYTES:
+        return text
+
+    compressed = _TEXT_HEADER.pack(marker, len(data)) + _TEXT_CODECS[marker][0](data)
+    return compressed if len(compressed) < len(data) else text
+
+
+def decompress_text(value: Union[str, bytes, None]) -> Optional[str]:
+    """compress_text로 저장한 값을 텍스트로 되돌림 (압축되지 않은 TEXT는 그대로)"""
+    if value is None or isinstance(value, str):
+        return value
+    marker, _ = _TEXT_HEADER.unpack_from(value)
+    return _TEXT_CODECS[marker][1](value[_TEXT_HEADER.size:]).decode('utf-8')
+
+
+def _make_snippet(text: str, terms: List[str], width: int = 40) -> str:
+    """검색어가 처음 나오는 곳 앞뒤 width글자를 잘라 검색어를 **로 강조 (FTS snippet()을 쓸 수 없을 때 사용)"""
+    lowered = text.lower()
+    positions = [position for position in (lowered.find(term.lower()) for term in terms) if position >= 0]
+    if not positions:
+        return text[:width * 2] + ("…" if len(text) > width * 2 else "")
+
+    start = max(0, min(positions) - width)
+    end = min(len(text), min(positions) + width)
+    snippet = text[start:end]
+    for term in terms:
+        snippet = re.sub(re.escape(term), lambda match: f"**{match.group(0)}**", snippet, flags=re.IGNORECASE)
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+class ConnectionPool:
+    """
+    SQLite 연결 풀
+
+    연결을 매번 새로 여는 대신 재사용하고, 모든 연결에 WAL 모드와 성능 관련 PRAGMA를 적용한다.
+    WAL 모드에서는 쓰기 작업 중에도 여러 읽기 작업이 동시에 진행될 수 있다.
+    """
+    
+    def __init__(self, db_path: str, max_connections: int = 8, busy_timeout_ms: int = 5000,
+                 cache_size_kb: int = 16384):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self._idle = queue.LifoQueue(maxsize=max_connections)
+    
+    def _create_connection(self) -> sqlite3.Connection:
+        """새 연결 생성 및 PRAGMA 설정"""
+        # isolation_level=None: 자동 커밋 모드 (트랜잭션은 transaction()에서 직접 시작)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{self.cache_size_kb}")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA journal_size_limit={WAL_SIZE_LIMIT_BYTES}")
+        # 압축 저장된 원문/번역문을 SQL(전문 검색 트리거, 조회)에서 풀기 위한 함수
+        conn.create_function("decompress_text", 1, decompress_text, deterministic=True)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """풀에서 연결을 빌려 쓰고 돌려주는 컨텍스트 (읽기용, 자동 커밋)"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._create_connection()
+
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """쓰기 트랜잭션 컨텍스트 (정상 종료 시 커밋, 예외 발생 시 롤백)"""
+        with self.connection() as conn:
+            # 쓰기 잠금을 처음부터 잡아서 중간에 잠금 승격 실패(database is locked)를 피함
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """유휴 연결 모두 닫기"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: str) -> ConnectionPool:
+    """데이터베이스 파일별로 프로세스 전체에서 공유하는 연결 풀"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+        return pool
+
 
 class TranslationDatabase:
     def __init__(self, db_path: str = "translations.db"):
         self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
+        self._migration_thread = None
+        # 백그라운드 압축이 실패했을 때 마지막 오류 메시지 (화면에 표시)
+        self.migration_error: Optional[str] = None
+        self._init_auto_vacuum()
         self.init_database()
     
+    def _init_auto_vacuum(self):
+        """새 데이터베이스는 테이블을 만들기 전에 auto_vacuum을 INCREMENTAL로 설정 (빈 파일이라 VACUUM이 바로 끝남)"""
+        with self.pool.connection() as conn:
+            if conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0:
+                # WAL 모드로 연 뒤에는 빈 데이터베이스도 VACUUM을 해야 설정이 적용됨
+                conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                conn.execute('VACUUM')
+    
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        기존 데이터베이스의 auto_vacuum을 INCREMENTAL로 바꾸는 유지 보수 작업
+
+        설정을 적용하려면 전체 VACUUM이 한 번 필요하고 그동안 쓰기가 막히므로
+        생성자에서 하지 않고 정리 작업(RetentionManager)이 백그라운드에서 호출한다. 이미 설정되어 있으면 바로 끝난다.
+
+        Returns:
+            bool: 이번 호출에서 VACUUM을 실행했으면 True
+        """
+        with self.pool.connection() as conn:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+                return False
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            return True
+    
     def init_database(self):
         """데이터베이스 테이블 초기화"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 번역 기록 테이블 생성
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            # 번역 기록 테이블 생성
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    original_text TEXT,
+                    translated_text TEXT,
+                    pdf_data BLOB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # 번역 기록 목록 정렬용 인덱스 (최신순 + 키셋 페이지네이션)
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translations_created_at
+                ON translations (created_at DESC, id DESC)
+            ''')
+            
+            # 번역 작업(청크 단위 체크포인트) 테이블 생성
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    original_text TEXT,
+                    pdf_data BLOB,
+                    status TEXT NOT NULL DEFAULT 'running',
+                    total_chunks INTEGER NOT NULL,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_job_chunks (
+                    job_id INTEGER NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (job_id, chunk_index)
+                )
+            ''')
+            
+            # PDF 원본 저장소 (SHA-256으로 중복 제거, 참조 횟수로 삭제 관리)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS pdf_blobs (
+                    id INTEGER PRIMARY KEY,
+                    sha256 TEXT NOT NULL UNIQUE,
+                    size INTEGER NOT NULL,
+                    ref_count INTEGER NOT NULL DEFAULT 0,
+                    data BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            self._add_column_if_missing(cursor, 'translations', 'pdf_sha256', 'TEXT')
+            self._add_column_if_missing(cursor, 'translation_jobs', 'pdf_sha256', 'TEXT')
+            
+            # 저장 공간 정리용 접근 시간 (오래 열지 않은 PDF부터 내용을 지움, 지운 PDF는 evicted_at 기록)
+            self._add_column_if_missing(cursor, 'pdf_blobs', 'last_accessed_at', 'TIMESTAMP')
+            self._add_column_if_missing(cursor, 'pdf_blobs', 'evicted_at', 'TIMESTAMP')
+            self._add_column_if_missing(cursor, 'translations', 'last_opened_at', 'TIMESTAMP')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_pdf_blobs_last_accessed
+                ON pdf_blobs (evicted_at, last_accessed_at)
+            ''')
+            
+            # 작업 대기열 컬럼 (우선순위, 요청한 세션, 중복 제출 확인용 원문 해시, 완료된 번역 기록 id)
+            self._add_column_if_missing(cursor, 'translation_jobs', 'priority', 'INTEGER NOT NULL DEFAULT 0')
+            self._add_column_if_missing(cursor, 'translation_jobs', 'owner', 'TEXT')
+            self._add_column_if_missing(cursor, 'translation_jobs', 'dedupe_key', 'TEXT')
+            self._add_column_if_missing(cursor, 'translation_jobs', 'translation_id', 'INTEGER')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translation_jobs_queue
+                ON translation_jobs (status, priority DESC, created_at, id)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translation_jobs_dedupe_key
+                ON translation_jobs (dedupe_key)
+            ''')
+            
+            # 개정판 연결 (이전 버전 번역 기록 id, 이전 버전 찾기용 원문 제목 줄과 MinHash 서명)
+            self._add_column_if_missing(cursor, 'translations', 'parent_id', 'INTEGER')
+            self._add_column_if_missing(cursor, 'translations', 'source_title', 'TEXT')
+            self._add_column_if_missing(cursor, 'translations', 'text_signature', 'BLOB')
+            self._add_column_if_missing(cursor, 'translation_jobs', 'parent_id', 'INTEGER')
+            
+            # 작업을 가져간 워커와 마지막 생존 신호 시각 (신호가 끊긴 작업만 다른 워커가 다시 가져감)
+            self._add_column_if_missing(cursor, 'translation_jobs', 'claimed_by', 'TEXT')
+            self._add_column_if_missing(cursor, 'translation_jobs', 'heartbeat_at', 'TIMESTAMP')
+            
+            # 번역 중인 청크의 지금까지 받은 번역문 (진행 중 미리 보기용, 청크가 끝나면 NULL)
+            self._add_column_if_missing(cursor, 'translation_job_chunks', 'partial_text', 'TEXT')
+            
+            # 번역문 섹션 목차 (JSON, 번역문이 바뀌면 NULL로 지우고 다음에 볼 때 다시 만듦)
+            self._add_column_if_missing(cursor, 'translations', 'section_index', 'TEXT')
+            
+            # 번역 기록의 문단 묶음별 번역문 (개정판에서 바뀌지 않은 문단의 번역 재사용)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_blocks (
+                    translation_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    paragraph_hashes TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    PRIMARY KEY (translation_id, position)
+                )
+            ''')
+            
+            # 같은 PDF가 이미 번역되었는지 확인하기 위한 인덱스
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translations_pdf_sha256
+                ON translations (pdf_sha256)
+            ''')
+            
+            self._init_search_index(cursor)
+            
+            # 행 안에 저장되어 있던 기존 PDF를 저장소로 옮김
+            # (id 순서로 한 행씩, 내용은 증분 BLOB I/O로 조각씩 읽어서 여러 PDF를 한꺼번에 메모리에 올리지 않음)
+            for table in ('translations', 'translation_jobs'):
+                last_id = 0
+                while True:
+                    cursor.execute(f'''
+                        SELECT id FROM {table}
+                        WHERE pdf_data IS NOT NULL AND id > ?
+                        ORDER BY id LIMIT 1
+                    ''', (last_id,))
+                    row = cursor.fetchone()
+                    if not row:
+                        break
+                    last_id = row[0]
+                    with conn.blobopen(table, 'pdf_data', last_id, readonly=True) as pdf_data:
+                        sha256 = self._store_pdf(conn, pdf_data)
+                    cursor.execute(f'UPDATE {table} SET pdf_sha256 = ?, pdf_data = NULL WHERE id = ?',
+                                   (sha256, last_id))
+    
+    @staticmethod
+    def _init_search_index(cursor):
+        """
+        원문/번역문 전문 검색용 FTS5 인덱스와 동기화 트리거 생성
+
+        원문/번역문은 압축되어 저장될 수 있으므로 인덱스는 압축을 푼 뷰(translations_fts_content)를
+        내용 테이블로 쓰고, 트리거도 압축을 푼 텍스트로 인덱스를 갱신한다.
+        """
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS translations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                original_text TEXT,
-                translated_text TEXT,
-                pdf_data BLOB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            CREATE VIEW IF NOT EXISTS translations_fts_content AS
+            SELECT id, title, decompress_text(original_text) AS original_text,
+                   decompress_text(translated_text) AS translated_text
+            FROM translations
         ''')
-        
-        conn.commit()
-        conn.close()
-    
-    def save_translation(self, title: str, original_text: str, translated_text: str, pdf_bytes: bytes = None) -> int:
-        """번역 기록 저장"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'translations_fts'")
+        row = cursor.fetchone()
+        if row and 'translations_fts_content' in row[0]:
+            return
+
+        # translations 테이블을 직접 내용 테이블로 쓰던 예전 인덱스는 지우고 다시 만듦
+        if row:
+            for trigger in ('translations_fts_insert', 'translations_fts_delete', 'translations_fts_update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            cursor.execute('DROP TABLE translations_fts')
+
+        # 한국어는 띄어쓰기 단위 토큰화로는 검색이 잘 안 되므로 trigram 토크나이저 사용
+        # (SQLite 3.34 미만에서는 trigram이 없으므로 기본 토크나이저로 대체)
+        for tokenizer in ('trigram', 'unicode61'):
+            try:
+                cursor.execute(f'''
+                    CREATE VIRTUAL TABLE translations_fts USING fts5(
+                        title, original_text, translated_text,
+                        content='translations_fts_content', content_rowid='id', tokenize='{tokenizer}'
+                    )
+                ''')
+                break
+            except sqlite3.OperationalError:
+                continue
+
         cursor.execute('''
-            INSERT INTO translations (title, original_text, translated_text, pdf_data, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (title, original_text, translated_text, pdf_bytes, datetime.now(), datetime.now()))
-        
-        translation_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return translation_id
-    
-    def get_all_translations(self) -> List[Dict]:
-        """모든 번역 기록 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+            CREATE TRIGGER IF NOT EXISTS translations_fts_insert AFTER INSERT ON translations BEGIN
+                INSERT INTO translations_fts (rowid, title, original_text, translated_text)
+                VALUES (new.id, new.title, decompress_text(new.original_text), decompress_text(new.translated_text));
+            END
+        ''')
         cursor.execute('''
-            SELECT id, title, original_text, translated_text, pdf_data, created_at, updated_at
-            FROM translations
-            ORDER BY created_at DESC
+            CREATE TRIGGER IF NOT EXISTS translations_fts_delete AFTER DELETE ON translations BEGIN
+                INSERT INTO translations_fts (translations_fts, rowid, title, original_text, translated_text)
+                VALUES ('delete', old.id, old.title, decompress_text(old.original_text),
+                        decompress_text(old.translated_text));
+            END
         ''')
+        # 기존 행을 압축만 하는 경우(내용이 같음)에는 인덱스를 다시 쓰지 않음
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS translations_fts_update
+            AFTER UPDATE OF title, original_text, translated_text ON translations
+            WHEN old.title IS NOT new.title
+              OR decompress_text(old.original_text) IS NOT decompress_text(new.original_text)
+              OR decompress_text(old.translated_text) IS NOT decompress_text(new.translated_text)
+            BEGIN
+                INSERT INTO translations_fts (translations_fts, rowid, title, original_text, translated_text)
+                VALUES ('delete', old.id, old.title, decompress_text(old.original_text),
+                        decompress_text(old.translated_text));
+                INSERT INTO translations_fts (rowid, title, original_text, translated_text)
+                VALUES (new.id, new.title, decompress_text(new.original_text), decompress_text(new.translated_text));
+            END
+        ''')
+
+        # 기존 번역 기록으로 인덱스 채우기
+        cursor.execute("INSERT INTO translations_fts (translations_fts) VALUES ('rebuild')")
+
+    @staticmethod
+    def _add_column_if_missing(cursor, table: str, column: str, declaration: str):
+        """기존 데이터베이스에 새 컬럼 추가 (이미 있으면 무시)"""
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+    @staticmethod
+    def _hash_pdf(pdf: Union[bytes, BinaryIO]) -> Tuple[str, int]:
+        """PDF의 SHA-256과 크기 계산 (파일 객체는 조각 단위로 읽음)"""
+        digest = hashlib.sha256()
+        if isinstance(pdf, (bytes, bytearray, memoryview)):
+            digest.update(pdf)
+            return digest.hexdigest(), len(pdf)
+
+        pdf.seek(0)
+        size = 0
+        while True:
+            piece = pdf.read(PDF_IO_CHUNK_SIZE)
+            if not piece:
+                break
+            digest.update(piece)
+            size += len(piece)
+        pdf.seek(0)
+        return digest.hexdigest(), size
+
+    def _store_pdf(self, conn: sqlite3.Connection, pdf: Union[bytes, BinaryIO]) -> str:
+        """
+        PDF를 저장소에 넣고 SHA-256을 돌려줌 (트랜잭션 안에서 호출)
+
+        같은 내용이 이미 있으면 참조 횟수만 늘린다 (저장 공간 정리로 내용을 지운 PDF면 내용을 다시 채운다).
+        새 PDF는 zeroblob으로 자리를 잡은 뒤 증분 BLOB I/O로 조각씩 써서 전체 내용을 여러 번 복사하지 않는다.
+        """
+        sha256, size = self._hash_pdf(pdf)
+        cursor = conn.cursor()
+        now = datetime.now()
+
+        cursor.execute('SELECT id, evicted_at FROM pdf_blobs WHERE sha256 = ?', (sha256,))
+        row = cursor.fetchone()
+        if row:
+            blob_id, evicted_at = row
+            cursor.execute('''
+                UPDATE pdf_blobs
+                SET ref_count = ref_count + 1, last_accessed_at = ?,
+                    data = CASE WHEN evicted_at IS NULL THEN data ELSE zeroblob(size) END, evicted_at = NULL
+                WHERE id = ?
+            ''', (now, blob_id))
+            if evicted_at is None:
+                return sha256
+        else:
+            cursor.execute('''
+                INSERT INTO pdf_blobs (sha256, size, ref_count, data, created_at, last_accessed_at)
+                VALUES (?, ?, 1, zeroblob(?), ?, ?)
+            ''', (sha256, size, size, now, now))
+            blob_id = cursor.lastrowid
+        if size == 0:
+            return sha256
+
+        with conn.blobopen('pdf_blobs', 'data', blob_id, readonly=False) as blob:
+            if isinstance(pdf, (bytes, bytearray, memoryview)):
+                view = memoryview(pdf)
+                for offset in range(0, size, PDF_IO_CHUNK_SIZE):
+                    blob.write(view[offset:offset + PDF_IO_CHUNK_SIZE])
+            else:
+                pdf.seek(0)
+                while True:
+                    piece = pdf.read(PDF_IO_CHUNK_SIZE)
+                    if not piece:
+                        break
+                    blob.write(piece)
+                pdf.seek(0)
+
+        return sha256
+
+    @staticmethod
+    def _release_pdf(conn: sqlite3.Connection, sha256: Optional[str]):
+        """PDF 참조 횟수를 줄이고 더 이상 참조가 없으면 삭제 (트랜잭션 안에서 호출)"""
+        if not sha256:
+            return
+        conn.execute('UPDATE pdf_blobs SET ref_count = ref_count - 1 WHERE sha256 = ?', (sha256,))
+        conn.execute('DELETE FROM pdf_blobs WHERE sha256 = ? AND ref_count <= 0', (sha256,))
+
+    def iter_pdf_chunks(self, sha256: str, chunk_size: int = PDF_IO_CHUNK_SIZE) -> Iterator[bytes]:
+        """저장된 PDF를 조각 단위로 읽기 (전체를 메모리에 올리지 않음, 저장 공간 정리로 지운 PDF는 빈 결과)"""
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT id, size FROM pdf_blobs WHERE sha256 = ? AND evicted_at IS NULL',
+                               (sha256,)).fetchone()
+            if not row:
+                return
+            with conn.blobopen('pdf_blobs', 'data', row[0], readonly=True) as blob:
+                while True:
+                    piece = blob.read(chunk_size)
+                    if not piece:
+                        break
+                    yield piece
+
+    def read_pdf(self, sha256: Optional[str]) -> Optional[bytes]:
+        """저장된 PDF 전체를 바이트로 읽기 (없거나 저장 공간 정리로 지웠으면 None)"""
+        if not sha256:
+            return None
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT id FROM pdf_blobs WHERE sha256 = ? AND evicted_at IS NULL',
+                               (sha256,)).fetchone()
+            if not row:
+                return None
+            with conn.blobopen('pdf_blobs', 'data', row[0], readonly=True) as blob:
+                return blob.read()
+    
+    def save_translation(self, title: str, original_text: str, translated_text: str,
+                         pdf_bytes: Union[bytes, BinaryIO] = None, parent_id: Optional[int] = None) -> int:
+        """번역 기록 저장 (pdf_bytes는 바이트 또는 읽을 수 있는 바이너리 파일 객체, parent_id는 이전 버전 기록 id)"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            pdf_sha256 = self._store_pdf(conn, pdf_bytes) if pdf_bytes is not None else None
+            cursor.execute('''
+                INSERT INTO translations (title, original_text, translated_text, pdf_sha256, parent_id,
+                                          created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (title, compress_text(original_text), compress_text(translated_text), pdf_sha256, parent_id,
+                  datetime.now(), datetime.now()))
+            
+            return cursor.lastrowid
+    
+    def get_all_translations(self) -> List[Dict]:
+        """모든 번역 기록 조회 (원문, 번역문, PDF 포함 - 목록 표시에는 get_translation_summaries 사용)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT t.id, t.title, decompress_text(t.original_text) AS original_text,
+                       decompress_text(t.translated_text) AS translated_text, b.data AS pdf_data,
+                       t.created_at, t.updated_at
+                FROM translations t
+                LEFT JOIN pdf_blobs b ON b.sha256 = t.pdf_sha256
+                ORDER BY t.created_at DESC, t.id DESC
+            ''')
+            
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def get_translation_summaries(self, limit: int = 20, before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """
+        번역 기록 목록 조회 (id, 제목, 생성/수정 시간만)
         
-        columns = [description[0] for description in cursor.description]
-        translations = []
-        
-        for row in cursor.fetchall():
-            translation = dict(zip(columns, row))
-            # PDF 데이터가 있으면 base64로 인코딩
-            if translation['pdf_data']:
-                translation['pdf_data'] = base64.b64encode(translation['pdf_data']).decode('utf-8')
-            translations.append(translation)
+        Args:
+            limit: 가져올 최대 개수
+            before: 이전 페이지 마지막 기록의 (created_at, id) - 이 기록보다 오래된 기록부터 조회
         
-        conn.close()
-        return translations
+        Returns:
+            List[Dict]: 최신순으로 정렬된 번역 기록 요약 목록
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            if before is None:
+                cursor.execute('''
+                    SELECT id, title, created_at, updated_at
+                    FROM translations
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                ''', (limit,))
+            else:
+                cursor.execute('''
+                    SELECT id, title, created_at, updated_at
+                    FROM translations
+                    WHERE (created_at, id) < (?, ?)
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?
+                ''', (before[0], before[1], limit))
+            
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def search_translations(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        원문/번역문/제목 전문 검색
+
+        3글자 이상인 단어는 FTS5 MATCH로 찾고, 더 짧은 단어(번역, 모델처럼 두 글자인 한국어 단어)는
+        같은 FTS 테이블에 LIKE 조건으로 거른다. 짧은 단어만 있으면 관련도를 매길 수 없으므로 최신순으로 돌려준다.
+
+        Args:
+            query: 검색어 (공백으로 구분된 단어는 모두 포함해야 함)
+            limit: 가져올 최대 개수
+
+        Returns:
+            List[Dict]: 관련도 순(짧은 단어만 있으면 최신순)으로 정렬된 검색 결과 (id, title, created_at, snippet, rank)
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        long_terms = [term for term in terms if len(term) >= 3]
+        short_terms = [term for term in terms if len(term) < 3]
+
+        conditions, params = [], []
+        if long_terms:
+            # 각 단어를 따옴표로 감싸서 FTS 문법 문자가 그대로 검색되도록 함
+            conditions.append("translations_fts MATCH ?")
+            params.append(" ".join('"' + term.replace('"', '""') + '"' for term in long_terms))
+        for term in short_terms:
+            # trigram 토큰보다 짧은 단어는 MATCH로 찾을 수 없으므로 LIKE로 거름 (%, _는 그대로 검색되도록 이스케이프)
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append("(" + " OR ".join(f"translations_fts.{column} LIKE ? ESCAPE '\\'"
+                                                for column in ('title', 'original_text', 'translated_text')) + ")")
+            params.extend([pattern] * 3)
+
+        if long_terms:
+            columns_sql = ("snippet(translations_fts, -1, '**', '**', '…', 40) AS snippet, "
+                           "bm25(translations_fts, 10.0, 1.0, 1.0) AS rank")
+            order_sql = "rank"
+        else:
+            # MATCH가 없으면 snippet()이 강조할 구간이 없으므로 번역문에서 직접 잘라냄
+            columns_sql = "translations_fts.translated_text AS snippet, 0.0 AS rank"
+            order_sql = "t.created_at DESC, t.id DESC"
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(f'''
+                SELECT t.id, t.title, t.created_at, {columns_sql}
+                FROM translations_fts
+                JOIN translations t ON t.id = translations_fts.rowid
+                WHERE {" AND ".join(conditions)}
+                ORDER BY {order_sql}
+                LIMIT ?
+            ''', (*params, limit))
+
+            columns = [description[0] for description in cursor.description]
+            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        if not long_terms:
+            for result in results:
+                result['snippet'] = _make_snippet(result['snippet'] or "", short_terms)
+        return results
+
+    def find_translation_by_pdf_hash(self, pdf_sha256: str) -> Optional[int]:
+        """같은 내용의 PDF로 저장된 번역 기록 id 조회 (없으면 None)"""
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT id FROM translations WHERE pdf_sha256 = ? ORDER BY id LIMIT 1',
+                               (pdf_sha256,)).fetchone()
+        return row[0] if row else None
     
     def get_translation_by_id(self, translation_id: int) -> Optional[Dict]:
-        """특정 번역 기록 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, title, original_text, translated_text, pdf_data, created_at, updated_at
-            FROM translations
-            WHERE id = ?
-        ''', (translation_id,))
+        """
+        특정 번역 기록 조회 (pdf_data는 원본 바이트 그대로)
         
-        row = cursor.fetchone()
-        conn.close()
+        저장 공간 정리 순서를 정하기 위해 기록과 PDF의 마지막 접근 시간을 함께 갱신한다.
+        PDF를 저장 공간 정리로 지웠으면 pdf_data는 None, pdf_evicted는 True다.
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, title, decompress_text(original_text), decompress_text(translated_text), pdf_sha256,
+                       parent_id, created_at, updated_at
+                FROM translations
+                WHERE id = ?
+            ''', (translation_id,))
+            
+            row = cursor.fetchone()
         
         if row:
-            columns = ['id', 'title', 'original_text', 'translated_text', 'pdf_data', 'created_at', 'updated_at']
+            columns = ['id', 'title', 'original_text', 'translated_text', 'pdf_sha256', 'parent_id',
+                       'created_at', 'updated_at']
             translation = dict(zip(columns, row))
-            # PDF 데이터가 있으면 base64로 인코딩
-            if translation['pdf_data']:
-                translation['pdf_data'] = base64.b64encode(translation['pdf_data']).decode('utf-8')
+            translation['pdf_data'] = self.read_pdf(translation['pdf_sha256'])
+            translation['pdf_evicted'] = translation['pdf_sha256'] is not None and translation['pdf_data'] is None
+            
+            now = datetime.now()
+            with self.pool.transaction() as conn:
+                conn.execute('UPDATE translations SET last_opened_at = ? WHERE id = ?', (now, translation_id))
+                if translation['pdf_sha256']:
+                    conn.execute('UPDATE pdf_blobs SET last_accessed_at = ? WHERE sha256 = ?',
+                                 (now, translation['pdf_sha256']))
             return translation
         
         return None
     
     def delete_translation(self, translation_id: int) -> bool:
         """번역 기록 삭제"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM translations WHERE id = ?', (translation_id,))
-        deleted_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
-        
-        return deleted_count > 0
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT pdf_sha256 FROM translations WHERE id = ?', (translation_id,))
+            row = cursor.fetchone()
+            if not row:
+                return False
+            
+            cursor.execute('DELETE FROM translations WHERE id = ?', (translation_id,))
+            cursor.execute('DELETE FROM translation_blocks WHERE translation_id = ?', (translation_id,))
+            cursor.execute('UPDATE translations SET parent_id = NULL WHERE parent_id = ?', (translation_id,))
+            self._release_pdf(conn, row[0])
+            return True
+    
+    def get_section_index(self, translation_id: int) -> Optional[List[Tuple[int, str, int, int]]]:
+        """번역 기록에 저장된 섹션 목차 (저장된 적이 없으면 None)"""
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT section_index FROM translations WHERE id = ?', (translation_id,)).fetchone()
+        if not row or row[0] is None:
+            return None
+        return [tuple(section) for section in json.loads(row[0])]
+
+    def save_section_index(self, translation_id: int, section_index: List[Tuple[int, str, int, int]]):
+        """번역 기록의 섹션 목차 저장 ((제목 수준, 제목, 시작 위치, 끝 위치) 목록)"""
+        with self.pool.transaction() as conn:
+            conn.execute('UPDATE translations SET section_index = ? WHERE id = ?',
+                         (json.dumps(section_index, ensure_ascii=False), translation_id))
+
+    def get_revision_candidates(self) -> List[Dict]:
+        """이전 버전 찾기용 번역 기록 목록 (id, title, source_title, text_signature - 서명이 없는 기록은 None)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id, title, source_title, text_signature FROM translations ORDER BY id DESC')
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_original_text(self, translation_id: int) -> Optional[str]:
+        """번역 기록의 원문만 조회"""
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT decompress_text(original_text) FROM translations WHERE id = ?',
+                               (translation_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_revision_signature(self, translation_id: int, source_title: Optional[str], text_signature: Optional[bytes]):
+        """이전 버전 찾기용 원문 제목 줄과 MinHash 서명 저장"""
+        with self.pool.transaction() as conn:
+            conn.execute('UPDATE translations SET source_title = ?, text_signature = ? WHERE id = ?',
+                         (source_title, text_signature, translation_id))
+
+    def save_translation_blocks(self, translation_id: int, blocks: List[Tuple[List[str], str]]):
+        """
+        번역 기록의 문단 묶음별 번역문 저장 (기존 항목은 교체)
+
+        Args:
+            translation_id: 번역 기록 id
+            blocks: 원문 순서대로 (문단 해시 목록, 그 문단들의 번역문)
+        """
+        with self.pool.transaction() as conn:
+            self._replace_translation_blocks(conn, translation_id, blocks)
+
+    @staticmethod
+    def _replace_translation_blocks(conn: sqlite3.Connection, translation_id: int,
+                                    blocks: List[Tuple[List[str], str]]):
+        """문단 묶음별 번역문 교체 (트랜잭션 안에서 호출)"""
+        conn.execute('DELETE FROM translation_blocks WHERE translation_id = ?', (translation_id,))
+        conn.executemany('''
+            INSERT INTO translation_blocks (translation_id, position, paragraph_hashes, translated_text)
+            VALUES (?, ?, ?, ?)
+        ''', [(translation_id, position, " ".join(hashes), translated_text)
+              for position, (hashes, translated_text) in enumerate(blocks)])
+
+    def get_translation_blocks(self, translation_id: int) -> List[Tuple[List[str], str]]:
+        """번역 기록의 문단 묶음별 번역문 (원문 순서, 저장된 적이 없으면 빈 목록)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT paragraph_hashes, translated_text FROM translation_blocks
+                WHERE translation_id = ?
+                ORDER BY position
+            ''', (translation_id,))
+            return [(hashes.split(), translated_text) for hashes, translated_text in cursor.fetchall()]
     
-    def update_translation(self, translation_id: int, title: str = None, original_text: str = None, 
+    def update_translation(self, translation_id: int, title: str = None, original_text: str = None,
                          translated_text: str = None, pdf_bytes: bytes = None) -> bool:
         """번역 기록 업데이트"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         # 업데이트할 필드들
         update_fields = []
         values = []
@@ -123,17 +806,30 @@ class TranslationDatabase:
         
         if original_text is not None:
             update_fields.append("original_text = ?")
-            values.append(original_text)
+            values.append(compress_text(original_text))
         
         if translated_text is not None:
             update_fields.append("translated_text = ?")
-            values.append(translated_text)
+            values.append(compress_text(translated_text))
+            update_fields.append("section_index = NULL")
         
-        if pdf_bytes is not None:
-            update_fields.append("pdf_data = ?")
-            values.append(pdf_bytes)
+        if not update_fields and pdf_bytes is None:
+            return False
         
-        if update_fields:
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT pdf_sha256 FROM translations WHERE id = ?', (translation_id,))
+            row = cursor.fetchone()
+            if not row:
+                return False
+            
+            # 새 PDF를 저장하고 기존 PDF 참조 해제
+            if pdf_bytes is not None:
+                update_fields.append("pdf_sha256 = ?")
+                values.append(self._store_pdf(conn, pdf_bytes))
+                self._release_pdf(conn, row[0])
+            
             update_fields.append("updated_at = ?")
             values.append(datetime.now())
             values.append(translation_id)
@@ -141,11 +837,558 @@ class TranslationDatabase:
             query = f"UPDATE translations SET {', '.join(update_fields)} WHERE id = ?"
             cursor.execute(query, values)
             
+            return cursor.rowcount > 0
+    
+    def create_job(self, title: str, original_text: str, chunks: List[str],
+                   pdf_bytes: Union[bytes, BinaryIO] = None, owner: Optional[str] = None,
+                   priority: int = 0, parent_id: Optional[int] = None,
+                   completed: Optional[Dict[int, str]] = None) -> int:
+        """
+        번역 작업을 대기열에 추가 (청크 목록을 함께 저장)
+        
+        같은 원문으로 대기 중이거나 진행 중인 작업이 있으면 새로 만들지 않고 그 작업 id를 돌려준다.
+        실패한 작업이 있으면 완료된 청크는 그대로 두고 다시 대기열에 넣는다.
+        
+        Args:
+            title: 작업 제목
+            original_text: 번역할 원문
+            chunks: 원문을 나눈 청크 목록
+            pdf_bytes: 원본 PDF (바이트 또는 읽을 수 있는 바이너리 파일 객체)
+            owner: 작업을 요청한 세션 식별자 (세션별 동시 작업 수 제한에 사용)
+            priority: 우선순위 (클수록 먼저 처리)
+            parent_id: 개정판 번역이면 이전 버전 번역 기록 id
+            completed: 처음부터 번역이 끝난 청크 {청크 번호: 번역문} (이전 버전에서 재사용한 청크)
+        
+        Returns:
+            int: 작업 id
+        """
+        completed = completed or {}
+        dedupe_key = hashlib.sha256(original_text.encode('utf-8')).hexdigest()
+        
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            now = datetime.now()
+            cursor.execute('''
+                SELECT id, status FROM translation_jobs
+                WHERE dedupe_key = ? AND status IN ('queued', 'running', 'failed')
+                ORDER BY id DESC LIMIT 1
+            ''', (dedupe_key,))
+            existing = cursor.fetchone()
+            if existing:
+                job_id, status = existing
+                if status == 'failed':
+                    cursor.execute('''
+                        UPDATE translation_jobs
+                        SET status = 'queued', error = NULL, owner = ?, priority = MAX(priority, ?), updated_at = ?
+                        WHERE id = ?
+                    ''', (owner, priority, now, job_id))
+                return job_id
+            
+            pdf_sha256 = self._store_pdf(conn, pdf_bytes) if pdf_bytes is not None else None
+            cursor.execute('''
+                INSERT INTO translation_jobs (title, original_text, pdf_sha256, status, total_chunks, priority,
+                                              owner, dedupe_key, parent_id, created_at, updated_at)
+                VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?)
+            ''', (title, compress_text(original_text), pdf_sha256, len(chunks), priority, owner, dedupe_key,
+                  parent_id, now, now))
+            job_id = cursor.lastrowid
+            
+            cursor.executemany('''
+                INSERT INTO translation_job_chunks (job_id, chunk_index, source_text, translated_text, status,
+                                                    updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(job_id, index, chunk, completed.get(index), 'completed' if index in completed else 'pending', now)
+                  for index, chunk in enumerate(chunks)])
+            
+            return job_id
+    
+    def claim_next_job(self, max_running_per_owner: int, worker_id: str, lease_seconds: float) -> Optional[int]:
+        """
+        대기 중인 작업 하나를 꺼내서 진행 중으로 표시 (워커가 호출)
+
+        우선순위가 높은 작업부터, 같으면 먼저 들어온 작업부터 꺼낸다.
+        이미 진행 중인 작업이 max_running_per_owner개인 세션의 작업은 건너뛴다.
+        꺼내기 전에 생존 신호가 lease_seconds 넘게 끊긴 작업(워커가 죽은 작업)을 대기열로 돌려놓는다.
+
+        Args:
+            max_running_per_owner: 세션 하나가 동시에 진행할 수 있는 최대 작업 수
+            worker_id: 작업을 가져가는 워커(대기열) 식별자
+            lease_seconds: 생존 신호 없이 작업을 붙잡고 있을 수 있는 시간
+
+        Returns:
+            Optional[int]: 꺼낸 작업 id (처리할 작업이 없으면 None)
+        """
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            now = datetime.now()
+            self._requeue_expired_jobs(cursor, now, lease_seconds)
+            cursor.execute('''
+                SELECT j.id FROM translation_jobs j
+                WHERE j.status = 'queued'
+                  AND (j.owner IS NULL OR (
+                      SELECT COUNT(*) FROM translation_jobs r WHERE r.owner = j.owner AND r.status = 'running'
+                  ) < ?)
+                ORDER BY j.priority DESC, j.created_at, j.id
+                LIMIT 1
+            ''', (max_running_per_owner,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            cursor.execute('''
+                UPDATE translation_jobs
+                SET status = 'running', claimed_by = ?, heartbeat_at = ?, updated_at = ?
+                WHERE id = ?
+            ''', (worker_id, now, now, row[0]))
+            return row[0]
+
+    def requeue_job(self, job_id: int, priority: Optional[int] = None) -> bool:
+        """실패한 작업을 다시 대기열에 넣음 (priority를 주면 우선순위도 그 값 이상으로 올림)"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE translation_jobs
+                SET status = 'queued', error = NULL, priority = MAX(priority, COALESCE(?, priority)),
+                    claimed_by = NULL, heartbeat_at = NULL, updated_at = ?
+                WHERE id = ? AND status != 'completed'
+            ''', (priority, datetime.now(), job_id))
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def _requeue_expired_jobs(cursor, now: datetime, lease_seconds: float) -> int:
+        """생존 신호가 끊긴 진행 중 작업을 대기열로 돌려놓음 (트랜잭션 안에서 호출)"""
+        cursor.execute('''
+            UPDATE translation_jobs
+            SET status = 'queued', claimed_by = NULL, heartbeat_at = NULL, updated_at = ?
+            WHERE status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)
+        ''', (now, now - timedelta(seconds=lease_seconds)))
+        return cursor.rowcount
+
+    def requeue_expired_jobs(self, lease_seconds: float) -> int:
+        """
+        생존 신호가 lease_seconds 넘게 끊긴 진행 중 작업을 다시 대기열에 넣음
+
+        다른 프로세스의 워커가 아직 진행 중인 작업은 생존 신호가 이어지므로 건드리지 않는다.
+
+        Returns:
+            int: 대기열로 돌려놓은 작업 수
+        """
+        with self.pool.transaction() as conn:
+            return self._requeue_expired_jobs(conn.cursor(), datetime.now(), lease_seconds)
+
+    def renew_job_leases(self, worker_id: str) -> int:
+        """워커가 진행 중인 작업들의 생존 신호 시각 갱신 (갱신한 작업 수)"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE translation_jobs SET heartbeat_at = ?
+                WHERE claimed_by = ? AND status = 'running'
+            ''', (datetime.now(), worker_id))
+            return cursor.rowcount
+
+    def complete_job(self, job_id: int, worker_id: str, title: str, translated_text: str,
+                     blocks: List[Tuple[List[str], str]],
+                     section_index: List[Tuple[int, str, int, int]]) -> Optional[int]:
+        """
+        작업 결과를 번역 기록으로 저장하고 작업을 완료로 표시 (한 트랜잭션)
+
+        번역 기록, 문단 묶음, 섹션 목차 저장과 체크포인트 정리가 함께 커밋되므로 중간에 실패해도
+        번역 기록만 남고 작업은 진행 중으로 남는 일이 없다. 작업의 PDF 참조는 번역 기록으로 넘긴다.
+        상태를 확인하는 화면이 결과를 찾을 수 있도록 작업 행과 번역 기록 id만 남긴다.
+
+        Args:
+            job_id: 작업 id
+            worker_id: 작업을 가져간 워커 식별자 (생존 신호가 끊겨 다른 워커가 가져갔으면 저장하지 않음)
+            title: 번역 기록 제목
+            translated_text: 전체 번역문
+            blocks: 원문 순서대로 (문단 해시 목록, 그 문단들의 번역문)
+            section_index: 번역문 섹션 목차
+
+        Returns:
+            Optional[int]: 저장된 번역 기록 id (이 워커가 진행 중인 작업이 아니면 아무것도 저장하지 않고 None)
+        """
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT original_text, pdf_sha256, parent_id FROM translation_jobs
+                WHERE id = ? AND status = 'running' AND claimed_by = ?
+            ''', (job_id, worker_id))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            original_text, pdf_sha256, parent_id = row
+
+            now = datetime.now()
+            # 원문은 작업에 저장된 형식(압축) 그대로 옮김
+            cursor.execute('''
+                INSERT INTO translations (title, original_text, translated_text, pdf_sha256, parent_id,
+                                          section_index, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (title, original_text, compress_text(translated_text), pdf_sha256, parent_id,
+                  json.dumps(section_index, ensure_ascii=False), now, now))
+            translation_id = cursor.lastrowid
+            self._replace_translation_blocks(conn, translation_id, blocks)
+
+            cursor.execute('DELETE FROM translation_job_chunks WHERE job_id = ?', (job_id,))
+            cursor.execute('''
+                UPDATE translation_jobs
+                SET status = 'completed', translation_id = ?, original_text = NULL, pdf_sha256 = NULL,
+                    error = NULL, claimed_by = NULL, heartbeat_at = NULL, updated_at = ?
+                WHERE id = ?
+            ''', (translation_id, now, job_id))
+            return translation_id
+
+    def get_job_status(self, job_id: int) -> Optional[Dict]:
+        """
+        작업 진행 상황만 가볍게 조회 (화면에서 주기적으로 확인할 때 사용)
+
+        Returns:
+            Optional[Dict]: id, title, status, total_chunks, completed_chunks, error, translation_id,
+                queue_position (앞에서 기다리는 작업 수, 대기 중일 때만)
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT j.id, j.title, j.status, j.total_chunks, j.error, j.translation_id,
+                       j.priority, j.created_at,
+                       (SELECT COUNT(*) FROM translation_job_chunks c
+                        WHERE c.job_id = j.id AND c.status = 'completed') AS completed_chunks
+                FROM translation_jobs j
+                WHERE j.id = ?
+            ''', (job_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            columns = [description[0] for description in cursor.description]
+            job = dict(zip(columns, row))
+
+            job['queue_position'] = None
+            if job['status'] == 'queued':
+                cursor.execute('''
+                    SELECT COUNT(*) FROM translation_jobs
+                    WHERE status = 'queued'
+                      AND (priority > ? OR (priority = ? AND (created_at, id) < (?, ?)))
+                ''', (job['priority'], job['priority'], job['created_at'], job_id))
+                job['queue_position'] = cursor.fetchone()[0]
+
+            return job
+
+    def get_completed_chunk_texts(self, job_id: int) -> List[str]:
+        """작업에서 지금까지 번역이 끝난 청크의 번역문 목록 (원문 순서)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT translated_text FROM translation_job_chunks
+                WHERE job_id = ? AND status = 'completed'
+                ORDER BY chunk_index
+            ''', (job_id,))
+            return [row[0] for row in cursor.fetchall()]
+    
+    def get_job_preview_texts(self, job_id: int) -> List[str]:
+        """작업에서 지금까지 받은 번역문 목록 (원문 순서, 끝난 청크는 번역문, 번역 중인 청크는 받은 데까지)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COALESCE(translated_text, partial_text) FROM translation_job_chunks
+                WHERE job_id = ? AND COALESCE(translated_text, partial_text) IS NOT NULL
+                ORDER BY chunk_index
+            ''', (job_id,))
+            return [row[0] for row in cursor.fetchall()]
+    
+    def save_job_chunk_partial(self, job_id: int, chunk_index: int, partial_text: str) -> bool:
+        """번역 중인 청크의 지금까지 받은 번역문 저장 (이미 끝난 청크면 무시)"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE translation_job_chunks SET partial_text = ?
+                WHERE job_id = ? AND chunk_index = ? AND status = 'pending'
+            ''', (partial_text, job_id, chunk_index))
+            return cursor.rowcount > 0
+    
+    def save_job_chunk(self, job_id: int, chunk_index: int, translated_text: str) -> bool:
+        """번역이 끝난 청크 하나를 체크포인트로 저장"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            now = datetime.now()
+            cursor.execute('''
+                UPDATE translation_job_chunks
+                SET translated_text = ?, partial_text = NULL, status = 'completed', updated_at = ?
+                WHERE job_id = ? AND chunk_index = ?
+            ''', (translated_text, now, job_id, chunk_index))
             updated_count = cursor.rowcount
-            conn.commit()
-            conn.close()
+            cursor.execute('UPDATE translation_jobs SET updated_at = ?, heartbeat_at = ? WHERE id = ?',
+                           (now, now, job_id))
             
             return updated_count > 0
+    
+    def update_job_status(self, job_id: int, status: str, error: str = None, worker_id: Optional[str] = None) -> bool:
+        """
+        번역 작업 상태 변경 (queued, running, failed, completed)
+
+        worker_id를 주면 그 워커가 진행 중인 작업일 때만 바꾼다 (다른 워커가 이어받은 작업은 건드리지 않음).
+        """
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+                UPDATE translation_jobs
+                SET status = ?, error = ?, updated_at = ?,
+                    claimed_by = CASE WHEN ? = 'running' THEN claimed_by END,
+                    heartbeat_at = CASE WHEN ? = 'running' THEN heartbeat_at END
+                WHERE id = ?
+            '''
+            values = [status, error, datetime.now(), status, status, job_id]
+            if worker_id is not None:
+                query += " AND status = 'running' AND claimed_by = ?"
+                values.append(worker_id)
+            cursor.execute(query, values)
+            
+            return cursor.rowcount > 0
+    
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """번역 작업과 청크별 진행 상황 조회"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, title, decompress_text(original_text) AS original_text, pdf_sha256, status,
+                       total_chunks, error, priority, owner, translation_id, parent_id, created_at, updated_at
+                FROM translation_jobs
+                WHERE id = ?
+            ''', (job_id,))
+            row = cursor.fetchone()
+            
+            if not row:
+                return None
+            
+            columns = [description[0] for description in cursor.description]
+            job = dict(zip(columns, row))
+            
+            cursor.execute('''
+                SELECT chunk_index, source_text, translated_text, status
+                FROM translation_job_chunks
+                WHERE job_id = ?
+                ORDER BY chunk_index
+            ''', (job_id,))
+            job['chunks'] = [
+                {'index': index, 'source_text': source_text, 'translated_text': translated_text, 'status': status}
+                for index, source_text, translated_text, status in cursor.fetchall()
+            ]
         
-        conn.close()
-        return False
+        job['pdf_data'] = self.read_pdf(job['pdf_sha256'])
+        return job
+    
+    def get_incomplete_jobs(self) -> List[Dict]:
+        """완료되지 않은 (대기 중, 진행 중, 실패한) 번역 작업 목록 조회"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT j.id, j.title, j.status, j.total_chunks, j.error, j.owner, j.created_at, j.updated_at,
+                       (SELECT COUNT(*) FROM translation_job_chunks c
+                        WHERE c.job_id = j.id AND c.status = 'completed') AS completed_chunks
+                FROM translation_jobs j
+                WHERE j.status != 'completed'
+                ORDER BY j.updated_at DESC
+            ''')
+            
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def delete_job(self, job_id: int) -> bool:
+        """번역 작업과 청크 체크포인트 삭제"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT pdf_sha256 FROM translation_jobs WHERE id = ?', (job_id,))
+            row = cursor.fetchone()
+            if not row:
+                return False
+            
+            cursor.execute('DELETE FROM translation_job_chunks WHERE job_id = ?', (job_id,))
+            cursor.execute('DELETE FROM translation_jobs WHERE id = ?', (job_id,))
+            self._release_pdf(conn, row[0])
+            return True
+    
+    def compress_existing_texts(self, batch_size: int = TEXT_MIGRATION_BATCH_SIZE, pause_seconds: float = 0.05) -> int:
+        """
+        압축 저장 이전에 TEXT 그대로 저장된 원문/번역문을 압축
+
+        행을 batch_size개씩 짧은 트랜잭션으로 나누어 처리해서 번역 저장이나 조회를 오래 막지 않는다.
+        수정 시간(updated_at)은 바꾸지 않는다.
+
+        Args:
+            batch_size: 트랜잭션 하나에서 처리할 행 수
+            pause_seconds: 트랜잭션 사이에 쉬는 시간 (초)
+
+        Returns:
+            int: 압축해서 다시 저장한 행 수
+        """
+        if TEXT_CODEC not in _CODEC_MARKERS:
+            return 0
+
+        migrated = 0
+        for table, columns in COMPRESSED_COLUMNS.items():
+            uncompressed = " OR ".join(f"typeof({column}) = 'text'" for column in columns)
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            last_id = 0
+            while True:
+                with self.pool.transaction() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(f'''
+                        SELECT id, {", ".join(columns)} FROM {table}
+                        WHERE id > ? AND ({uncompressed})
+                        ORDER BY id
+                        LIMIT ?
+                    ''', (last_id, batch_size))
+                    rows = cursor.fetchall()
+
+                    for row_id, *values in rows:
+                        compressed = [compress_text(value) if isinstance(value, str) else value for value in values]
+                        # 짧거나 압축해도 줄지 않는 값만 있는 행은 그대로 둠
+                        if compressed != values:
+                            cursor.execute(f'UPDATE {table} SET {assignments} WHERE id = ?', (*compressed, row_id))
+                            migrated += 1
+
+                if len(rows) < batch_size:
+                    break
+                last_id = rows[-1][0]
+                time.sleep(pause_seconds)
+
+        return migrated
+
+    def start_text_migration(self):
+        """기존 행 압축을 백그라운드 스레드에서 시작 (이미 시작했으면 무시)"""
+        if self._migration_thread is not None or TEXT_CODEC not in _CODEC_MARKERS:
+            return
+
+        def run():
+            try:
+                self.compress_existing_texts()
+            except Exception as e:
+                self.migration_error = str(e)
+                logger.exception("기존 번역 기록 압축 중 오류 발생")
+
+        self._migration_thread = threading.Thread(target=run, name="text-compression-migration", daemon=True)
+        self._migration_thread.start()
+
+    def get_storage_report(self) -> List[Dict]:
+        """
+        테이블별 원문/번역문 저장 크기와 압축으로 줄어든 크기 조회
+
+        Returns:
+            List[Dict]: table, rows, compressed_values (압축된 값 수), raw_bytes (압축 전 UTF-8 크기),
+                stored_bytes (실제 저장 크기), saved_bytes
+        """
+        report = []
+        with self.pool.connection() as conn:
+            for table, columns in COMPRESSED_COLUMNS.items():
+                rows = conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                compressed_values = raw_bytes = stored_bytes = 0
+                for column in columns:
+                    # 압축하지 않은 값은 저장 크기가 곧 원래 크기
+                    stored, plain = conn.execute(f'''
+                        SELECT COALESCE(SUM(length(CAST({column} AS BLOB))), 0),
+                               COALESCE(SUM(CASE WHEN typeof({column}) = 'text'
+                                                 THEN length(CAST({column} AS BLOB)) END), 0)
+                        FROM {table}
+                    ''').fetchone()
+                    stored_bytes += stored
+                    raw_bytes += plain
+
+                    # 압축한 값은 압축을 풀지 않고 머리에 적힌 원래 크기만 읽음
+                    cursor = conn.execute(f'''
+                        SELECT substr({column}, 1, ?) FROM {table} WHERE typeof({column}) = 'blob'
+                    ''', (_TEXT_HEADER.size,))
+                    for (header,) in cursor:
+                        compressed_values += 1
+                        raw_bytes += _TEXT_HEADER.unpack(header)[1]
+
+                report.append({
+                    'table': table,
+                    'rows': rows,
+                    'compressed_values': compressed_values,
+                    'raw_bytes': raw_bytes,
+                    'stored_bytes': stored_bytes,
+                    'saved_bytes': raw_bytes - stored_bytes,
+                })
+
+        return report
+
+    def get_storage_usage(self) -> Dict:
+        """
+        데이터베이스 파일 크기와 실제 사용 중인 크기 조회
+
+        Returns:
+            Dict: page_size, file_bytes (파일 크기), free_bytes (빈 페이지), used_bytes, pdf_bytes (남아 있는 PDF 크기)
+        """
+        with self.pool.connection() as conn:
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+            freelist_count = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            pdf_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM pdf_blobs WHERE evicted_at IS NULL').fetchone()[0]
+
+        return {
+            'page_size': page_size,
+            'file_bytes': page_count * page_size,
+            'free_bytes': freelist_count * page_size,
+            'used_bytes': (page_count - freelist_count) * page_size,
+            'pdf_bytes': pdf_bytes,
+        }
+
+    def evict_pdf_blobs(self, bytes_to_free: int) -> Tuple[int, int]:
+        """
+        가장 오래 열지 않은 PDF부터 내용을 지워서 bytes_to_free 이상 확보 (번역 기록의 원문/번역문은 유지)
+
+        참조 횟수와 해시는 남겨 두므로 같은 PDF를 다시 올리면 내용만 다시 채워진다.
+        완료되지 않은 번역 작업이 쓰는 PDF는 지우지 않는다.
+
+        Returns:
+            Tuple[int, int]: (지운 PDF 수, 지운 바이트 수)
+        """
+        if bytes_to_free <= 0:
+            return 0, 0
+
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT b.id, b.size FROM pdf_blobs b
+                WHERE b.evicted_at IS NULL
+                  AND NOT EXISTS (SELECT 1 FROM translation_jobs j
+                                  WHERE j.pdf_sha256 = b.sha256 AND j.status != 'completed')
+                ORDER BY COALESCE(b.last_accessed_at, b.created_at), b.id
+            ''')
+
+            victims = []
+            freed = 0
+            for blob_id, size in cursor.fetchall():
+                if freed >= bytes_to_free:
+                    break
+                victims.append((datetime.now(), blob_id))
+                freed += size
+
+            cursor.executemany("UPDATE pdf_blobs SET data = X'', evicted_at = ? WHERE id = ?", victims)
+            return len(victims), freed
+
+    def incremental_vacuum(self, max_pages: int) -> int:
+        """
+        빈 페이지를 최대 max_pages개만 파일에서 잘라냄 (큰 정리도 짧은 단계로 나누어 실행하기 위함)
+
+        Returns:
+            int: 아직 남은 빈 페이지 수
+        """
+        with self.pool.connection() as conn:
+            # execute()는 결과 열이 없는 문장을 한 단계만 실행해서 한 페이지만 정리되므로 executescript로 끝까지 실행
+            conn.executescript(f'PRAGMA incremental_vacuum({int(max_pages)});')
+            return conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+    def checkpoint(self):
+        """WAL 내용을 데이터베이스 파일에 반영 (읽기/쓰기를 기다리지 않는 PASSIVE 모드)"""
+        with self.pool.connection() as conn:
+            conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchall()
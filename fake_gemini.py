@@ -0,0 +1,141 @@
+"""
+네트워크 없이 제미나이 모델을 흉내 내는 가짜 백엔드 (벤치마크/오프라인 테스트용)
+
+translator가 사용하는 generate_content(prompt, stream=..., generation_config=...) 인터페이스를 제공하고,
+응답 지연 시간, 출력 토큰 속도, 요청 한도 초과(429) 오류, 출력 잘림을 설정할 수 있다.
+번역문은 원문 앞에 표시를 붙인 것이므로 원문과 길이가 비슷하다.
+
+사용: TRANSLATION_BACKEND=fake streamlit run app.py
+"""
+import enum
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import Iterator, List, Optional
+
+# 프롬프트에서 번역할 원문이 시작되는 표시 (translator.TRANSLATION_PROMPT)
+SOURCE_MARKER = "영어 원문:"
+
+# 가짜 번역문 앞에 붙이는 표시
+TRANSLATION_PREFIX = "[번역] "
+
+
+class FinishReason(enum.IntEnum):
+    """응답 종료 이유 (google.generativeai의 FinishReason 값과 같음)"""
+    FINISH_REASON_UNSPECIFIED = 0
+    STOP = 1
+    MAX_TOKENS = 2
+
+
+class ResourceExhausted(Exception):
+    """요청 한도 초과 오류 (google.api_core.exceptions.ResourceExhausted와 이름/코드가 같음)"""
+    code = 429
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (약 4자당 1토큰)"""
+    return len(text) // 4 + 1
+
+
+class FakeResponse:
+    """generate_content 응답 (stream=True이면 조각을 차례로 돌려줌)"""
+
+    def __init__(self, parts: List[str], prompt_tokens: int, finish_reason: FinishReason,
+                 seconds_per_part: float = 0.0):
+        self._parts = parts
+        self._seconds_per_part = seconds_per_part
+        self.text = "".join(parts)
+        self.candidates = [SimpleNamespace(finish_reason=finish_reason)]
+        output_tokens = estimate_tokens(self.text)
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+
+    def __iter__(self) -> Iterator[SimpleNamespace]:
+        for part in self._parts:
+            if self._seconds_per_part:
+                time.sleep(self._seconds_per_part)
+            yield SimpleNamespace(text=part)
+
+
+class FakeGenerativeModel:
+    """
+    지연 시간과 오류를 흉내 내는 가짜 제미나이 모델
+
+    Args:
+        model_name: 모델 이름 (표시용)
+        latency: 첫 응답까지 걸리는 시간 (초)
+        tokens_per_second: 출력 토큰 생성 속도 (0이면 즉시)
+        rate_limit_rate: 요청이 429 오류로 실패할 확률
+        truncation_rate: 출력이 중간에 잘릴 확률 (finish_reason = MAX_TOKENS)
+        max_output_tokens: 출력 토큰 상한 (넘으면 잘림, None이면 요청의 generation_config 값만 사용)
+        seed: 난수 시드 (같은 시드면 오류/잘림 발생 순서가 같음)
+    """
+
+    def __init__(self, model_name: str = "fake", latency: float = 0.5, tokens_per_second: float = 200.0,
+                 rate_limit_rate: float = 0.0, truncation_rate: float = 0.0,
+                 max_output_tokens: Optional[int] = None, seed: Optional[int] = None):
+        self.model_name = model_name
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.truncation_rate = truncation_rate
+        self.max_output_tokens = max_output_tokens
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, model_name: str = "fake") -> "FakeGenerativeModel":
+        """FAKE_GEMINI_* 환경 변수로 설정한 가짜 모델"""
+        max_output_tokens = os.getenv("FAKE_GEMINI_MAX_OUTPUT_TOKENS")
+        seed = os.getenv("FAKE_GEMINI_SEED")
+        return cls(
+            model_name=model_name,
+            latency=float(os.getenv("FAKE_GEMINI_LATENCY", "0.5")),
+            tokens_per_second=float(os.getenv("FAKE_GEMINI_TOKENS_PER_SECOND", "200")),
+            rate_limit_rate=float(os.getenv("FAKE_GEMINI_RATE_LIMIT_RATE", "0")),
+            truncation_rate=float(os.getenv("FAKE_GEMINI_TRUNCATION_RATE", "0")),
+            max_output_tokens=int(max_output_tokens) if max_output_tokens else None,
+            seed=int(seed) if seed else None,
+        )
+
+    def generate_content(self, prompt: str, stream: bool = False, generation_config: Optional[dict] = None,
+                         **kwargs) -> FakeResponse:
+        with self._lock:
+            self.calls += 1
+            rate_limited = self._rng.random() < self.rate_limit_rate
+            truncated = self._rng.random() < self.truncation_rate
+            truncate_ratio = self._rng.uniform(0.3, 0.8)
+
+        time.sleep(self.latency)
+        if rate_limited:
+            raise ResourceExhausted("429 Resource has been exhausted (fake)")
+
+        source = prompt.split(SOURCE_MARKER, 1)[-1].strip()
+        output = TRANSLATION_PREFIX + source
+        finish_reason = FinishReason.STOP
+
+        if truncated:
+            output = output[:int(len(output) * truncate_ratio)]
+            finish_reason = FinishReason.MAX_TOKENS
+        limits = [self.max_output_tokens, (generation_config or {}).get('max_output_tokens')]
+        limits = [limit for limit in limits if limit is not None]
+        if limits and estimate_tokens(output) > min(limits):
+            output = output[:min(limits) * 4]
+            finish_reason = FinishReason.MAX_TOKENS
+
+        generation_seconds = estimate_tokens(output) / self.tokens_per_second if self.tokens_per_second else 0.0
+        if not stream:
+            time.sleep(generation_seconds)
+            return FakeResponse([output], estimate_tokens(prompt), finish_reason)
+
+        # 스트리밍이면 출력을 몇 조각으로 나누어 생성 시간에 맞춰 흘려보냄
+        part_count = max(1, min(8, len(output) // 200))
+        size = -(-len(output) // part_count) if output else 1
+        parts = [output[i:i + size] for i in range(0, len(output), size)] or [""]
+        return FakeResponse(parts, estimate_tokens(prompt), finish_reason, generation_seconds / len(parts))
@@ -0,0 +1,254 @@
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import metrics
+from database import TranslationDatabase
+from revisions import load_blocks, make_blocks, plan_revision
+from sections import build_section_index
+
+# 동시에 처리할 번역 작업 수 (워커 스레드 수)
+JOB_WORKERS = int(os.getenv("TRANSLATION_JOB_WORKERS", "2"))
+
+# 세션 하나가 동시에 진행할 수 있는 최대 작업 수
+MAX_RUNNING_JOBS_PER_OWNER = int(os.getenv("TRANSLATION_JOBS_PER_OWNER", "1"))
+
+# 새 작업 알림이 없을 때 대기열을 다시 확인하는 간격 (다른 프로세스가 넣은 작업 확인용)
+JOB_POLL_SECONDS = float(os.getenv("TRANSLATION_JOB_POLL_SECONDS", "2"))
+
+# 워커가 생존 신호 없이 작업을 붙잡고 있을 수 있는 시간 (초, 넘으면 다른 워커/프로세스가 이어받음)
+JOB_LEASE_SECONDS = float(os.getenv("TRANSLATION_JOB_LEASE_SECONDS", "60"))
+
+# 번역 중인 청크의 미리 보기를 저장하는 최소 간격 (초, 응답 조각마다 쓰지 않도록)
+JOB_PARTIAL_SAVE_SECONDS = float(os.getenv("TRANSLATION_JOB_PARTIAL_SAVE_SECONDS", "0.5"))
+
+logger = logging.getLogger(__name__)
+
+
+def make_translation_title(translated_text: str) -> str:
+    """번역문 마크다운의 첫 번째 # 제목 (없으면 시각 기반 제목)"""
+    title_match = re.search(r'^#\s+(.+)$', translated_text, re.MULTILINE)
+    if title_match:
+        return title_match.group(1).strip()
+    return f"번역_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+class JobQueue:
+    """
+    데이터베이스 기반 번역 작업 대기열과 워커 스레드 풀
+
+    작업은 translation_jobs 테이블에 저장되므로 화면이 다시 실행되거나 서버가 재시작되어도 사라지지 않는다.
+    워커는 우선순위 순으로 작업을 꺼내 청크 단위 체크포인트를 남기며 번역하고,
+    끝나면 번역 기록으로 저장한다. 진행 중인 작업에는 주기적으로 생존 신호를 남기므로 여러 프로세스가
+    같은 데이터베이스를 써도 살아 있는 워커의 작업은 가져가지 않고, 신호가 끊긴 작업만 이어받는다. 번역은 API 대기 시간이 대부분이므로 프로세스 대신 스레드를 사용해
+    요청 스케줄러와 번역 캐시를 같은 프로세스 안에서 공유한다.
+    """
+
+    def __init__(self, db: TranslationDatabase, workers: int = JOB_WORKERS,
+                 max_running_per_owner: int = MAX_RUNNING_JOBS_PER_OWNER,
+                 poll_seconds: float = JOB_POLL_SECONDS,
+                 lease_seconds: float = JOB_LEASE_SECONDS,
+                 translate_chunks: Optional[Callable[..., Iterator[str]]] = None,
+                 split_text: Optional[Callable[[str], List[str]]] = None):
+        """
+        Args:
+            db: 작업과 번역 기록을 저장할 데이터베이스
+            workers: 워커 스레드 수
+            max_running_per_owner: 세션 하나가 동시에 진행할 수 있는 최대 작업 수
+            poll_seconds: 대기열을 다시 확인하는 간격
+            lease_seconds: 생존 신호 없이 작업을 붙잡고 있을 수 있는 시간 (신호는 이 시간의 1/3마다 보냄)
+            translate_chunks: 청크 번역 함수 (None이면 translator.translate_chunks_stream)
+            split_text: 원문 청크 분할 함수 (None이면 translator.split_text_into_chunks)
+        """
+        if translate_chunks is None or split_text is None:
+            from translator import split_text_into_chunks, translate_chunks_stream
+            translate_chunks = translate_chunks or translate_chunks_stream
+            split_text = split_text or split_text_into_chunks
+
+        self.db = db
+        self.workers = max(1, workers)
+        self.max_running_per_owner = max(1, max_running_per_owner)
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        # 이 대기열의 워커가 가져간 작업 표시 (프로세스마다 다름)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.translate_chunks = translate_chunks
+        self.split_text = split_text
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """
+        워커 스레드와 생존 신호 스레드 시작
+
+        중단된 프로세스가 진행 중이던 작업은 생존 신호가 lease_seconds 동안 끊긴 뒤에 이어받는다.
+        """
+        if self._threads:
+            return
+        self._threads.append(threading.Thread(target=self._heartbeat_loop, name="translation-heartbeat", daemon=True))
+        for index in range(self.workers):
+            self._threads.append(
+                threading.Thread(target=self._worker_loop, name=f"translation-worker-{index}", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """워커 스레드 종료 (진행 중인 작업은 현재 청크까지 마치고 대기열로 돌아감)"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, title: str, original_text: str, pdf_file: Union[bytes, BinaryIO] = None,
+               owner: Optional[str] = None, priority: int = 0) -> int:
+        """
+        번역 작업을 대기열에 넣고 작업 id를 돌려줌 (같은 원문의 작업이 이미 있으면 그 작업 id)
+
+        Args:
+            title: 작업 제목
+            original_text: 번역할 원문
+            pdf_file: 원본 PDF (바이트 또는 읽을 수 있는 바이너리 파일 객체)
+            owner: 작업을 요청한 세션 식별자
+            priority: 우선순위 (클수록 먼저 처리)
+        """
+        chunks = self.split_text(original_text)
+        job_id = self.db.create_job(title, original_text, chunks, pdf_file, owner=owner, priority=priority)
+        self._wakeup.set()
+        return job_id
+
+    def submit_revision(self, title: str, original_text: str, parent_id: int,
+                        pdf_file: Union[bytes, BinaryIO] = None, owner: Optional[str] = None,
+                        priority: int = 0) -> Tuple[int, Dict]:
+        """
+        이전 버전 번역 기록과 맞춰 보고 바뀐 문단만 번역하는 개정판 작업을 대기열에 넣음
+
+        이전 버전에서 그대로 남은 문단 묶음은 완료된 청크로 미리 채워 두므로 워커는 나머지만 번역하고,
+        완료되면 이전 버전에 연결된 새 번역 기록으로 저장한다.
+
+        Args:
+            title: 작업 제목
+            original_text: 새 버전 원문
+            parent_id: 이전 버전 번역 기록 id
+            pdf_file: 원본 PDF (바이트 또는 읽을 수 있는 바이너리 파일 객체)
+            owner: 작업을 요청한 세션 식별자
+            priority: 우선순위 (클수록 먼저 처리)
+
+        Returns:
+            Tuple[int, Dict]: 작업 id, 문단 수 통계 (reused_paragraphs, translate_paragraphs)
+        """
+        chunks, completed, stats = plan_revision(load_blocks(self.db, parent_id, self.split_text), original_text,
+                                                 split_text=self.split_text)
+        job_id = self.db.create_job(title, original_text, chunks, pdf_file, owner=owner, priority=priority,
+                                    parent_id=parent_id, completed=completed)
+        self._wakeup.set()
+        return job_id, stats
+
+    def retry(self, job_id: int, priority: Optional[int] = None) -> bool:
+        """실패한 작업을 다시 대기열에 넣음 (완료된 청크는 다시 번역하지 않음)"""
+        updated = self.db.requeue_job(job_id, priority)
+        self._wakeup.set()
+        return updated
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.db.renew_job_leases(self.worker_id)
+            except Exception:
+                logger.exception("번역 작업 생존 신호를 남기지 못했습니다")
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            job_id = self.db.claim_next_job(self.max_running_per_owner, self.worker_id, self.lease_seconds)
+            if job_id is None:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+            self.run_job(job_id)
+            # 세션별 제한 때문에 건너뛴 작업이 있을 수 있으므로 다른 워커도 다시 확인
+            self._wakeup.set()
+
+    def run_job(self, job_id: int) -> Optional[int]:
+        """
+        작업 하나를 번역해서 번역 기록으로 저장
+
+        Returns:
+            Optional[int]: 저장된 번역 기록 id (실패하거나 중단되면 None)
+        """
+        try:
+            job = self.db.get_job(job_id)
+            if job is None:
+                return None
+
+            with metrics.track_run("translation", label=job['title']):
+                chunks = [chunk['source_text'] for chunk in job['chunks']]
+                completed = {
+                    chunk['index']: chunk['translated_text']
+                    for chunk in job['chunks'] if chunk['status'] == 'completed'
+                }
+
+                # 번역 중인 청크의 응답 조각은 청크별로 JOB_PARTIAL_SAVE_SECONDS마다 저장해서 화면에 미리 보여줌
+                last_partial_save = {}
+                partial_lock = threading.Lock()
+
+                def save_partial(index: int, text: str):
+                    now = time.monotonic()
+                    with partial_lock:
+                        if now - last_partial_save.get(index, float('-inf')) < JOB_PARTIAL_SAVE_SECONDS:
+                            return
+                        last_partial_save[index] = now
+                    self.db.save_job_chunk_partial(job_id, index, text)
+
+                pieces = []
+                for piece in self.translate_chunks(
+                    chunks,
+                    completed=completed,
+                    on_chunk_done=lambda index, text: self.db.save_job_chunk(job_id, index, text),
+                    session_id=job['owner'] or f"job:{job_id}",
+                    on_chunk_partial=save_partial
+                ):
+                    if self._stop.is_set():
+                        # 종료 중이면 완료된 청크까지만 남기고 다음 실행 때 이어서 번역
+                        self.db.update_job_status(job_id, 'queued', worker_id=self.worker_id)
+                        return None
+                    pieces.append(piece)
+
+                translated_text = "".join(pieces)
+                with metrics.stage("save"):
+                    # 번역 기록, 다음 개정판에서 재사용할 문단 묶음, 섹션 목차를 작업 완료와 함께 한 번에 저장
+                    translation_id = self.db.complete_job(
+                        job_id,
+                        worker_id=self.worker_id,
+                        title=make_translation_title(translated_text),
+                        translated_text=translated_text,
+                        blocks=make_blocks(chunks, self.db.get_completed_chunk_texts(job_id)),
+                        section_index=build_section_index(translated_text)
+                    )
+                return translation_id
+
+        except Exception as e:
+            self.db.update_job_status(job_id, 'failed', str(e), worker_id=self.worker_id)
+            return None
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue(db: TranslationDatabase) -> JobQueue:
+    """프로세스 전체에서 공유하는 작업 대기열 (처음 호출할 때 워커 시작)"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(db)
+            _job_queue.start()
+        return _job_queue
@@ -0,0 +1,464 @@
+"""
+번역 성능 지표 수집
+
+번역 한 건(run)마다 단계별 소요 시간(PDF 추출, 프롬프트 생성, 제미나이 호출, 저장 등)과
+토큰 수, 처리한 바이트 수, 재시도 횟수를 모아서 metric_runs / metric_stages 테이블에 저장한다.
+청크는 여러 워커가 동시에 번역하므로 단계별 시간은 워커별 시간을 모두 더한 값(seconds)과
+겹치는 시간을 한 번만 센 경과 시간(wall_seconds)을 따로 기록한다.
+현재 run은 contextvars로 전달되므로 각 모듈은 stage()/count()만 호출하면 되고,
+run이 없거나 수집이 꺼져 있으면 이 함수들은 아무 일도 하지 않는다.
+
+Prometheus 텍스트 형식 내보내기: python metrics.py --output metrics.prom
+"""
+import argparse
+import contextvars
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 성능 지표 수집 여부
+METRICS_ENABLED = os.getenv("TRANSLATION_METRICS_ENABLED", "1") != "0"
+
+# 성능 지표를 저장할 데이터베이스
+METRICS_DB_PATH = os.getenv("TRANSLATION_METRICS_DB", "translations.db")
+
+# 백분위수를 계산할 기본 기간 (시간)
+METRICS_WINDOW_HOURS = int(os.getenv("TRANSLATION_METRICS_WINDOW_HOURS", "24"))
+
+# run마다 누적하는 카운터 (metric_runs 테이블 컬럼과 같음)
+COUNTERS = (
+    'pages',             # 추출한 PDF 페이지 수
+    'pdf_bytes',         # 추출한 PDF 크기
+    'source_bytes',      # 번역 요청한 원문 크기 (UTF-8)
+    'translated_bytes',  # 받은 번역문 크기 (UTF-8)
+    'input_tokens',      # 제미나이 입력 토큰 수
+    'output_tokens',     # 제미나이 출력 토큰 수
+    'api_calls',         # 제미나이 호출 횟수 (재시도 포함)
+    'retries',           # 재시도 횟수
+    'cache_hits',        # 번역 캐시 적중 청크 수
+    'truncations',       # 잘린 응답 때문에 청크를 나누어 다시 번역한 횟수
+    'memory_hits',       # 번역 메모리에서 재사용한 문단 수
+    'passthrough_segments',  # 번역하지 않고 원문 그대로 둔 문단 수 (참고문헌, 표, 수식 등)
+    'passthrough_tokens',    # 원문 그대로 두어 보내지 않은 원문 토큰 수 (추정치)
+)
+
+_current_run = contextvars.ContextVar("translation_metrics_run", default=None)
+
+
+class MetricsRun:
+    """번역 한 건의 단계별 소요 시간과 카운터 (여러 스레드에서 동시에 기록 가능)"""
+
+    def __init__(self, kind: str, label: Optional[str] = None):
+        self.kind = kind
+        self.label = label
+        self.status = 'ok'
+        self.started_at = datetime.now()
+        self.total_seconds = 0.0
+        self.stage_seconds: Dict[str, float] = {}
+        self.stage_wall_seconds: Dict[str, float] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._stage_spans: Dict[str, List[Tuple[float, float]]] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_time(self, stage_name: str, seconds: float, ended: Optional[float] = None):
+        """단계 소요 시간 기록 (ended는 끝난 시각의 perf_counter 값, None이면 지금 끝난 것으로 봄)"""
+        ended = time.perf_counter() if ended is None else ended
+        with self._lock:
+            self.stage_seconds[stage_name] = self.stage_seconds.get(stage_name, 0.0) + seconds
+            self._stage_spans.setdefault(stage_name, []).append((ended - seconds, ended))
+
+    def add(self, counter: str, value: int = 1):
+        with self._lock:
+            self.counters[counter] += value
+
+    def finish(self, status: str):
+        self.status = status
+        self.total_seconds = time.perf_counter() - self._started
+        with self._lock:
+            self.stage_wall_seconds = {name: _union_seconds(spans) for name, spans in self._stage_spans.items()}
+
+
+def _union_seconds(spans: List[Tuple[float, float]]) -> float:
+    """구간 목록이 덮는 전체 길이 (겹치는 부분은 한 번만 셈)"""
+    total = 0.0
+    covered_until = float('-inf')
+    for start, end in sorted(spans):
+        if end > covered_until:
+            total += end - max(start, covered_until)
+            covered_until = end
+    return total
+
+
+@contextmanager
+def track_run(kind: str, label: Optional[str] = None):
+    """
+    번역 한 건의 지표 수집 범위 (끝나면 데이터베이스에 저장)
+
+    이미 수집 중인 run 안에서 다시 호출하면 바깥 run에 함께 기록한다.
+
+    Args:
+        kind: run 종류 (extraction, translation 등)
+        label: 문서별 보고에 표시할 이름 (논문 제목, 파일 이름 등)
+
+    Yields:
+        Optional[MetricsRun]: 수집 중인 run (수집이 꺼져 있으면 None)
+    """
+    if not METRICS_ENABLED or _current_run.get() is not None:
+        yield _current_run.get()
+        return
+
+    run = MetricsRun(kind, label)
+    token = _current_run.set(run)
+    try:
+        yield run
+    except BaseException:
+        run.status = 'error'
+        raise
+    finally:
+        _current_run.reset(token)
+        run.finish(run.status)
+        try:
+            get_metrics_store().record(run)
+        except Exception:
+            # 지표 저장 실패가 번역을 실패시키지 않도록 무시
+            pass
+
+
+@contextmanager
+def stage(name: str):
+    """현재 run에 단계 소요 시간 기록 (run이 없으면 아무 일도 하지 않음)"""
+    run = _current_run.get()
+    if run is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        ended = time.perf_counter()
+        run.add_time(name, ended - started, ended)
+
+
+def add_time(name: str, seconds: float):
+    """방금 끝난 구간의 이미 측정한 시간을 현재 run의 단계 소요 시간에 더함"""
+    run = _current_run.get()
+    if run is not None:
+        run.add_time(name, seconds)
+
+
+def count(counter: str, value: int = 1):
+    """현재 run의 카운터 증가"""
+    run = _current_run.get()
+    if run is not None:
+        run.add(counter, value)
+
+
+def bind(fn: Callable) -> Callable:
+    """워커 스레드에서 실행될 함수가 현재 run에 기록하도록 감싸기 (run이 없으면 그대로 돌려줌)"""
+    if _current_run.get() is None:
+        return fn
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+
+def estimate_saved_seconds(run: Dict) -> float:
+    """
+    원문 그대로 둔 구간 덕분에 줄어든 제미나이 호출 시간 추정 (get_recent_runs 항목 기준)
+
+    보낸 입력 토큰당 호출 시간이 같다고 보고, 보내지 않은 토큰 수에 곱한다.
+    """
+    if not run['input_tokens']:
+        return 0.0
+    return run['gemini_seconds'] * run['passthrough_tokens'] / run['input_tokens']
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class MetricsStore:
+    """성능 지표 저장소"""
+
+    def __init__(self, db_path: str = "translations.db"):
+        from database import get_connection_pool
+
+        self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
+        self.init_database()
+
+    def init_database(self):
+        """지표 테이블 초기화"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS metric_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    label TEXT,
+                    status TEXT NOT NULL,
+                    started_at TIMESTAMP NOT NULL,
+                    total_seconds REAL NOT NULL,
+                    {", ".join(f"{counter} INTEGER NOT NULL DEFAULT 0" for counter in COUNTERS)}
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_metric_runs_started_at
+                ON metric_runs (started_at)
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metric_stages (
+                    run_id INTEGER NOT NULL,
+                    stage TEXT NOT NULL,
+                    seconds REAL NOT NULL,
+                    PRIMARY KEY (run_id, stage)
+                )
+            ''')
+
+            # 나중에 추가된 컬럼
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(metric_runs)')}
+            if 'label' not in columns:
+                cursor.execute('ALTER TABLE metric_runs ADD COLUMN label TEXT')
+            for counter in COUNTERS:
+                if counter not in columns:
+                    cursor.execute(f'ALTER TABLE metric_runs ADD COLUMN {counter} INTEGER NOT NULL DEFAULT 0')
+            # 단계별 경과 시간 (이전에 저장된 run은 NULL - 워커별 합계만 있음)
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(metric_stages)')}
+            if 'wall_seconds' not in columns:
+                cursor.execute('ALTER TABLE metric_stages ADD COLUMN wall_seconds REAL')
+
+    def record(self, run: MetricsRun) -> int:
+        """run 하나 저장"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(f'''
+                INSERT INTO metric_runs (kind, label, status, started_at, total_seconds, {", ".join(COUNTERS)})
+                VALUES (?, ?, ?, ?, ?, {", ".join("?" for _ in COUNTERS)})
+            ''', (run.kind, run.label, run.status, run.started_at, run.total_seconds,
+                  *(run.counters[counter] for counter in COUNTERS)))
+            run_id = cursor.lastrowid
+
+            cursor.executemany('''
+                INSERT INTO metric_stages (run_id, stage, seconds, wall_seconds) VALUES (?, ?, ?, ?)
+            ''', [(run_id, name, seconds, run.stage_wall_seconds.get(name))
+                  for name, seconds in run.stage_seconds.items()])
+            return run_id
+
+    def get_latencies(self, since: datetime, kind: Optional[str] = None, wall: bool = False) -> Dict[str, List[float]]:
+        """
+        기간 안의 run 전체 소요 시간과 단계별 소요 시간 목록
+
+        Args:
+            since: 이 시각 이후에 시작한 run만
+            kind: run 종류 (None이면 전체)
+            wall: True면 단계별 경과 시간 (동시에 실행된 워커의 시간은 한 번만 셈),
+                False면 워커별 시간을 모두 더한 값
+
+        Returns:
+            Dict[str, List[float]]: {'total': [...], 단계 이름: [...]} (각 목록은 정렬됨)
+        """
+        stage_seconds = "COALESCE(s.wall_seconds, s.seconds)" if wall else "s.seconds"
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+
+            kind_filter = "AND kind = ?" if kind else ""
+            params = (since, kind) if kind else (since,)
+            cursor.execute(f'''
+                SELECT total_seconds FROM metric_runs
+                WHERE started_at >= ? AND status = 'ok' {kind_filter}
+                ORDER BY total_seconds
+            ''', params)
+            latencies = {'total': [row[0] for row in cursor.fetchall()]}
+
+            cursor.execute(f'''
+                SELECT s.stage, {stage_seconds} AS seconds FROM metric_stages s
+                JOIN metric_runs r ON r.id = s.run_id
+                WHERE r.started_at >= ? AND r.status = 'ok' {kind_filter.replace("kind", "r.kind")}
+                ORDER BY s.stage, seconds
+            ''', params)
+            for name, seconds in cursor.fetchall():
+                latencies.setdefault(name, []).append(seconds)
+
+        return latencies
+
+    def get_totals(self) -> List[Dict]:
+        """run 종류/상태별 누적 횟수, 소요 시간, 카운터 합계"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT kind, status, COUNT(*) AS runs, SUM(total_seconds) AS total_seconds,
+                       {", ".join(f"SUM({counter}) AS {counter}" for counter in COUNTERS)}
+                FROM metric_runs
+                GROUP BY kind, status
+                ORDER BY kind, status
+            ''')
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_stage_totals(self) -> List[Dict]:
+        """단계별 누적 횟수와 소요 시간 (seconds는 워커별 합계, wall_seconds는 경과 시간)"""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT stage, COUNT(*) AS count, SUM(seconds) AS seconds,
+                       SUM(COALESCE(wall_seconds, seconds)) AS wall_seconds
+                FROM metric_stages
+                GROUP BY stage
+                ORDER BY stage
+            ''')
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_recent_runs(self, limit: int = 20, kind: str = 'translation') -> List[Dict]:
+        """
+        최근 run 목록 (문서별 보고용, 최신순)
+
+        Returns:
+            List[Dict]: label, status, started_at, total_seconds, gemini_seconds, 카운터 값
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT r.label, r.status, r.started_at, r.total_seconds,
+                       COALESCE(s.seconds, 0) AS gemini_seconds, {", ".join(f"r.{counter}" for counter in COUNTERS)}
+                FROM metric_runs r
+                LEFT JOIN metric_stages s ON s.run_id = r.id AND s.stage = 'gemini'
+                WHERE r.kind = ?
+                ORDER BY r.started_at DESC, r.id DESC
+                LIMIT ?
+            ''', (kind, limit))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_hourly_throughput(self, since: datetime, kind: str = 'translation') -> List[Dict]:
+        """
+        시간대별 처리량
+
+        Returns:
+            List[Dict]: hour, runs (완료 건수), translated_bytes (받은 번역문 크기), avg_seconds
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT strftime('%Y-%m-%d %H:00', started_at) AS hour, COUNT(*) AS runs,
+                       SUM(translated_bytes) AS translated_bytes, AVG(total_seconds) AS avg_seconds
+                FROM metric_runs
+                WHERE started_at >= ? AND kind = ? AND status = 'ok'
+                GROUP BY hour
+                ORDER BY hour
+            ''', (since, kind))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def render_prometheus(self, window_hours: int = METRICS_WINDOW_HOURS) -> str:
+        """
+        Prometheus 텍스트 형식으로 지표 내보내기
+
+        누적 값은 counter, 소요 시간은 최근 window_hours 시간의 백분위수와 전체 합계/횟수를 summary로 낸다.
+        """
+        since = datetime.now() - timedelta(hours=window_hours)
+        lines = []
+
+        def metric(name: str, metric_type: str, help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        totals = self.get_totals()
+
+        metric("translator_runs_total", "counter", "Completed runs by kind and status.")
+        for row in totals:
+            lines.append(f'translator_runs_total{{kind="{row["kind"]}",status="{row["status"]}"}} {row["runs"]}')
+
+        for counter in COUNTERS:
+            name = f"translator_{counter}_total"
+            metric(name, "counter", f"Sum of {counter} over all runs.")
+            for row in totals:
+                lines.append(f'{name}{{kind="{row["kind"]}",status="{row["status"]}"}} {row[counter] or 0}')
+
+        # 추출처럼 짧은 run과 번역처럼 긴 run이 섞이면 백분위수가 의미 없으므로 종류별로 나눔
+        metric("translator_run_duration_seconds", "summary",
+               f"Wall time of successful runs by kind (quantiles over the last {window_hours}h).")
+        for row in totals:
+            if row['status'] != 'ok':
+                continue
+            kind = row['kind']
+            run_latencies = self.get_latencies(since, kind=kind)['total']
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(f'translator_run_duration_seconds{{kind="{kind}",quantile="{quantile}"}} '
+                             f'{percentile(run_latencies, quantile * 100):.6f}')
+            lines.append(f'translator_run_duration_seconds_sum{{kind="{kind}"}} {row["total_seconds"]:.6f}')
+            lines.append(f'translator_run_duration_seconds_count{{kind="{kind}"}} {row["runs"]}')
+
+        latencies = self.get_latencies(since)
+
+        stage_totals = self.get_stage_totals()
+        metric("translator_stage_duration_seconds", "summary",
+               f"Time per stage summed across concurrent workers (quantiles over the last {window_hours}h).")
+        for row in stage_totals:
+            values = latencies.get(row['stage'], [])
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(f'translator_stage_duration_seconds{{stage="{row["stage"]}",quantile="{quantile}"}} '
+                             f'{percentile(values, quantile * 100):.6f}')
+            lines.append(f'translator_stage_duration_seconds_sum{{stage="{row["stage"]}"}} {row["seconds"]:.6f}')
+            lines.append(f'translator_stage_duration_seconds_count{{stage="{row["stage"]}"}} {row["count"]}')
+
+        wall_latencies = self.get_latencies(since, wall=True)
+        metric("translator_stage_wall_seconds", "summary",
+               f"Wall-clock span per stage, overlapping worker time counted once "
+               f"(quantiles over the last {window_hours}h).")
+        for row in stage_totals:
+            values = wall_latencies.get(row['stage'], [])
+            for quantile in (0.5, 0.95, 0.99):
+                lines.append(f'translator_stage_wall_seconds{{stage="{row["stage"]}",quantile="{quantile}"}} '
+                             f'{percentile(values, quantile * 100):.6f}')
+            lines.append(f'translator_stage_wall_seconds_sum{{stage="{row["stage"]}"}} {row["wall_seconds"]:.6f}')
+            lines.append(f'translator_stage_wall_seconds_count{{stage="{row["stage"]}"}} {row["count"]}')
+
+        return "\n".join(lines) + "\n"
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> MetricsStore:
+    """프로세스 전체에서 공유하는 지표 저장소"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MetricsStore(METRICS_DB_PATH)
+        return _store
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="번역 성능 지표를 Prometheus 텍스트 형식으로 내보내기")
+    parser.add_argument("--db", default=METRICS_DB_PATH, help="지표 데이터베이스 경로")
+    parser.add_argument("--output", help="저장할 파일 (없으면 표준 출력, node_exporter textfile collector용)")
+    parser.add_argument("--window-hours", type=int, default=METRICS_WINDOW_HOURS, help="백분위수 계산 기간")
+    args = parser.parse_args(argv)
+
+    text = MetricsStore(args.db).render_prometheus(args.window_hours)
+    if not args.output:
+        sys.stdout.write(text)
+        return 0
+
+    # 수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    temp_path = f"{args.output}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
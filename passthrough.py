@@ -0,0 +1,78 @@
+import re
+from typing import Optional
+
+# 이보다 짧은 문단은 번역 비용이 작으므로 항상 번역
+MIN_PASSTHROUGH_CHARS = 80
+
+# 영어 단어 글자가 공백 아닌 문자 중 이 비율보다 적으면 문장이 아닌 구간(표, 수식, URL 목록)으로 봄
+MIN_PROSE_RATIO = 0.3
+
+_REFERENCES_HEADING = re.compile(r'^(?:\d+\.?\s+)?(?:References|Bibliography|REFERENCES|BIBLIOGRAPHY)$')
+_URL = re.compile(r'(?:https?://|www\.|doi:\s*|arXiv:\s*)\S+|\S+@\S+\.[A-Za-z]+', re.IGNORECASE)
+_WORD = re.compile(r'[A-Za-z]{3,}')
+_YEAR = re.compile(r'\b(?:19|20)\d{2}[a-z]?\b')
+_INITIAL = re.compile(r'\b[A-Z]\.(?=\s*[A-Z,-])')
+_BIBLIOGRAPHY_CUE = re.compile(
+    r'\[\d+\]|\bet al\.|\bProc(?:eedings|\.)|\bConference\b|\bJournal\b|\bTrans\.|\barXiv\b|\bvol\.|\bpp\.'
+    r'|\bdoi\b|\bIn\b(?= [A-Z])'
+)
+
+
+def _looks_like_references(text: str) -> bool:
+    """
+    참고문헌 목록처럼 보이는지 확인
+
+    연도가 자주 나오고(1000자당 4번 이상), 저자 이름 머리글자와 서지 표시(et al., Proceedings, [12] 등)가
+    연도만큼 많으면 참고문헌으로 본다. 본문 속 인용은 연도 밀도와 머리글자 수에서 걸러진다.
+    """
+    years = len(_YEAR.findall(text))
+    if years < 3 or years * 1000 < len(text) * 4:
+        return False
+    return len(_INITIAL.findall(text)) >= years and len(_BIBLIOGRAPHY_CUE.findall(text)) * 2 >= years
+
+
+def _looks_like_table(text: str) -> bool:
+    """줄 대부분이 숫자 위주의 행(칸의 절반 이상에 숫자가 있는 줄)이면 표로 봄"""
+    lines = [line.split() for line in text.split('\n') if line.strip()]
+    if len(lines) < 3:
+        return False
+    numeric_rows = sum(
+        1 for cells in lines
+        if sum(1 for cell in cells if any(c.isdigit() for c in cell)) * 2 >= len(cells)
+    )
+    return numeric_rows >= len(lines) * 0.6
+
+
+def classify_segment(text: str) -> Optional[str]:
+    """
+    번역하지 않고 원문 그대로 둘 구간인지 판단하는 함수
+
+    Args:
+        text: 원문 문단
+
+    Returns:
+        Optional[str]: 그대로 둘 이유 ('references', 'url', 'table', 'equation'), 번역할 문단이면 None
+    """
+    stripped = text.strip()
+    if len(stripped) < MIN_PASSTHROUGH_CHARS:
+        return None
+
+    if _REFERENCES_HEADING.match(stripped.split('\n', 1)[0].strip()) or _looks_like_references(stripped):
+        return 'references'
+    if _looks_like_table(stripped):
+        return 'table'
+
+    nonspace = len(re.sub(r'\s', '', stripped))
+    without_urls = _URL.sub(' ', stripped)
+    word_chars = sum(len(word) for word in _WORD.findall(without_urls))
+    if word_chars >= nonspace * MIN_PROSE_RATIO:
+        return None
+
+    # 문장이 거의 없는 구간은 가장 많이 차지하는 내용으로 분류
+    url_chars = nonspace - len(re.sub(r'\s', '', without_urls))
+    digits = sum(1 for c in without_urls if c.isdigit())
+    if url_chars >= nonspace * 0.5:
+        return 'url'
+    if digits >= (nonspace - url_chars) * 0.3:
+        return 'table'
+    return 'equation'
@@ -1,27 +1,256 @@
-import PyPDF2
+import hashlib
 import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Optional, Tuple
 
-def extract_text_from_pdf(pdf_file) -> str:
+import metrics
+
+# PyPDF2는 앱 시작 시간을 줄이기 위해 PDF를 처음 다룰 때 각 함수 안에서 불러옴
+
+# 이 페이지 수 이상이면 프로세스 풀로 나누어 추출
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "40"))
+
+# 추출에 사용할 최대 프로세스 수
+MAX_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+
+# 추출 결과 캐시 설정 (전체 크기 제한, 유효 시간)
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("PDF_EXTRACTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("PDF_EXTRACTION_CACHE_TTL", "3600"))
+
+
+class ExtractionCache:
+    """PDF 내용 해시별 추출 텍스트를 보관하는 프로세스 공용 LRU 캐시 (크기/유효 시간 제한)"""
+
+    def __init__(self, max_bytes: int, ttl_seconds: int):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            text, size, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.total_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str):
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (text, size, time.monotonic())
+            self.total_bytes += size
+            # 가장 오래 사용되지 않은 항목부터 제거
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+
+_extraction_cache = ExtractionCache(EXTRACTION_CACHE_MAX_BYTES, EXTRACTION_CACHE_TTL_SECONDS)
+
+
+def hash_pdf(pdf_file) -> str:
+    """PDF 내용의 SHA-256 해시 (파일 객체는 버퍼를 복사하지 않고 계산)"""
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return hashlib.sha256(pdf_file).hexdigest()
+    if hasattr(pdf_file, 'getbuffer'):
+        with pdf_file.getbuffer() as buffer:
+            return hashlib.sha256(buffer).hexdigest()
+    return hashlib.sha256(_read_pdf_bytes(pdf_file)).hexdigest()
+
+
+def _read_pdf_bytes(pdf_file) -> bytes:
+    """파일 객체 또는 바이트에서 PDF 바이트 읽기"""
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    pdf_file.seek(0)
+    data = pdf_file.read()
+    pdf_file.seek(0)
+    return data
+
+
+def get_page_count(pdf_file) -> int:
+    """
+    PDF 페이지 수를 반환하는 함수 (진행률 표시용)
+
+    Args:
+        pdf_file: 업로드된 PDF 파일 객체 또는 바이트
+
+    Returns:
+        int: 페이지 수
+    """
+    import PyPDF2
+
+    source = io.BytesIO(pdf_file) if isinstance(pdf_file, (bytes, bytearray)) else pdf_file
+    return len(PyPDF2.PdfReader(source).pages)
+
+
+def slice_pdf_pages(pdf_bytes: bytes, start: int, end: int) -> bytes:
+    """
+    PDF에서 페이지 범위 [start, end)만 잘라 새 PDF로 만드는 함수 (미리보기용)
+
+    Args:
+        pdf_bytes: 원본 PDF 바이트
+        start: 시작 페이지 번호 (0부터)
+        end: 끝 페이지 번호 (포함하지 않음, 전체 페이지 수를 넘으면 마지막 페이지까지)
+
+    Returns:
+        bytes: 해당 페이지만 담은 PDF 바이트
+    """
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    pdf_writer = PyPDF2.PdfWriter()
+    for page_num in range(max(start, 0), min(end, len(pdf_reader.pages))):
+        pdf_writer.add_page(pdf_reader.pages[page_num])
+
+    output = io.BytesIO()
+    pdf_writer.write(output)
+    return output.getvalue()
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, end: int) -> List[Tuple[int, str, Optional[str]]]:
+    """
+    페이지 범위 [start, end)의 텍스트를 추출하는 함수 (프로세스 풀 작업 단위)
+
+    Returns:
+        List[Tuple[int, str, Optional[str]]]: (페이지 번호, 텍스트, 오류 메시지) 목록
+    """
+    import PyPDF2
+
+    return _extract_from_reader(PyPDF2.PdfReader(io.BytesIO(pdf_bytes)), start, end)
+
+
+def _extract_from_reader(pdf_reader, start: int, end: int) -> List[Tuple[int, str, Optional[str]]]:
+    """이미 연 PdfReader에서 페이지 범위 [start, end)의 텍스트 추출"""
+    results = []
+    for page_num in range(start, end):
+        try:
+            results.append((page_num, pdf_reader.pages[page_num].extract_text() or "", None))
+        except Exception as e:
+            # 한 페이지 추출 실패가 전체 문서를 중단시키지 않도록 빈 텍스트로 처리
+            results.append((page_num, "", str(e)))
+    return results
+
+
+def iter_pdf_pages(pdf_file) -> Iterator[Tuple[int, str]]:
+    """
+    PDF 페이지를 추출하는 대로 하나씩 돌려주는 제너레이터
+
+    전체 추출이 끝나기 전에 앞쪽 페이지부터 다음 단계(번역 등)를 시작할 수 있다.
+
+    Args:
+        pdf_file: 업로드된 PDF 파일 객체 또는 바이트
+
+    Yields:
+        Tuple[int, str]: (페이지 번호, 페이지 텍스트) - 추출에 실패한 페이지는 빈 텍스트
+    """
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(_read_pdf_bytes(pdf_file)))
+    for page_num in range(len(pdf_reader.pages)):
+        _, text, _ = _extract_from_reader(pdf_reader, page_num, page_num + 1)[0]
+        yield page_num, text
+
+
+def extract_pages(pdf_file, parallel: Optional[bool] = None, max_workers: Optional[int] = None,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> Tuple[List[str], List[int]]:
+    """
+    PDF 파일에서 페이지별 텍스트를 추출하는 함수
+
+    Args:
+        pdf_file: 업로드된 PDF 파일 객체 또는 바이트
+        parallel: 프로세스 풀 사용 여부 (None이면 페이지 수에 따라 자동 결정)
+        max_workers: 최대 프로세스 수
+        on_progress: (추출한 페이지 수, 전체 페이지 수)로 호출되는 진행률 콜백
+
+    Returns:
+        Tuple[List[str], List[int]]: 페이지 순서대로 정렬된 텍스트 목록, 추출에 실패한 페이지 번호 목록
+    """
+    pdf_bytes = _read_pdf_bytes(pdf_file)
+    total_pages = get_page_count(pdf_bytes)
+    max_workers = max_workers or MAX_EXTRACT_WORKERS
+    metrics.count('pdf_bytes', len(pdf_bytes))
+    metrics.count('pages', total_pages)
+    if parallel is None:
+        parallel = total_pages >= PARALLEL_PAGE_THRESHOLD and max_workers > 1
+
+    pages = [""] * total_pages
+    failed_pages = []
+    done = 0
+
+    def collect(results):
+        nonlocal done
+        for page_num, text, error in results:
+            pages[page_num] = text
+            if error is not None:
+                failed_pages.append(page_num)
+        done += len(results)
+        if on_progress:
+            on_progress(done, total_pages)
+
+    if not parallel or total_pages < 2:
+        # 페이지마다 진행률을 알릴 수 있도록 한 페이지씩 추출
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        for page_num in range(total_pages):
+            collect(_extract_from_reader(pdf_reader, page_num, page_num + 1))
+    else:
+        # 워커당 여러 작업을 나누어 주어 느린 페이지가 한 워커에 몰리지 않도록 함
+        batch_size = max(1, total_pages // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_extract_page_range, pdf_bytes, start, min(start + batch_size, total_pages))
+                for start in range(0, total_pages, batch_size)
+            ]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    return pages, sorted(failed_pages)
+
+
+def extract_text_from_pdf(pdf_file, parallel: Optional[bool] = None, max_workers: Optional[int] = None,
+                          on_progress: Optional[Callable[[int, int], None]] = None) -> str:
     """
     PDF 파일에서 텍스트를 추출하는 함수
-    
+
+    추출 결과는 PDF 내용 해시로 캐시되므로 같은 PDF는 세션이 달라도 다시 추출하지 않는다.
+
     Args:
         pdf_file: 업로드된 PDF 파일 객체
-        
+        parallel: 프로세스 풀 사용 여부 (None이면 페이지 수에 따라 자동 결정)
+        max_workers: 최대 프로세스 수
+        on_progress: (추출한 페이지 수, 전체 페이지 수)로 호출되는 진행률 콜백
+
     Returns:
         str: 추출된 텍스트
     """
     try:
-        # PDF 파일 읽기
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        # 모든 페이지의 텍스트 추출
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
-    
+        with metrics.stage("extract"):
+            # 같은 내용의 PDF는 다시 추출하지 않음
+            pdf_hash = hash_pdf(pdf_file)
+            cached = _extraction_cache.get(pdf_hash)
+            if cached is not None:
+                return cached
+
+            pages, _ = extract_pages(pdf_file, parallel=parallel, max_workers=max_workers, on_progress=on_progress)
+            text = "\n".join(pages).strip()
+            _extraction_cache.put(pdf_hash, text)
+            return text
+
     except Exception as e:
         raise Exception(f"PDF 텍스트 추출 중 오류가 발생했습니다: {str(e)}")
@@ -0,0 +1,126 @@
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from pdf_processor import iter_pdf_pages
+from translator import CHUNK_TOKEN_BUDGET, MAX_CONCURRENCY, estimate_tokens, split_text_into_chunks, translate_chunk
+
+# 추출 스레드가 끝났음을 알리는 표시
+_END_OF_PAGES = object()
+
+
+def iter_source_chunks(pages: Iterable[str], max_tokens: int = CHUNK_TOKEN_BUDGET) -> Iterator[str]:
+    """
+    페이지 텍스트를 쌓아 두다가 청크 하나 분량이 모이면 바로 내보내는 제너레이터
+
+    쌓인 텍스트를 섹션/문단 경계에서 나누고, 마지막 조각은 다음 페이지와 이어질 수 있으므로
+    남겨 두었다가 다음 페이지와 합쳐서 다시 나눈다.
+    """
+    buffer = ""
+    for text in pages:
+        buffer = f"{buffer}\n{text}" if buffer else text
+        if estimate_tokens(buffer) <= max_tokens:
+            continue
+
+        chunks = split_text_into_chunks(buffer, max_tokens)
+        for chunk in chunks[:-1]:
+            yield chunk
+        buffer = chunks[-1] if chunks else ""
+
+    if buffer.strip():
+        yield from split_text_into_chunks(buffer, max_tokens)
+
+
+def _pages_in_background(pdf_file, collected_pages: List[str],
+                         on_page: Optional[Callable[[int], None]] = None) -> Iterator[str]:
+    """별도 스레드에서 PDF 페이지를 추출하면서 추출된 페이지를 차례로 돌려줌"""
+    pages = queue.Queue()
+
+    def extract():
+        try:
+            for page_num, text in iter_pdf_pages(pdf_file):
+                pages.put(text)
+                if on_page:
+                    on_page(page_num + 1)
+        except Exception as e:
+            pages.put(e)
+        finally:
+            pages.put(_END_OF_PAGES)
+
+    threading.Thread(target=extract, daemon=True).start()
+
+    while True:
+        item = pages.get()
+        if item is _END_OF_PAGES:
+            return
+        if isinstance(item, Exception):
+            raise Exception(f"PDF 텍스트 추출 중 오류가 발생했습니다: {str(item)}")
+        collected_pages.append(item)
+        yield item
+
+
+def translate_pdf_pipeline(pdf_file, session_id: str = "default", max_tokens: int = CHUNK_TOKEN_BUDGET,
+                           max_workers: int = MAX_CONCURRENCY, collected_pages: Optional[List[str]] = None,
+                           on_page: Optional[Callable[[int], None]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    PDF 추출과 번역을 겹쳐서 실행하는 파이프라인
+
+    추출 스레드가 페이지를 꺼내는 동안 청크 하나 분량이 모일 때마다 번역 워커 풀에 제출하므로,
+    뒤쪽 페이지 추출과 앞쪽 청크 번역이 동시에 진행된다.
+
+    Args:
+        pdf_file: PDF 파일 객체 또는 바이트
+        session_id: 요청 스케줄러의 공정 대기열에 사용할 세션 식별자
+        max_tokens: 청크 하나의 최대 원문 토큰 수 (추정치)
+        max_workers: 동시에 번역할 최대 청크 수
+        collected_pages: 추출된 페이지 텍스트를 모을 리스트 (원문 전체가 필요할 때)
+        on_page: 페이지 하나가 추출될 때마다 (추출한 페이지 수)로 호출되는 콜백
+
+    Yields:
+        Tuple[str, str]: 원문 순서대로 (원문 청크, 번역된 청크)
+    """
+    if collected_pages is None:
+        collected_pages = []
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = _pages_in_background(pdf_file, collected_pages, on_page)
+        for chunk in iter_source_chunks(pages, max_tokens):
+            pending.append((chunk, executor.submit(metrics.bind(translate_chunk), chunk, session_id)))
+            # 앞쪽 청크 번역이 끝났으면 추출을 기다리지 않고 바로 내보냄
+            while pending and pending[0][1].done():
+                source, future = pending.popleft()
+                yield source, future.result()
+
+        while pending:
+            source, future = pending.popleft()
+            yield source, future.result()
+
+
+def translate_pdf(pdf_file, session_id: str = "default",
+                  on_page: Optional[Callable[[int], None]] = None) -> Dict:
+    """
+    PDF 파일을 파이프라인으로 추출·번역하는 함수
+
+    Args:
+        pdf_file: PDF 파일 객체 또는 바이트
+        session_id: 요청 스케줄러의 공정 대기열에 사용할 세션 식별자
+        on_page: 페이지 하나가 추출될 때마다 (추출한 페이지 수)로 호출되는 콜백
+
+    Returns:
+        Dict: original_text (추출된 원문), translated_text (번역문), page_count (페이지 수)
+    """
+    pages = []
+    translated_chunks = [
+        translated for _, translated in translate_pdf_pipeline(
+            pdf_file, session_id=session_id, collected_pages=pages, on_page=on_page
+        )
+    ]
+    return {
+        'original_text': "\n".join(pages).strip(),
+        'translated_text': "\n\n".join(translated_chunks),
+        'page_count': len(pages),
+    }
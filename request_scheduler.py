@@ -0,0 +1,221 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, TypeVar
+
+import metrics
+
+T = TypeVar('T')
+
+# 재시도할 HTTP 상태 코드 (요청 한도 초과, 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 재시도할 예외 클래스 이름 (google.api_core.exceptions)
+RETRYABLE_ERROR_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'InternalServerError',
+    'ServiceUnavailable', 'BadGateway', 'GatewayTimeout', 'DeadlineExceeded',
+}
+
+
+class SystemClock:
+    """실제 시간을 사용하는 시계"""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+
+class FakeClock:
+    """테스트용 가짜 시계 (sleep은 실제로 기다리지 않고 시간만 앞으로 이동)"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def advance(self, seconds: float):
+        with self._lock:
+            self.now += max(0.0, seconds)
+
+
+class TokenBucket:
+    """일정 속도로 채워지는 토큰 버킷"""
+
+    def __init__(self, capacity: float, refill_per_second: float, clock):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+        self.tokens = capacity
+        self.updated_at = clock.monotonic()
+
+    def _refill(self):
+        now = self.clock.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount 만큼 꺼내려면 기다려야 하는 시간 (초)"""
+        self._refill()
+        # 버킷 용량보다 큰 요청은 버킷이 가득 찼을 때 통과시킴
+        amount = min(amount, self.capacity)
+        # 부동소수점 오차로 아주 작은 대기 시간이 반복되지 않도록 여유를 둠
+        if self.tokens >= amount - 1e-6:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """실제 사용량이 추정치와 다를 때 차이만큼 보정 (음수면 추가 차감)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """요청 한도 초과(429)나 서버 오류(5xx)처럼 다시 시도할 만한 오류인지 확인"""
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES:
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    message = str(error).lower()
+    return '429' in message or 'resource has been exhausted' in message
+
+
+class RequestScheduler:
+    """
+    제미나이 API 호출 앞에 두는 프로세스 공용 스케줄러
+
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 토큰 버킷으로 제한하고, 429/5xx 오류는
+    지터를 섞은 지수 백오프로 재시도한다. 여러 세션이 동시에 요청하면 세션별 대기열을
+    번갈아 처리해서 한 세션이 할당량을 독차지하지 않도록 한다.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0, clock=None,
+                 rng: Optional[random.Random] = None):
+        self.clock = clock or SystemClock()
+        self.rng = rng or random.Random()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0, self.clock)
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, self.clock)
+
+        self._cond = threading.Condition()
+        # 세션별 대기열과 라운드 로빈 순서
+        self._queues: Dict[str, deque] = {}
+        self._order: deque = deque()
+
+        self.stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0, 'failures': 0}
+
+    def _reserve(self, tokens: int) -> float:
+        """요청 하나와 토큰을 예약 (기다려야 하면 대기 시간을 돌려주고 예약하지 않음)"""
+        wait = max(self.request_bucket.wait_time(1), self.token_bucket.wait_time(tokens))
+        if wait <= 0:
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(tokens)
+        return wait
+
+    def acquire(self, tokens: int, session_id: str = "default"):
+        """세션 순서가 돌아오고 할당량이 생길 때까지 대기"""
+        ticket = object()
+        with self._cond:
+            queue = self._queues.setdefault(session_id, deque())
+            if not queue:
+                self._order.append(session_id)
+            queue.append(ticket)
+
+            while True:
+                head_session = self._order[0]
+                if self._queues[head_session][0] is not ticket:
+                    self._cond.wait()
+                    continue
+
+                wait = self._reserve(tokens)
+                if wait <= 0:
+                    # 처리한 세션은 라운드 로빈 순서의 맨 뒤로 이동
+                    queue.popleft()
+                    self._order.popleft()
+                    if queue:
+                        self._order.append(session_id)
+                    else:
+                        del self._queues[session_id]
+                    self.stats['requests'] += 1
+                    self._cond.notify_all()
+                    return
+
+                self.stats['throttled_seconds'] += wait
+                self._cond.release()
+                try:
+                    with metrics.stage("rate_limit_wait"):
+                        self.clock.sleep(wait)
+                finally:
+                    self._cond.acquire()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """응답의 실제 토큰 사용량으로 토큰 버킷 보정"""
+        with self._cond:
+            self.token_bucket.refund(estimated_tokens - actual_tokens)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간 (지수 백오프 + 지터)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay / 2 + self.rng.uniform(0, delay / 2)
+
+    def execute(self, fn: Callable[[], T], estimated_tokens: int = 0, session_id: str = "default") -> T:
+        """
+        할당량 안에서 fn을 실행하고, 재시도 가능한 오류는 백오프 후 다시 시도
+
+        Args:
+            fn: 실제 API 호출 함수
+            estimated_tokens: 요청이 사용할 것으로 예상되는 토큰 수 (입력 + 출력)
+            session_id: 공정 대기열에 사용할 세션 식별자
+
+        Returns:
+            fn의 반환값
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(estimated_tokens, session_id)
+            metrics.count('api_calls')
+            try:
+                return fn()
+            except Exception as e:
+                if not is_retryable_error(e) or attempt == self.max_retries:
+                    with self._cond:
+                        self.stats['failures'] += 1
+                    raise
+                with self._cond:
+                    self.stats['retries'] += 1
+                metrics.count('retries')
+                with metrics.stage("retry_backoff"):
+                    self.clock.sleep(self.backoff_delay(attempt))
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """프로세스 전체에서 공유하는 스케줄러 (GEMINI_RPM, GEMINI_TPM 환경 변수로 설정)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                requests_per_minute=int(os.getenv("GEMINI_RPM", "1000")),
+                tokens_per_minute=int(os.getenv("GEMINI_TPM", "1000000")),
+                max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "5")),
+            )
+        return _scheduler
@@ -0,0 +1,130 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from database import TranslationDatabase
+
+# 데이터베이스 크기 한도 (MB, 사용 중인 페이지 기준, 0이면 제한 없음)
+RETENTION_MAX_DB_MB = float(os.getenv("TRANSLATION_DB_MAX_MB", "1024"))
+
+# 한도를 넘으면 한도의 이 비율까지 줄임 (한도 근처에서 정리가 매번 반복되지 않도록)
+RETENTION_TARGET_RATIO = 0.9
+
+# 크기를 확인하고 정리하는 간격 (초)
+RETENTION_INTERVAL_SECONDS = float(os.getenv("TRANSLATION_RETENTION_INTERVAL_SECONDS", "600"))
+
+# 빈 페이지를 한 번에 잘라낼 페이지 수와 단계 사이에 쉬는 시간 (초)
+VACUUM_STEP_PAGES = 256
+VACUUM_STEP_PAUSE_SECONDS = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionManager:
+    """
+    데이터베이스 크기를 한도 안으로 유지하는 백그라운드 정리 작업
+
+    사용 중인 크기가 한도를 넘으면 가장 오래 열지 않은 PDF부터 내용을 지우고 (원문/번역문은 유지),
+    삭제나 PDF 정리로 생긴 빈 페이지는 짧은 incremental vacuum 단계로 나누어 파일에서 잘라낸다.
+    단계마다 쓰기 잠금을 잠깐만 잡으므로 큰 정리 중에도 번역 저장과 조회가 오래 막히지 않는다.
+    """
+
+    def __init__(self, db: TranslationDatabase, max_bytes: Optional[int] = None,
+                 interval_seconds: float = RETENTION_INTERVAL_SECONDS):
+        self.db = db
+        self.max_bytes = int(RETENTION_MAX_DB_MB * 1024 * 1024) if max_bytes is None else max_bytes
+        self.interval_seconds = interval_seconds
+        self.last_result: Optional[Dict] = None
+        # 마지막 정리가 실패했을 때 오류 메시지 (성공하면 None으로 되돌림)
+        self.last_error: Optional[str] = None
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """정리 스레드 시작 (이미 시작했으면 무시)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="db-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """정리 스레드 종료 (진행 중인 vacuum 단계까지만 마침)"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """다음 확인 시간을 기다리지 않고 바로 정리 (번역 기록을 삭제한 뒤 호출)"""
+        self._wakeup.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.exception("데이터베이스 정리 중 오류 발생")
+            self._wakeup.wait(self.interval_seconds)
+            self._wakeup.clear()
+
+    def run_once(self) -> Dict:
+        """
+        한 번 정리 (한도 초과분만큼 PDF 정리 후 빈 페이지 잘라내기)
+
+        처음 실행할 때 기존 데이터베이스의 auto_vacuum 설정을 INCREMENTAL로 바꾼다 (VACUUM 한 번, 이후에는 확인만 함).
+        정리할 수 있는 것은 PDF뿐이므로, PDF 외의 데이터(원문/번역문, 번역 캐시와 메모리, 성능 지표)만으로
+        한도를 넘으면 PDF를 지워도 소용이 없어 아무것도 지우지 않고 over_budget으로 알린다.
+
+        Returns:
+            Dict: evicted_pdfs, evicted_bytes, vacuumed_bytes, used_bytes, file_bytes, pdf_bytes (정리 후),
+                over_budget (정리 후에도 한도를 넘는지)
+        """
+        # incremental이 아니면 incremental_vacuum이 빈 페이지를 줄이지 못하므로 먼저 설정
+        self.db.enable_incremental_vacuum()
+
+        usage = self.db.get_storage_usage()
+        evicted_pdfs = evicted_bytes = 0
+        target_bytes = int(self.max_bytes * RETENTION_TARGET_RATIO)
+        other_bytes = usage['used_bytes'] - usage['pdf_bytes']
+        if self.max_bytes > 0 and usage['used_bytes'] > self.max_bytes and other_bytes < self.max_bytes:
+            evicted_pdfs, evicted_bytes = self.db.evict_pdf_blobs(usage['used_bytes'] - max(target_bytes, other_bytes))
+
+        file_bytes = self.db.get_storage_usage()['file_bytes']
+        while not self._stop.is_set():
+            if self.db.incremental_vacuum(VACUUM_STEP_PAGES) == 0:
+                break
+            time.sleep(VACUUM_STEP_PAUSE_SECONDS)
+        self.db.checkpoint()
+
+        usage = self.db.get_storage_usage()
+        self.last_result = {
+            'evicted_pdfs': evicted_pdfs,
+            'evicted_bytes': evicted_bytes,
+            'vacuumed_bytes': max(0, file_bytes - usage['file_bytes']),
+            'used_bytes': usage['used_bytes'],
+            'file_bytes': usage['file_bytes'],
+            'pdf_bytes': usage['pdf_bytes'],
+            'over_budget': self.max_bytes > 0 and usage['used_bytes'] > self.max_bytes,
+        }
+        return self.last_result
+
+
+_retention_manager: Optional[RetentionManager] = None
+_retention_manager_lock = threading.Lock()
+
+
+def get_retention_manager(db: TranslationDatabase) -> RetentionManager:
+    """프로세스 전체에서 공유하는 정리 작업 (처음 호출할 때 스레드 시작)"""
+    global _retention_manager
+    with _retention_manager_lock:
+        if _retention_manager is None:
+            _retention_manager = RetentionManager(db)
+            _retention_manager.start()
+        return _retention_manager
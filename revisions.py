@@ -0,0 +1,204 @@
+import difflib
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database import TranslationDatabase
+from translation_cache import hash_text, normalize_text
+from translation_memory import estimate_similarity, minhash_signature, pack_signature, unpack_signature
+
+# 이전 버전으로 볼 원문 유사도 기준 (원문 앞부분의 MinHash 추정 자카드 유사도)
+REVISION_MIN_SIMILARITY = float(os.getenv("TRANSLATION_REVISION_SIMILARITY", "0.5"))
+
+# 유사도 계산에 사용할 원문 앞부분 길이 (문서 전체로 계산하면 긴 논문에서 느림)
+SIGNATURE_CHARS = 20000
+
+# 파일 이름/제목의 arXiv 번호 (버전 표시 제외, 예: "2301.01234v2" -> "2301.01234")
+_ARXIV_ID = re.compile(r'(?<![\d.])(\d{4}\.\d{4,5})(?:v\d+)?(?![\d])')
+
+
+def _paragraph_hash(paragraph: str) -> str:
+    return hash_text(normalize_text(paragraph))[:16]
+
+
+def _source_title(text: str) -> Optional[str]:
+    """원문 첫 줄 (논문 제목, 비교용으로 정규화)"""
+    for line in text.split('\n'):
+        if line.strip():
+            return normalize_text(line).lower()[:200]
+    return None
+
+
+def _arxiv_id(name: Optional[str]) -> Optional[str]:
+    match = _ARXIV_ID.search(name or "")
+    return match.group(1) if match else None
+
+
+def _signature_bytes(text: str) -> Optional[bytes]:
+    signature = minhash_signature(text[:SIGNATURE_CHARS])
+    return pack_signature(signature) if signature else None
+
+
+def find_prior_version(db: TranslationDatabase, original_text: str, name: Optional[str] = None) -> Optional[Dict]:
+    """
+    저장된 번역 기록 중 이 원문의 이전 버전으로 보이는 기록 찾기
+
+    원문 앞부분의 MinHash 유사도가 기준 이상인 기록 중 가장 비슷한 기록을 고른다.
+    원문 첫 줄(제목)이나 arXiv 번호가 같으면 기준의 절반 이상만 되어도 이전 버전으로 본다.
+    서명이 없는 예전 기록은 처음 찾을 때 한 번만 계산해서 저장한다.
+
+    Args:
+        db: 번역 기록 데이터베이스
+        original_text: 새로 올린 원문
+        name: 업로드한 파일 이름 (arXiv 번호 비교용)
+
+    Returns:
+        Optional[Dict]: id, title, similarity (없으면 None)
+    """
+    signature = minhash_signature(original_text[:SIGNATURE_CHARS])
+    if signature is None:
+        return None
+    source_title = _source_title(original_text)
+    arxiv_id = _arxiv_id(name)
+
+    best = None
+    for candidate in db.get_revision_candidates():
+        blob = candidate['text_signature']
+        if blob is None:
+            text = db.get_original_text(candidate['id']) or ""
+            blob = _signature_bytes(text)
+            candidate['source_title'] = _source_title(text)
+            db.set_revision_signature(candidate['id'], candidate['source_title'], blob)
+            if blob is None:
+                continue
+
+        similarity = estimate_similarity(signature, unpack_signature(blob))
+        same_title = (source_title and candidate['source_title'] == source_title) or \
+            (arxiv_id and _arxiv_id(candidate['title']) == arxiv_id)
+        threshold = REVISION_MIN_SIMILARITY / 2 if same_title else REVISION_MIN_SIMILARITY
+        if similarity >= threshold and (best is None or similarity > best['similarity']):
+            best = {'id': candidate['id'], 'title': candidate['title'], 'similarity': similarity}
+
+    return best
+
+
+def make_blocks(source_chunks: List[str], translated_chunks: List[str],
+                split_paragraphs: Optional[Callable[[str], List[str]]] = None) -> List[Tuple[List[str], str]]:
+    """
+    청크별 원문/번역문을 다음 개정판에서 재사용할 문단 묶음으로 나누는 함수
+
+    번역문의 빈 줄 기준 문단 수가 원문 문단 수와 같으면 문단 하나씩, 다르면 청크 전체를 한 묶음으로 저장한다.
+
+    Returns:
+        List[Tuple[List[str], str]]: 원문 순서대로 (문단 해시 목록, 번역문)
+    """
+    if split_paragraphs is None:
+        from translator import split_paragraphs
+
+    blocks = []
+    for paragraphs, translated in zip(map(split_paragraphs, source_chunks), translated_chunks):
+        if not paragraphs:
+            continue
+        pieces = [piece.strip() for piece in translated.split('\n\n') if piece.strip()]
+        if len(pieces) == len(paragraphs):
+            blocks.extend(([_paragraph_hash(paragraph)], piece) for paragraph, piece in zip(paragraphs, pieces))
+        else:
+            blocks.append(([_paragraph_hash(paragraph) for paragraph in paragraphs], translated))
+    return blocks
+
+
+def load_blocks(db: TranslationDatabase, translation_id: int,
+                split_text: Optional[Callable[[str], List[str]]] = None) -> List[Tuple[List[str], str]]:
+    """
+    이전 버전 번역 기록의 문단 묶음 불러오기
+
+    문단 묶음이 저장되기 전에 만든 기록은 문서 전체의 원문/번역문 문단 수를 비교해서 만든다
+    (문단 수가 다르면 문서 전체가 한 묶음이 되어 원문이 그대로일 때만 재사용된다).
+    """
+    blocks = db.get_translation_blocks(translation_id)
+    if blocks:
+        return blocks
+
+    record = db.get_translation_by_id(translation_id)
+    if not record or not record['original_text'] or not record['translated_text']:
+        return []
+
+    from translator import split_paragraphs, split_text_into_chunks
+    split_text = split_text or split_text_into_chunks
+    paragraphs = [paragraph for chunk in split_text(record['original_text']) for paragraph in split_paragraphs(chunk)]
+    return make_blocks(['\n\n'.join(paragraphs)], [record['translated_text']])
+
+
+def plan_revision(blocks: List[Tuple[List[str], str]], original_text: str,
+                  split_text: Optional[Callable[[str], List[str]]] = None,
+                  split_paragraphs: Optional[Callable[[str], List[str]]] = None
+                  ) -> Tuple[List[str], Dict[int, str], Dict]:
+    """
+    이전 버전의 문단 묶음과 새 원문을 맞춰 보고 바뀐 문단만 번역하도록 청크를 다시 구성하는 함수
+
+    새 원문의 문단을 이전 버전 문단과 순서대로 맞춰서(difflib), 묶음 안의 문단이 모두 그대로 남아 있는
+    묶음은 이전 번역문을 그대로 쓰고, 새로 들어가거나 바뀐 문단만 모아서 다시 청크로 나눈다.
+
+    Args:
+        blocks: 이전 버전 번역 기록의 문단 묶음 (TranslationDatabase.get_translation_blocks)
+        original_text: 새 원문
+        split_text: 원문 청크 분할 함수 (None이면 translator.split_text_into_chunks)
+        split_paragraphs: 문단 분할 함수 (None이면 translator.split_paragraphs)
+
+    Returns:
+        Tuple[List[str], Dict[int, str], Dict]: 청크 목록, 재사용한 청크 {청크 번호: 번역문},
+            문단 수 통계 (reused_paragraphs, translate_paragraphs)
+    """
+    if split_text is None or split_paragraphs is None:
+        from translator import split_paragraphs as default_split_paragraphs, split_text_into_chunks
+        split_text = split_text or split_text_into_chunks
+        split_paragraphs = split_paragraphs or default_split_paragraphs
+
+    # 청크 분할과 같은 기준으로 나눈 새 원문 문단 (긴 문단은 청크 분할처럼 잘린 조각 단위)
+    paragraphs = [paragraph for chunk in split_text(original_text) for paragraph in split_paragraphs(chunk)]
+    new_hashes = [_paragraph_hash(paragraph) for paragraph in paragraphs]
+    old_hashes = [paragraph_hash for hashes, _ in blocks for paragraph_hash in hashes]
+
+    # 이전 문단 번호 -> 같은 내용의 새 문단 번호
+    matched = {}
+    matcher = difflib.SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    for old_start, new_start, size in matcher.get_matching_blocks():
+        for offset in range(size):
+            matched[old_start + offset] = new_start + offset
+
+    # 새 문단 번호 -> (재사용할 묶음의 문단 수, 번역문)
+    reusable = {}
+    old_start = 0
+    for hashes, translated in blocks:
+        new_start = matched.get(old_start)
+        if new_start is not None and all(matched.get(old_start + offset) == new_start + offset
+                                         for offset in range(len(hashes))):
+            reusable[new_start] = (len(hashes), translated)
+        old_start += len(hashes)
+
+    chunks = []
+    completed = {}
+    pending = []
+    reused_paragraphs = 0
+
+    def flush_pending():
+        if pending:
+            chunks.extend(split_text('\n\n'.join(pending)))
+            pending.clear()
+
+    index = 0
+    while index < len(paragraphs):
+        if index in reusable:
+            size, translated = reusable[index]
+            flush_pending()
+            completed[len(chunks)] = translated
+            chunks.append('\n\n'.join(paragraphs[index:index + size]))
+            reused_paragraphs += size
+            index += size
+        else:
+            pending.append(paragraphs[index])
+            index += 1
+    flush_pending()
+
+    stats = {'reused_paragraphs': reused_paragraphs, 'translate_paragraphs': len(paragraphs) - reused_paragraphs}
+    return chunks, completed, stats
@@ -0,0 +1,64 @@
+import re
+from typing import List, Tuple
+
+# 섹션 하나로 보여줄 최대 글자 수 (제목 없이 긴 구간은 문단 경계에서 나눔)
+MAX_SECTION_CHARS = 20000
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+_FENCE = re.compile(r'^\s*(```|~~~)')
+
+# (제목 수준, 제목, 시작 위치, 끝 위치) - 수준 0은 제목 없는 구간
+Section = Tuple[int, str, int, int]
+
+
+def _split_long_section(text: str, section: Section) -> List[Section]:
+    """MAX_SECTION_CHARS보다 긴 섹션을 문단 경계에서 나눔 (나눈 조각은 '제목 (n)')"""
+    level, title, start, end = section
+    if end - start <= MAX_SECTION_CHARS:
+        return [section]
+
+    parts = []
+    part_start = start
+    while end - part_start > MAX_SECTION_CHARS:
+        cut = text.rfind('\n\n', part_start + 1, part_start + MAX_SECTION_CHARS)
+        cut = cut + 2 if cut > part_start else part_start + MAX_SECTION_CHARS
+        parts.append((part_start, cut))
+        part_start = cut
+    parts.append((part_start, end))
+
+    return [(level, title if index == 0 else f"{title} ({index + 1})", part_start, part_end)
+            for index, (part_start, part_end) in enumerate(parts)]
+
+
+def build_section_index(markdown: str) -> List[Section]:
+    """
+    마크다운 제목(#)을 기준으로 문서를 섹션으로 나눈 목차 만들기
+
+    코드 블록 안의 # 줄은 제목으로 보지 않는다. 첫 제목 앞의 내용은 '처음' 섹션이 된다.
+
+    Args:
+        markdown: 번역문 마크다운
+
+    Returns:
+        List[Section]: 문서 순서대로 (제목 수준, 제목, 시작 위치, 끝 위치) - markdown[시작:끝]이 섹션 내용
+    """
+    headings = []
+    in_fence = False
+    offset = 0
+    for line in markdown.splitlines(keepends=True):
+        if _FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = _HEADING.match(line.rstrip('\r\n'))
+            if match:
+                headings.append((len(match.group(1)), match.group(2), offset))
+        offset += len(line)
+
+    sections = []
+    if not headings or headings[0][2] > 0 and markdown[:headings[0][2]].strip():
+        sections.append((0, "처음", 0, headings[0][2] if headings else len(markdown)))
+    for index, (level, title, start) in enumerate(headings):
+        end = headings[index + 1][2] if index + 1 < len(headings) else len(markdown)
+        sections.append((level, title, start, end))
+
+    return [part for section in sections for part in _split_long_section(markdown, section)]
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# 패키지로 설치하지 않고 저장소 루트의 모듈을 바로 불러옴
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트가 작업 디렉터리의 translations.db를 건드리지 않도록 캐시/번역 메모리는 끄고
+# 성능 지표는 임시 데이터베이스에 저장
+os.environ.setdefault("TRANSLATION_CACHE_ENABLED", "0")
+os.environ.setdefault("TRANSLATION_MEMORY_ENABLED", "0")
+os.environ.setdefault("TRANSLATION_METRICS_DB", os.path.join(tempfile.mkdtemp(prefix="translator-tests-"), "metrics.db"))
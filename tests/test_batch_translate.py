@@ -0,0 +1,133 @@
+import pytest
+
+from batch_translate import collect_pdf_paths, run_batch, summarize
+from benchmarks.synthetic_pdf import make_pdf
+from database import TranslationDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TranslationDatabase(str(tmp_path / "translations.db"))
+
+
+def write_pdf(path, seed):
+    path.write_bytes(make_pdf(pages=1, lines_per_page=5, seed=seed))
+    return path
+
+
+def stub_translate(text, session_id):
+    return f"[ko] {text}"
+
+
+def by_name(batch):
+    return {result['path'].rsplit('/', 1)[-1]: result for result in batch['results']}
+
+
+def test_run_batch_translates_and_skips_stored_pdfs(tmp_path, db):
+    first = write_pdf(tmp_path / "a.pdf", seed=1)
+    second = write_pdf(tmp_path / "b.pdf", seed=2)
+
+    batch = run_batch([first, second], db, workers=2, translate_fn=stub_translate)
+    assert sorted(result['status'] for result in batch['results']) == ['done', 'done']
+    saved = db.get_translation_by_id(by_name(batch)['a.pdf']['translation_id'])
+    assert saved['title'] == "a"
+    assert saved['translated_text'].startswith("[ko] ")
+
+    # 같은 내용의 PDF는 이름이 달라도 다시 번역하지 않음
+    copy = tmp_path / "a-copy.pdf"
+    copy.write_bytes(first.read_bytes())
+    calls = []
+    again = run_batch([first, copy], db, workers=2,
+                      translate_fn=lambda text, session: calls.append(session) or text)
+    assert calls == []
+    assert {result['status'] for result in again['results']} == {'skipped'}
+    assert {result['translation_id'] for result in again['results']} == {by_name(batch)['a.pdf']['translation_id']}
+
+
+def test_run_batch_skips_duplicate_content_within_one_run(tmp_path, db):
+    first = write_pdf(tmp_path / "a.pdf", seed=1)
+    copy = tmp_path / "b.pdf"
+    copy.write_bytes(first.read_bytes())
+
+    batch = run_batch([first, copy], db, workers=2, translate_fn=stub_translate)
+    assert sorted(result['status'] for result in batch['results']) == ['done', 'skipped']
+
+
+def test_run_batch_reports_failures(tmp_path, db):
+    good = write_pdf(tmp_path / "good.pdf", seed=1)
+    bad = write_pdf(tmp_path / "bad.pdf", seed=2)
+    bad_text = None
+
+    def translate(text, session_id):
+        if bad_text is not None and text == bad_text:
+            raise RuntimeError("quota exceeded")
+        return text
+
+    from pdf_processor import extract_text_from_pdf
+    with open(bad, 'rb') as f:
+        bad_text = extract_text_from_pdf(f)
+
+    batch = run_batch([good, bad], db, workers=2, translate_fn=translate)
+    results = by_name(batch)
+    assert results['good.pdf']['status'] == 'done'
+    assert results['bad.pdf']['status'] == 'failed'
+    assert "quota exceeded" in results['bad.pdf']['error']
+    assert results['bad.pdf']['translation_id'] is None
+
+    summary = summarize(batch)
+    assert summary['done'] == 1
+    assert [failure['path'] for failure in summary['failed']] == [str(bad)]
+
+
+def test_failed_pdf_does_not_block_duplicate_in_same_run(tmp_path, db):
+    first = write_pdf(tmp_path / "a.pdf", seed=1)
+    copy = tmp_path / "b.pdf"
+    copy.write_bytes(first.read_bytes())
+    attempts = []
+
+    def flaky(text, session_id):
+        attempts.append(session_id)
+        if len(attempts) == 1:
+            raise RuntimeError("temporary error")
+        return text
+
+    batch = run_batch([first, copy], db, workers=1, translate_fn=flaky)
+    assert [result['status'] for result in batch['results']] == ['failed', 'done']
+    assert len(attempts) == 2
+
+
+def test_summarize_percentiles():
+    results = [{'path': f"{i}.pdf", 'status': 'done', 'seconds': float(i)} for i in range(1, 11)]
+    results.append({'path': "dup.pdf", 'status': 'skipped', 'seconds': 0.0})
+    results.append({'path': "bad.pdf", 'status': 'failed', 'seconds': 99.0, 'error': "boom"})
+
+    summary = summarize({'results': results, 'elapsed_seconds': 30.0})
+    assert summary['total'] == 12
+    assert summary['done'] == 10
+    assert summary['skipped'] == 1
+    assert [failure['path'] for failure in summary['failed']] == ["bad.pdf"]
+    # 실패한 파일의 소요 시간은 지연 시간 백분위수에 넣지 않음
+    assert summary['p50_seconds'] == 5.0
+    assert summary['p90_seconds'] == 9.0
+    assert summary['p99_seconds'] == 10.0
+    assert summary['max_seconds'] == 10.0
+    assert summary['files_per_minute'] == pytest.approx(20.0)
+
+
+def test_summarize_empty_batch():
+    summary = summarize({'results': [], 'elapsed_seconds': 0.0})
+    assert summary['files_per_minute'] == 0.0
+    assert summary['p50_seconds'] == 0.0
+    assert summary['max_seconds'] == 0.0
+
+
+def test_collect_pdf_paths_reads_directories_and_manifests(tmp_path):
+    papers = tmp_path / "papers"
+    (papers / "sub").mkdir(parents=True)
+    for name in ("b.pdf", "a.PDF", "sub/c.pdf", "notes.txt"):
+        (papers / name).write_bytes(b"")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# 목록\npapers/b.pdf\n\npapers/sub/c.pdf\n", encoding="utf-8")
+
+    paths = collect_pdf_paths([str(papers), str(manifest)])
+    assert paths == [papers / "a.PDF", papers / "b.pdf", papers / "sub" / "c.pdf"]
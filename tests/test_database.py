@@ -0,0 +1,193 @@
+import hashlib
+import io
+import struct
+from datetime import datetime
+
+import pytest
+
+from database import TEXT_COMPRESS_MIN_BYTES, TranslationDatabase, compress_text, decompress_text
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TranslationDatabase(str(tmp_path / "translations.db"))
+
+
+def search_ids(db, query):
+    return [hit['id'] for hit in db.search_translations(query)]
+
+
+def test_search_matches_short_and_long_korean_terms(db):
+    filler = " 실험 결과는 부록에 정리했다." * 40
+    translation_id = db.save_translation("Attention", "We train a new model.",
+                                         "새 번역 모델을 학습했다. 트랜스포머 구조를 사용한다." + filler)
+    other_id = db.save_translation("Vision", "Images.", "이미지 분류 실험을 다룬다." + filler)
+
+    # 두 글자 단어 (trigram 토큰보다 짧음)
+    assert search_ids(db, "번역") == [translation_id]
+    assert search_ids(db, "새 번역") == [translation_id]
+    assert set(search_ids(db, "실험")) == {translation_id, other_id}
+    # 세 글자 이상 단어와 짧은 단어를 함께 쓰면 모두 포함한 기록만
+    assert search_ids(db, "트랜스포머 모델") == [translation_id]
+    assert search_ids(db, "트랜스포머 분류") == []
+    assert search_ids(db, "학습했다") == [translation_id]
+
+
+def test_short_term_search_snippet_highlights_term(db):
+    db.save_translation("Paper", "Original.", "앞부분 " * 30 + "번역 품질을 평가했다." + " 뒷부분" * 30)
+
+    [hit] = db.search_translations("번역")
+
+    assert "**번역**" in hit['snippet']
+    assert hit['snippet'].startswith("…") and hit['snippet'].endswith("…")
+
+
+def test_short_term_search_escapes_like_wildcards(db):
+    db.save_translation("Paper", "Accuracy 100%", "정확도 100%")
+    db.save_translation("Other", "Nothing", "정확도 1000")
+
+    assert len(db.search_translations("0%")) == 1
+    assert db.search_translations("   ") == []
+
+
+LONG_TEXT = "트랜스포머 모델의 번역 품질을 평가했다. " * 60
+
+
+def test_compress_text_header_and_round_trip():
+    for codec, marker in [("zlib", b"z"), ("lzma", b"x")]:
+        stored = compress_text(LONG_TEXT, codec)
+
+        assert isinstance(stored, bytes)
+        assert stored[:1] == marker
+        assert struct.unpack_from('<cI', stored)[1] == len(LONG_TEXT.encode('utf-8'))
+        assert decompress_text(stored) == LONG_TEXT
+
+
+def test_short_and_uncompressed_values_stay_text():
+    short = "가" * ((TEXT_COMPRESS_MIN_BYTES // 3) - 1)
+
+    assert len(short.encode('utf-8')) < TEXT_COMPRESS_MIN_BYTES
+    assert compress_text(short, "zlib") == short
+    assert compress_text(LONG_TEXT, "none") == LONG_TEXT
+    assert compress_text(None, "zlib") is None
+    assert decompress_text(LONG_TEXT) == LONG_TEXT
+
+
+def insert_legacy_rows(db, count):
+    with db.pool.transaction() as conn:
+        for i in range(count):
+            conn.execute('''
+                INSERT INTO translations (title, original_text, translated_text, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (f"legacy {i}", f"original {i} " + LONG_TEXT, f"번역 {i} " + LONG_TEXT,
+                  datetime.now(), datetime.now()))
+
+
+def column_types(db):
+    with db.pool.connection() as conn:
+        return {row for row in conn.execute('SELECT typeof(original_text), typeof(translated_text) FROM translations')}
+
+
+def test_compress_existing_texts_keeps_rows_readable_and_searchable(db):
+    insert_legacy_rows(db, 5)
+    assert column_types(db) == {('text', 'text')}
+
+    assert db.compress_existing_texts(batch_size=2, pause_seconds=0) == 5
+
+    assert column_types(db) == {('blob', 'blob')}
+    record = db.get_translation_by_id(search_ids(db, "legacy 3")[0])
+    assert record['translated_text'] == "번역 3 " + LONG_TEXT
+    assert len(search_ids(db, "트랜스포머 번역")) == 5
+    [report] = [row for row in db.get_storage_report() if row['table'] == 'translations']
+    assert report['compressed_values'] == 10
+    assert report['saved_bytes'] > 0
+
+
+def test_background_text_migration(db):
+    insert_legacy_rows(db, 3)
+
+    db.start_text_migration()
+    db._migration_thread.join(timeout=10)
+
+    assert db.migration_error is None
+    assert column_types(db) == {('blob', 'blob')}
+
+
+def test_legacy_search_index_is_rebuilt_over_decompressed_view(tmp_path):
+    path = str(tmp_path / "legacy_fts.db")
+    db = TranslationDatabase(path)
+    translation_id = db.save_translation("Compressed", "original " + LONG_TEXT, "압축된 " + LONG_TEXT)
+    with db.pool.transaction() as conn:
+        for trigger in ('translations_fts_insert', 'translations_fts_delete', 'translations_fts_update'):
+            conn.execute(f'DROP TRIGGER {trigger}')
+        conn.execute('DROP TABLE translations_fts')
+        # 압축 전 방식처럼 translations 테이블을 직접 내용 테이블로 쓰는 인덱스
+        conn.execute('''
+            CREATE VIRTUAL TABLE translations_fts USING fts5(
+                title, original_text, translated_text, content='translations', content_rowid='id'
+            )
+        ''')
+
+    db = TranslationDatabase(path)
+
+    assert search_ids(db, "압축된") == [translation_id]
+
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 4096
+
+
+def pdf_blob_rows(db):
+    with db.pool.connection() as conn:
+        return conn.execute('SELECT sha256, ref_count, evicted_at IS NOT NULL FROM pdf_blobs').fetchall()
+
+
+def test_same_pdf_is_stored_once_and_released_on_delete(db):
+    first_id = db.save_translation("first", "original", "translated", PDF_BYTES)
+    second_id = db.save_translation("second", "original", "translated", io.BytesIO(PDF_BYTES))
+
+    [(sha256, ref_count, evicted)] = pdf_blob_rows(db)
+    assert ref_count == 2 and not evicted
+    assert db.get_translation_by_id(second_id)['pdf_data'] == PDF_BYTES
+    assert b"".join(db.iter_pdf_chunks(sha256, chunk_size=1000)) == PDF_BYTES
+
+    assert db.delete_translation(first_id)
+    assert pdf_blob_rows(db) == [(sha256, 1, 0)]
+    assert db.read_pdf(sha256) == PDF_BYTES
+
+    assert db.delete_translation(second_id)
+    assert pdf_blob_rows(db) == []
+    assert db.read_pdf(sha256) is None
+
+
+def test_reupload_after_eviction_restores_pdf(db):
+    first_id = db.save_translation("first", "original", "translated", PDF_BYTES)
+
+    assert db.evict_pdf_blobs(1) == (1, len(PDF_BYTES))
+    record = db.get_translation_by_id(first_id)
+    assert record['pdf_data'] is None and record['pdf_evicted'] is True
+
+    db.save_translation("again", "original", "translated", PDF_BYTES)
+
+    [(_, ref_count, evicted)] = pdf_blob_rows(db)
+    assert ref_count == 2 and not evicted
+    assert db.get_translation_by_id(first_id)['pdf_data'] == PDF_BYTES
+
+
+def test_inline_pdf_rows_are_moved_to_blob_store(tmp_path):
+    path = str(tmp_path / "inline.db")
+    db = TranslationDatabase(path)
+    with db.pool.transaction() as conn:
+        for title in ("legacy a", "legacy b"):
+            conn.execute('''
+                INSERT INTO translations (title, original_text, translated_text, pdf_data, created_at, updated_at)
+                VALUES (?, 'original', 'translated', ?, ?, ?)
+            ''', (title, PDF_BYTES, datetime.now(), datetime.now()))
+
+    db = TranslationDatabase(path)
+
+    with db.pool.connection() as conn:
+        rows = conn.execute('SELECT id, pdf_data, pdf_sha256 FROM translations ORDER BY id').fetchall()
+    assert [pdf_data for _, pdf_data, _ in rows] == [None, None]
+    assert rows[0][2] == rows[1][2] == hashlib.sha256(PDF_BYTES).hexdigest()
+    assert pdf_blob_rows(db) == [(rows[0][2], 2, 0)]
+    assert db.get_translation_by_id(rows[1][0])['pdf_data'] == PDF_BYTES
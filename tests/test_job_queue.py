@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import TranslationDatabase
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TranslationDatabase(str(tmp_path / "translations.db"))
+
+
+def split_paragraphs(text):
+    return [part for part in text.split("\n\n") if part]
+
+
+def stub_translate_chunks(chunks, completed=None, on_chunk_done=None, session_id="default", **kwargs):
+    completed = completed or {}
+    for i, chunk in enumerate(chunks):
+        translated = completed.get(i)
+        if translated is None:
+            translated = f"{chunk} (ko)"
+            on_chunk_done(i, translated)
+        if i > 0:
+            yield "\n\n"
+        yield translated
+
+
+def make_queue(db, translate_chunks=stub_translate_chunks):
+    return JobQueue(db, workers=1, translate_chunks=translate_chunks, split_text=split_paragraphs)
+
+
+def test_run_job_saves_translation_and_completes_job(db):
+    queue = make_queue(db)
+    job_id = queue.submit("paper", "# Title\n\nfirst paragraph\n\nsecond paragraph", pdf_file=b"%PDF-1.4 test")
+    assert db.claim_next_job(1, queue.worker_id, queue.lease_seconds) == job_id
+
+    translation_id = queue.run_job(job_id)
+
+    record = db.get_translation_by_id(translation_id)
+    assert record['title'] == "Title (ko)"
+    assert record['original_text'] == "# Title\n\nfirst paragraph\n\nsecond paragraph"
+    assert record['translated_text'] == "# Title (ko)\n\nfirst paragraph (ko)\n\nsecond paragraph (ko)"
+    assert record['pdf_data'] == b"%PDF-1.4 test"
+    assert db.get_section_index(translation_id)
+    assert db.get_translation_blocks(translation_id)
+
+    job = db.get_job_status(job_id)
+    assert job['status'] == 'completed'
+    assert job['translation_id'] == translation_id
+    # 작업의 PDF 참조가 번역 기록으로 옮겨져 PDF는 한 번만 저장됨
+    with db.pool.connection() as conn:
+        assert conn.execute('SELECT ref_count FROM pdf_blobs').fetchall() == [(1,)]
+
+
+def test_complete_job_saves_nothing_when_job_is_no_longer_running(db):
+    queue = make_queue(db)
+    job_id = queue.submit("paper", "first paragraph\n\nsecond paragraph")
+    assert db.claim_next_job(1, queue.worker_id, queue.lease_seconds) == job_id
+    # 번역하는 동안 다른 곳에서 작업을 대기열로 돌려보낸 경우
+    db.update_job_status(job_id, 'queued')
+
+    assert queue.run_job(job_id) is None
+    assert db.get_translation_summaries() == []
+    assert db.get_job_status(job_id)['status'] == 'queued'
+
+
+def expire_lease(db, job_id):
+    with db.pool.transaction() as conn:
+        conn.execute('UPDATE translation_jobs SET heartbeat_at = ? WHERE id = ?',
+                     (datetime.now() - timedelta(hours=1), job_id))
+
+
+def test_live_lease_is_not_taken_over_by_another_worker(db):
+    first, second = make_queue(db), make_queue(db)
+    job_id = first.submit("paper", "first paragraph")
+    assert db.claim_next_job(1, first.worker_id, first.lease_seconds) == job_id
+
+    assert db.requeue_expired_jobs(second.lease_seconds) == 0
+    assert db.claim_next_job(1, second.worker_id, second.lease_seconds) is None
+    assert db.renew_job_leases(first.worker_id) == 1
+    assert db.renew_job_leases(second.worker_id) == 0
+
+
+def test_expired_lease_is_taken_over_and_old_worker_cannot_complete(db):
+    first, second = make_queue(db), make_queue(db)
+    job_id = first.submit("paper", "first paragraph\n\nsecond paragraph")
+    assert db.claim_next_job(1, first.worker_id, first.lease_seconds) == job_id
+    expire_lease(db, job_id)
+
+    assert db.claim_next_job(1, second.worker_id, second.lease_seconds) == job_id
+    # 생존 신호가 끊겼던 워커는 결과를 저장하거나 상태를 바꾸지 못함
+    assert first.run_job(job_id) is None
+    assert db.get_translation_summaries() == []
+    assert db.get_job_status(job_id)['status'] == 'running'
+
+    translation_id = second.run_job(job_id)
+    assert translation_id is not None
+    assert db.get_job_status(job_id)['translation_id'] == translation_id
+
+
+def test_partial_chunk_text_is_visible_while_translating(db):
+    previews = []
+
+    def streaming_translate_chunks(chunks, completed=None, on_chunk_done=None, session_id="default",
+                                   on_chunk_partial=None):
+        for i, chunk in enumerate(chunks):
+            on_chunk_partial(i, f"{chunk[:5]}...")
+            previews.append(db.get_job_preview_texts(job_id))
+            on_chunk_done(i, f"{chunk} (ko)")
+            # 끝난 청크에 늦게 도착한 조각은 무시
+            late_saves.append(db.save_job_chunk_partial(job_id, i, "late"))
+            if i > 0:
+                yield "\n\n"
+            yield f"{chunk} (ko)"
+
+    late_saves = []
+    queue = make_queue(db, streaming_translate_chunks)
+    job_id = queue.submit("paper", "first paragraph\n\nsecond paragraph")
+    assert db.claim_next_job(1, queue.worker_id, queue.lease_seconds) == job_id
+    assert queue.run_job(job_id) is not None
+
+    assert previews == [["first..."], ["first paragraph (ko)", "secon..."]]
+    assert late_saves == [False, False]
@@ -0,0 +1,76 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import metrics
+from request_scheduler import RequestScheduler
+
+
+def test_union_seconds_counts_overlap_once():
+    assert metrics._union_seconds([]) == 0.0
+    assert metrics._union_seconds([(0, 2), (1, 3), (5, 6), (5.5, 5.7)]) == pytest.approx(4.0)
+
+
+def test_parallel_stages_report_wall_time_separately_from_summed_time():
+    barrier = threading.Barrier(3)
+
+    def work():
+        barrier.wait()
+        with metrics.stage("gemini"):
+            time.sleep(0.05)
+
+    with metrics.track_run("translation", label="parallel") as run:
+        threads = [threading.Thread(target=metrics.bind(work)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert run.stage_seconds['gemini'] >= 0.15
+    assert run.stage_wall_seconds['gemini'] < run.stage_seconds['gemini']
+    assert run.stage_wall_seconds['gemini'] <= run.total_seconds
+
+    store = metrics.get_metrics_store()
+    since = datetime.now() - timedelta(minutes=1)
+    summed = store.get_latencies(since, kind="translation")['gemini']
+    wall = store.get_latencies(since, kind="translation", wall=True)['gemini']
+    assert run.stage_seconds['gemini'] == pytest.approx(max(summed))
+    assert run.stage_wall_seconds['gemini'] in [pytest.approx(value) for value in wall]
+    assert "translator_stage_wall_seconds_sum{stage=\"gemini\"}" in store.render_prometheus()
+
+
+def test_rate_limit_wait_is_not_counted_as_gemini_time():
+    scheduler = RequestScheduler(requests_per_minute=600, tokens_per_minute=10_000_000)
+    for _ in range(600):
+        scheduler.acquire(0)
+
+    def call():
+        with metrics.stage("gemini"):
+            time.sleep(0.01)
+        return "ok"
+
+    with metrics.track_run("translation", label="throttled") as run:
+        assert scheduler.execute(call) == "ok"
+
+    # 요청 한도가 차서 약 0.1초(분당 600회) 기다린 시간은 제미나이 호출 시간에 들어가지 않음
+    assert run.stage_seconds['rate_limit_wait'] >= 0.05
+    assert run.stage_seconds['gemini'] < 0.05
+
+
+def test_prometheus_run_duration_is_split_by_kind(tmp_path):
+    store = metrics.MetricsStore(str(tmp_path / "kinds.db"))
+    for kind, seconds in [("extraction", 0.2), ("extraction", 0.4), ("translation", 120.0)]:
+        run = metrics.MetricsRun(kind)
+        run.finish('ok')
+        run.total_seconds = seconds
+        store.record(run)
+
+    text = store.render_prometheus()
+
+    assert 'translator_run_duration_seconds{kind="extraction",quantile="0.95"} 0.4' in text
+    assert 'translator_run_duration_seconds{kind="translation",quantile="0.5"} 120.0' in text
+    assert 'translator_run_duration_seconds_count{kind="extraction"} 2' in text
+    assert 'translator_run_duration_seconds_sum{kind="translation"} 120.000000' in text
+    assert 'translator_run_duration_seconds{quantile=' not in text
@@ -0,0 +1,44 @@
+import re
+
+import pytest
+
+import pdf_processor
+from benchmarks.synthetic_pdf import make_pdf
+
+
+def break_page(pdf_bytes, page_num):
+    """page_num 페이지의 내용 스트림에 지원하지 않는 필터를 붙여 그 페이지만 추출에 실패하도록 함"""
+    header = f"{4 + 2 * page_num} 0 obj\n".encode()
+    start = pdf_bytes.index(header) + len(header)
+    match = re.match(rb"<< /Length \d+ >>", pdf_bytes[start:])
+    return pdf_bytes[:start] + match.group(0).replace(b" >>", b" /Filter /Foo >>") + pdf_bytes[start + match.end():]
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    return make_pdf(pages=12, lines_per_page=5, seed=3)
+
+
+def test_process_pool_keeps_page_order(pdf_bytes):
+    sequential, sequential_failed = pdf_processor.extract_pages(pdf_bytes, parallel=False)
+    progress = []
+
+    pages, failed = pdf_processor.extract_pages(pdf_bytes, parallel=True, max_workers=2,
+                                                on_progress=lambda done, total: progress.append((done, total)))
+
+    assert pages == sequential
+    assert failed == sequential_failed == []
+    assert [page.split("\n", 1)[0] for page in pages[::5]] == ["1 Introduction", "2 Related Work", "3 Method"]
+    assert progress[-1] == (12, 12)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_single_page_failure_does_not_stop_extraction(pdf_bytes, parallel):
+    expected, _ = pdf_processor.extract_pages(pdf_bytes, parallel=False)
+
+    pages, failed = pdf_processor.extract_pages(break_page(pdf_bytes, 3), parallel=parallel, max_workers=2)
+
+    assert failed == [3]
+    assert pages[3] == ""
+    assert pages[:3] + pages[4:] == expected[:3] + expected[4:]
@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+
+import pytest
+
+from request_scheduler import FakeClock, RequestScheduler, TokenBucket, is_retryable_error
+
+
+class RateLimitError(Exception):
+    code = 429
+
+
+class GatedClock(FakeClock):
+    """sleep이 gate가 열릴 때까지 멈추는 가짜 시계 (대기열을 원하는 순서로 채우기 위함)"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def sleep(self, seconds: float):
+        self.gate.wait(5)
+        super().sleep(seconds)
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=10, refill_per_second=1, clock=clock)
+
+    bucket.consume(10)
+    assert bucket.wait_time(5) == pytest.approx(5)
+
+    clock.advance(3)
+    assert bucket.wait_time(5) == pytest.approx(2)
+
+    clock.advance(2)
+    assert bucket.wait_time(5) == 0
+
+    # 오래 쉬어도 용량 이상으로는 채워지지 않음
+    clock.advance(100)
+    bucket.consume(10)
+    assert bucket.wait_time(1) == pytest.approx(1)
+
+
+def test_token_bucket_allows_request_larger_than_capacity_when_full():
+    bucket = TokenBucket(capacity=10, refill_per_second=1, clock=FakeClock())
+    assert bucket.wait_time(50) == 0
+
+
+def test_acquire_sleeps_until_request_budget_refills():
+    clock = FakeClock()
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=1_000_000, clock=clock)
+
+    for _ in range(60):
+        scheduler.acquire(0)
+    assert clock.monotonic() == 0
+
+    scheduler.acquire(0)
+    assert clock.monotonic() == pytest.approx(1)
+    assert scheduler.stats['requests'] == 61
+    assert scheduler.stats['throttled_seconds'] == pytest.approx(1)
+
+
+def test_acquire_round_robins_between_sessions():
+    clock = GatedClock()
+    served = []
+
+    class RecordingScheduler(RequestScheduler):
+        def _reserve(self, tokens):
+            wait = super()._reserve(tokens)
+            if wait <= 0:
+                served.append(threading.current_thread().name)
+            return wait
+
+    scheduler = RecordingScheduler(requests_per_minute=1, tokens_per_minute=1_000_000, clock=clock)
+    scheduler.acquire(0, "warmup")
+    served.clear()
+
+    # 세션 a가 요청 3개를 먼저 쌓고 세션 b가 2개를 뒤에 쌓음
+    threads = []
+    for name, session in [("a1", "a"), ("a2", "a"), ("a3", "a"), ("b1", "b"), ("b2", "b")]:
+        thread = threading.Thread(target=scheduler.acquire, args=(0, session), name=name)
+        thread.start()
+        threads.append(thread)
+        deadline = time.monotonic() + 5
+        while sum(len(queue) for queue in scheduler._queues.values()) < len(threads):
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+
+    clock.gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert served == ["a1", "b1", "a2", "b2", "a3"]
+
+
+def test_execute_retries_retryable_errors_with_backoff():
+    clock = FakeClock()
+    scheduler = RequestScheduler(requests_per_minute=1000, tokens_per_minute=1_000_000, base_delay=1.0,
+                                 clock=clock, rng=random.Random(7))
+    expected = RequestScheduler(requests_per_minute=1, tokens_per_minute=1, base_delay=1.0,
+                                clock=FakeClock(), rng=random.Random(7))
+    expected_delays = [expected.backoff_delay(0), expected.backoff_delay(1)]
+
+    calls = []
+
+    def flaky():
+        calls.append(clock.monotonic())
+        if len(calls) <= 2:
+            raise RateLimitError("429 Resource has been exhausted")
+        return "ok"
+
+    assert scheduler.execute(flaky, estimated_tokens=10) == "ok"
+    assert scheduler.stats['retries'] == 2
+    assert scheduler.stats['failures'] == 0
+    assert scheduler.stats['requests'] == 3
+    assert calls == pytest.approx([0, expected_delays[0], sum(expected_delays)])
+    # 지터를 섞어도 지수 백오프 범위 안에 있음
+    assert 0.5 <= expected_delays[0] <= 1.0
+    assert 1.0 <= expected_delays[1] <= 2.0
+
+
+def test_execute_raises_non_retryable_error_immediately():
+    clock = FakeClock()
+    scheduler = RequestScheduler(requests_per_minute=1000, tokens_per_minute=1_000_000, clock=clock)
+
+    def broken():
+        raise ValueError("invalid prompt")
+
+    with pytest.raises(ValueError):
+        scheduler.execute(broken)
+    assert scheduler.stats == {'requests': 1, 'retries': 0, 'throttled_seconds': 0.0, 'failures': 1}
+    assert clock.monotonic() == 0
+
+
+def test_execute_gives_up_after_max_retries():
+    clock = FakeClock()
+    scheduler = RequestScheduler(requests_per_minute=1000, tokens_per_minute=1_000_000, max_retries=2,
+                                 clock=clock, rng=random.Random(0))
+
+    def always_limited():
+        raise RateLimitError("quota")
+
+    with pytest.raises(RateLimitError):
+        scheduler.execute(always_limited)
+    assert scheduler.stats['requests'] == 3
+    assert scheduler.stats['retries'] == 2
+    assert scheduler.stats['failures'] == 1
+
+
+def test_is_retryable_error():
+    assert is_retryable_error(RateLimitError())
+    assert is_retryable_error(Exception("HTTP 429 Too Many Requests"))
+    assert not is_retryable_error(ValueError("bad request"))
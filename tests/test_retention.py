@@ -0,0 +1,67 @@
+import os
+import sqlite3
+
+from database import TranslationDatabase
+from retention import RetentionManager
+
+
+def auto_vacuum_mode(db):
+    with db.pool.connection() as conn:
+        return conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+
+
+def test_new_database_uses_incremental_vacuum(tmp_path):
+    db = TranslationDatabase(str(tmp_path / "new.db"))
+
+    assert auto_vacuum_mode(db) == 2
+    assert db.enable_incremental_vacuum() is False
+
+
+def test_existing_database_is_vacuumed_by_retention_not_constructor(tmp_path):
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE legacy (id INTEGER PRIMARY KEY)')
+
+    db = TranslationDatabase(str(path))
+    assert auto_vacuum_mode(db) == 0
+
+    result = RetentionManager(db, max_bytes=0).run_once()
+
+    assert auto_vacuum_mode(db) == 2
+    assert result['evicted_pdfs'] == 0
+
+
+def add_text_rows(db, rows, size):
+    # 압축해도 줄지 않는 텍스트로 번역 기록 크기를 키움
+    for i in range(rows):
+        db.save_translation(f"paper {i}", os.urandom(size).hex(), os.urandom(size).hex())
+
+
+def test_text_tables_over_budget_do_not_evict_pdfs(tmp_path):
+    db = TranslationDatabase(str(tmp_path / "text.db"))
+    pdf_id = db.save_translation("with pdf", "original", "translated", os.urandom(64 * 1024))
+    add_text_rows(db, 20, 32 * 1024)
+    usage = db.get_storage_usage()
+
+    # PDF를 모두 지워도 넘는 한도
+    retention = RetentionManager(db, max_bytes=(usage['used_bytes'] - usage['pdf_bytes']) // 2)
+    result = retention.run_once()
+
+    assert result['evicted_pdfs'] == 0
+    assert result['over_budget'] is True
+    assert db.get_translation_by_id(pdf_id)['pdf_data'] is not None
+
+
+def test_pdfs_over_budget_evict_oldest_first(tmp_path):
+    db = TranslationDatabase(str(tmp_path / "pdf.db"))
+    old_id = db.save_translation("old", "original", "translated", os.urandom(256 * 1024))
+    new_id = db.save_translation("new", "original", "translated", os.urandom(256 * 1024))
+    db.get_translation_by_id(new_id)
+    usage = db.get_storage_usage()
+
+    result = RetentionManager(db, max_bytes=usage['used_bytes'] - 128 * 1024).run_once()
+
+    assert result['evicted_pdfs'] == 1
+    assert result['over_budget'] is False
+    assert db.get_translation_by_id(old_id)['pdf_evicted'] is True
+    assert db.get_translation_by_id(new_id)['pdf_data'] is not None
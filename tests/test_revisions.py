@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from database import TranslationDatabase
+from revisions import find_prior_version, make_blocks, plan_revision
+from translator import split_paragraphs, split_text_into_chunks
+
+WORDS = ("model training data attention layer encoder decoder result table figure method "
+         "baseline accuracy loss gradient token sequence network parameter experiment").split()
+
+
+def paragraph(seed):
+    rng = random.Random(seed)
+    return " ".join(f"{rng.choice(WORDS)}{rng.randint(0, 99)}" for _ in range(30)) + "."
+
+
+def document(title, paragraphs):
+    return "\n\n".join([title] + paragraphs)
+
+
+def fake_translate(chunk):
+    return "\n\n".join(f"[ko] {piece}" for piece in split_paragraphs(chunk))
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TranslationDatabase(str(tmp_path / "translations.db"))
+
+
+def test_revision_reuses_unchanged_paragraphs():
+    v1_paragraphs = [paragraph(i) for i in range(30)]
+    v1 = document("Attention Study", v1_paragraphs)
+    chunks = split_text_into_chunks(v1)
+    blocks = make_blocks(chunks, [fake_translate(chunk) for chunk in chunks])
+
+    modified = paragraph(500)
+    inserted = paragraph(501)
+    v2_paragraphs = v1_paragraphs[:10] + [modified] + v1_paragraphs[11:20] + [inserted] + v1_paragraphs[20:]
+    v2 = document("Attention Study", v2_paragraphs)
+
+    new_chunks, completed, stats = plan_revision(blocks, v2)
+
+    # 제목 줄 + 바뀌지 않은 문단 29개는 재사용, 바뀐 문단과 새 문단만 번역
+    assert stats == {'reused_paragraphs': 30, 'translate_paragraphs': 2}
+    pending = [chunk for index, chunk in enumerate(new_chunks) if index not in completed]
+    assert "\n\n".join(pending).count(modified) == 1
+    assert "\n\n".join(pending).count(inserted) == 1
+    assert "[ko] " + v1_paragraphs[25] in "\n\n".join(completed.values())
+
+
+def test_find_prior_version_matches_revised_document(db):
+    v1_paragraphs = [paragraph(i) for i in range(40)]
+    v1_id = db.save_translation("Attention Study", document("Attention Study", v1_paragraphs), "번역")
+
+    v2 = document("Attention Study", v1_paragraphs[:30] + [paragraph(600 + i) for i in range(10)])
+    found = find_prior_version(db, v2)
+
+    assert found['id'] == v1_id
+    assert found['similarity'] >= 0.5
+
+
+def test_unrelated_document_is_not_matched(db):
+    db.save_translation("Attention Study", document("Attention Study", [paragraph(i) for i in range(40)]), "번역")
+
+    unrelated = document("Vision Survey", [paragraph(2000 + i) for i in range(40)])
+
+    assert find_prior_version(db, unrelated, "vision_survey.pdf") is None
+
+
+def test_same_arxiv_id_or_title_lowers_threshold(db):
+    v1_paragraphs = [paragraph(i) for i in range(40)]
+    # 원문 앞부분이 약 0.375만 비슷함 (기준 0.5 미만, 절반 기준 0.25 이상)
+    shared = v1_paragraphs[:22] + [paragraph(700 + i) for i in range(18)]
+    v1_id = db.save_translation("2301.01234v1 Attention Study", document("Attention Study", v1_paragraphs), "번역")
+
+    assert find_prior_version(db, document("Renamed Study", shared), "notes.pdf") is None
+    assert find_prior_version(db, document("Renamed Study", shared), "2301.01234v2.pdf")['id'] == v1_id
+    assert find_prior_version(db, document("Attention Study", shared), "notes.pdf")['id'] == v1_id
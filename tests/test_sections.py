@@ -0,0 +1,59 @@
+from sections import MAX_SECTION_CHARS, build_section_index
+
+
+def assert_covers(markdown, sections):
+    # 섹션들이 빈틈과 겹침 없이 문서 전체를 순서대로 덮음
+    assert sections[0][2] == 0
+    assert sections[-1][3] == len(markdown)
+    for previous, current in zip(sections, sections[1:]):
+        assert previous[3] == current[2]
+
+
+def test_headings_become_sections():
+    markdown = ("요약 앞부분\n\n"
+                "# 1. 서론\n본문\n\n"
+                "## 1.1 배경 ##\n배경 설명\n\n"
+                "```python\n# 코드 주석은 제목이 아님\n```\n\n"
+                "# 2. 방법\n방법 설명\n")
+
+    sections = build_section_index(markdown)
+
+    assert [(level, title) for level, title, _, _ in sections] == [
+        (0, "처음"), (1, "1. 서론"), (2, "1.1 배경"), (1, "2. 방법"),
+    ]
+    assert markdown[sections[1][2]:sections[1][3]] == "# 1. 서론\n본문\n\n"
+    assert "# 코드 주석은 제목이 아님" in markdown[sections[2][2]:sections[2][3]]
+    assert_covers(markdown, sections)
+
+
+def test_document_without_headings_is_one_section():
+    assert build_section_index("제목 없는 번역문") == [(0, "처음", 0, len("제목 없는 번역문"))]
+
+
+def test_blank_text_before_first_heading_is_not_a_section():
+    sections = build_section_index("\n\n# 서론\n본문")
+
+    assert [title for _, title, _, _ in sections] == ["서론"]
+    assert sections[0][3] == len("\n\n# 서론\n본문")
+
+
+def test_long_section_is_split_at_paragraph_boundaries():
+    paragraph = "가" * 999 + "\n\n"
+    markdown = "# 결과\n" + paragraph * 45
+
+    sections = build_section_index(markdown)
+
+    assert [title for _, title, _, _ in sections] == ["결과", "결과 (2)", "결과 (3)"]
+    assert all(end - start <= MAX_SECTION_CHARS for _, _, start, end in sections)
+    # 두 번째 조각부터는 문단 시작에서 시작
+    assert all(markdown[start - 2:start] == "\n\n" for _, _, start, _ in sections[1:])
+    assert_covers(markdown, sections)
+
+
+def test_long_section_without_paragraph_breaks_is_cut_at_limit():
+    markdown = "# 표\n" + "가" * (MAX_SECTION_CHARS * 2)
+
+    sections = build_section_index(markdown)
+
+    assert [end - start for _, _, start, end in sections] == [MAX_SECTION_CHARS, MAX_SECTION_CHARS, len("# 표\n")]
+    assert_covers(markdown, sections)
@@ -0,0 +1,63 @@
+from translation_cache import TranslationCache
+
+MODEL = "fake-model"
+
+
+def make_cache(tmp_path, **kwargs):
+    return TranslationCache(str(tmp_path / "cache.db"), **kwargs)
+
+
+def cached_keys(cache):
+    return {key for key in "abcdef" if cache.get(key) is not None}
+
+
+def test_evicts_least_recently_used_by_count(tmp_path):
+    cache = make_cache(tmp_path, max_entries=3)
+    for key in "abc":
+        cache.put(key, MODEL, f"번역 {key}")
+
+    # a를 읽어서 가장 최근에 쓴 항목으로 만든 뒤 새 항목 추가 -> b가 제거됨
+    assert cache.get("a") == "번역 a"
+    cache.put("d", MODEL, "번역 d")
+
+    assert cached_keys(cache) == {"a", "c", "d"}
+    assert cache.get_stats()['entries'] == 3
+
+
+def test_evicts_least_recently_used_by_bytes(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=250)
+    for key in "abc":
+        cache.put(key, MODEL, "x" * 100)
+
+    stats = cache.get_stats()
+    assert cached_keys(cache) == {"b", "c"}
+    assert (stats['entries'], stats['size_bytes']) == (2, 200)
+
+
+def test_running_totals_follow_overwrite_and_clear(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("a", MODEL, "x" * 100)
+    cache.put("a", MODEL, "x" * 40)
+    cache.put("b", MODEL, "x" * 10)
+
+    stats = cache.get_stats()
+    assert (stats['entries'], stats['size_bytes']) == (2, 50)
+    assert cache.get("a") == "x" * 40
+
+    cache.clear()
+    stats = cache.get_stats()
+    assert (stats['entries'], stats['size_bytes']) == (0, 0)
+
+
+def test_existing_cache_rows_are_counted_once(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("a", MODEL, "x" * 30)
+    with cache.pool.transaction() as conn:
+        conn.execute('DROP TABLE translation_cache_totals')
+
+    reopened = make_cache(tmp_path, max_entries=1)
+    reopened.put("b", MODEL, "x" * 20)
+
+    stats = reopened.get_stats()
+    assert (stats['entries'], stats['size_bytes']) == (1, 20)
+    assert cached_keys(reopened) == {"b"}
@@ -0,0 +1,61 @@
+from translation_memory import TranslationMemory, guard_tokens
+
+MODEL = "fake-model"
+
+SOURCE = ("The proposed method reduces the error rate on the benchmark "
+          "compared with the baseline after 20 epochs of training.")
+TRANSLATION = "제안한 방법은 20 에폭 학습 후 벤치마크에서 기준 모델보다 오류율을 줄인다."
+
+
+def make_memory(tmp_path, **kwargs):
+    memory = TranslationMemory(str(tmp_path / "memory.db"), **kwargs)
+    memory.put([(SOURCE, TRANSLATION)], MODEL)
+    return memory
+
+
+def test_exact_match_is_reused_after_normalization(tmp_path):
+    memory = make_memory(tmp_path)
+
+    assert memory.lookup(["  " + SOURCE.replace(" ", "  ") + "\n"], MODEL) == [TRANSLATION]
+    assert memory.lookup([SOURCE], "other-model") == [None]
+    assert memory.get_stats()['exact_hits'] == 1
+
+
+def test_near_duplicate_is_not_reused_by_default(tmp_path):
+    memory = make_memory(tmp_path)
+
+    near = SOURCE.replace("after 20 epochs", "after 20 full epochs")
+    assert memory.lookup([near], MODEL) == [None]
+    assert memory.get_stats()['fuzzy_hits'] == 0
+
+
+def test_fuzzy_reuse_requires_same_negations_and_numbers(tmp_path):
+    memory = make_memory(tmp_path, similarity_threshold=0.5, fuzzy_enabled=True)
+
+    negated = SOURCE.replace("reduces", "does not reduce")
+    renumbered = SOURCE.replace("20 epochs", "200 epochs")
+    reworded = SOURCE.replace("the benchmark", "the standard benchmark")
+
+    assert memory.lookup([negated, renumbered, reworded], MODEL) == [None, None, TRANSLATION]
+    assert memory.get_stats()['fuzzy_hits'] == 1
+
+
+def test_guard_tokens():
+    assert guard_tokens("It doesn't fail in 3.5 s, not 10") == (("3.5", "10"), ("n't", "not"))
+    assert guard_tokens("It doesn’t fail") == guard_tokens("It doesn't fail")
+    assert guard_tokens("Nothing is noted here") == ((), ("nothing",))
+
+
+def test_evicts_least_recently_used_entries_past_the_cap(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "memory.db"), max_entries=2)
+    memory.put([("first paragraph", "첫 문단"), ("second paragraph", "둘째 문단")], MODEL)
+    assert memory.lookup(["first paragraph"], MODEL) == ["첫 문단"]
+
+    memory.put([("third paragraph", "셋째 문단")], MODEL)
+
+    assert memory.lookup(["first paragraph", "second paragraph", "third paragraph"], MODEL) == \
+        ["첫 문단", None, "셋째 문단"]
+    assert memory.get_stats()['entries'] == 2
+
+    memory.clear()
+    assert memory.get_stats()['entries'] == 0
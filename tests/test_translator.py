@@ -0,0 +1,155 @@
+import pytest
+
+import translator
+from fake_gemini import TRANSLATION_PREFIX, FakeGenerativeModel, ResourceExhausted
+from request_scheduler import FakeClock, RequestScheduler
+
+# 숫자만 있는 표 (번역하지 않고 원문 그대로 두는 문단)
+TABLE = "\n".join(" ".join(str(row * 10 + col) for col in range(8)) for row in range(1, 6))
+
+
+def paragraph(index: int, words: int = 60) -> str:
+    return f"Paragraph {index} " + " ".join(f"word{index}x{n}" for n in range(words)) + "."
+
+
+class FlakyModel(FakeGenerativeModel):
+    """처음 failures번은 429 오류를 내는 가짜 모델"""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(latency=0, tokens_per_second=0, **kwargs)
+        self.failures = failures
+
+    def generate_content(self, prompt, **kwargs):
+        if self.failures > 0:
+            self.failures -= 1
+            self.calls += 1
+            raise ResourceExhausted("429 Resource has been exhausted (fake)")
+        return super().generate_content(prompt, **kwargs)
+
+
+class MarkerDroppingModel(FakeGenerativeModel):
+    """번호 표시([[n]])를 지우고 답하는 가짜 모델"""
+
+    def __init__(self):
+        super().__init__(latency=0, tokens_per_second=0)
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return super().generate_content(translator._SEGMENT_MARKER.sub("", prompt), **kwargs)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    # 재시도 백오프를 실제로 기다리지 않도록 가짜 시계를 쓰는 스케줄러로 교체
+    scheduler = RequestScheduler(requests_per_minute=1000, tokens_per_minute=10_000_000, clock=FakeClock())
+    monkeypatch.setattr(translator, "get_scheduler", lambda: scheduler)
+    return scheduler
+
+
+@pytest.fixture
+def use_model():
+    def use(model):
+        translator.set_model_factory(lambda: model, backend_name="fake")
+        return model
+    yield use
+    translator.set_model_factory(None)
+
+
+def test_translate_text_on_fake_backend_keeps_order(scheduler, use_model):
+    model = use_model(FakeGenerativeModel(latency=0, tokens_per_second=0))
+    # 청크 토큰 예산을 넘겨 여러 청크로 나뉘는 길이
+    text = "\n\n".join(paragraph(i, words=100) for i in range(40))
+
+    translated = translator.translate_text(text)
+
+    assert model.calls > 1
+    positions = [translated.index(f"Paragraph {i} ") for i in range(40)]
+    assert positions == sorted(positions)
+    assert translated.count(TRANSLATION_PREFIX.strip()) == model.calls
+
+
+def test_translate_text_retries_rate_limited_requests(scheduler, use_model):
+    model = use_model(FlakyModel(failures=2))
+
+    translated = translator.translate_text(paragraph(1))
+
+    assert translated.startswith(TRANSLATION_PREFIX)
+    assert model.calls == 3
+    assert scheduler.stats['retries'] == 2
+    assert scheduler.stats['failures'] == 0
+    assert scheduler.clock.monotonic() > 0
+
+
+def test_translate_text_gives_up_after_max_retries(scheduler, use_model):
+    scheduler.max_retries = 1
+    use_model(FlakyModel(failures=5))
+
+    with pytest.raises(Exception, match="429"):
+        translator.translate_text(paragraph(1))
+    assert scheduler.stats['failures'] == 1
+
+
+def test_truncated_response_is_resplit_and_retranslated(scheduler, use_model):
+    # 청크 전체(약 1,100토큰)는 출력 한도를 넘고 절반은 한도 안에 들어감
+    model = use_model(FakeGenerativeModel(latency=0, tokens_per_second=0, max_output_tokens=800))
+    text = "\n\n".join(paragraph(i, words=100) for i in range(4))
+
+    translated = translator.translate_text(text)
+
+    assert model.calls == 3
+    for i in range(4):
+        assert f"Paragraph {i} " in translated
+        assert f"word{i}x99." in translated
+    assert translated.count(TRANSLATION_PREFIX.strip()) == 2
+
+
+def test_truncation_that_never_fits_raises(scheduler, use_model):
+    use_model(FakeGenerativeModel(latency=0, tokens_per_second=0, max_output_tokens=5))
+
+    with pytest.raises(Exception, match="잘립니다"):
+        translator.translate_text("\n\n".join(paragraph(i, words=100) for i in range(4)))
+
+
+def test_streamed_partial_text_is_reported_per_chunk(scheduler, use_model):
+    use_model(FakeGenerativeModel(latency=0, tokens_per_second=0))
+    partials = []
+
+    chunks = ["\n\n".join(paragraph(i, words=100) for i in range(2))]
+    result = "".join(translator.translate_chunks_stream(
+        chunks, on_chunk_partial=lambda i, text: partials.append((i, text))))
+
+    assert len(partials) > 1
+    assert all(index == 0 for index, _ in partials)
+    assert partials[-1][1] == result
+
+
+def test_split_marked_output():
+    assert translator._split_marked_output("[[0]] 가\n\n[[1]] 나", 2) == ["가", "나"]
+    # 첫 표시 앞의 내용(제목 등)은 첫 문단에 붙임
+    assert translator._split_marked_output("# 제목\n[[0]] 가\n[[1]] 나", 2) == ["# 제목\n가", "나"]
+
+
+@pytest.mark.parametrize("output", [
+    "[[0]] 가\n\n나",                      # 표시 빠짐
+    "[[1]] 나\n\n[[0]] 가",                # 순서 바뀜
+    "[[0]] 가\n\n[[0]] 나",                # 번호 중복
+    "[[0]] 가\n\n[[1]] 나\n\n[[2]] 다",    # 표시가 더 많음
+    "[[0]] \n\n[[1]] 나",                  # 빈 문단
+])
+def test_split_marked_output_rejects_bad_markers(output):
+    assert translator._split_marked_output(output, 2) is None
+
+
+def test_missing_markers_fall_back_to_whole_chunk(scheduler, use_model):
+    model = use_model(MarkerDroppingModel())
+    chunk = "\n\n".join([paragraph(1), TABLE, paragraph(2)])
+
+    translated = translator._translate_segments(model, chunk)
+
+    # 표시를 붙여 보낸 요청을 문단별로 나눌 수 없어서 청크 전체를 한 번 더 번역
+    assert len(model.prompts) == 2
+    assert "[[0]]" in model.prompts[0] and TABLE not in model.prompts[0]
+    assert TABLE in model.prompts[1]
+    assert "[[" not in translated
+    assert translated.startswith(TRANSLATION_PREFIX)
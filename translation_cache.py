@@ -0,0 +1,187 @@
+import hashlib
+import re
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Dict, Optional
+from database import get_connection_pool
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키 계산을 위해 텍스트를 정규화 (유니코드 NFC, 공백 정리)"""
+    text = unicodedata.normalize('NFC', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def hash_text(text: str) -> str:
+    """텍스트의 SHA-256 해시"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_cache_key(source_text: str, prompt_template: str, model_name: str) -> str:
+    """
+    번역 캐시 키 생성
+
+    정규화된 원문 해시, 프롬프트 템플릿 해시, 모델 이름을 합쳐서 만든다.
+    프롬프트나 모델이 바뀌면 키가 달라지므로 이전 항목은 자동으로 무효화된다.
+    """
+    return f"{hash_text(normalize_text(source_text))}:{hash_text(prompt_template)}:{model_name}"
+
+
+class TranslationCache:
+    """번역 결과를 청크 해시 단위로 저장하는 영구 캐시 (LRU 제거)"""
+
+    def __init__(self, db_path: str = "translations.db", max_entries: int = 5000,
+                 max_bytes: int = 200 * 1024 * 1024):
+        self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self.init_database()
+
+    def init_database(self):
+        """캐시 테이블 초기화"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translation_cache_last_accessed
+                ON translation_cache (last_accessed_at)
+            ''')
+
+            # 항목 수와 전체 크기 (저장할 때마다 테이블 전체를 세지 않도록 트리거로 누적)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_cache_totals (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    entries INTEGER NOT NULL,
+                    size_bytes INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS translation_cache_totals_insert AFTER INSERT ON translation_cache BEGIN
+                    UPDATE translation_cache_totals
+                    SET entries = entries + 1, size_bytes = size_bytes + new.size_bytes WHERE id = 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS translation_cache_totals_delete AFTER DELETE ON translation_cache BEGIN
+                    UPDATE translation_cache_totals
+                    SET entries = entries - 1, size_bytes = size_bytes - old.size_bytes WHERE id = 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS translation_cache_totals_update
+                AFTER UPDATE OF size_bytes ON translation_cache BEGIN
+                    UPDATE translation_cache_totals
+                    SET size_bytes = size_bytes - old.size_bytes + new.size_bytes WHERE id = 1;
+                END
+            ''')
+            # 누적 값이 없는 기존 캐시는 처음 한 번만 전체를 셈
+            cursor.execute('''
+                INSERT OR IGNORE INTO translation_cache_totals (id, entries, size_bytes)
+                SELECT 1, COUNT(*), COALESCE(SUM(size_bytes), 0) FROM translation_cache
+            ''')
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """캐시된 번역 조회 (없으면 None)"""
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT translated_text FROM translation_cache WHERE cache_key = ?',
+                               (cache_key,)).fetchone()
+
+        if row:
+            # LRU 순서를 위해 마지막 접근 시간 갱신
+            with self.pool.transaction() as conn:
+                conn.execute('''
+                    UPDATE translation_cache
+                    SET last_accessed_at = ?, hit_count = hit_count + 1
+                    WHERE cache_key = ?
+                ''', (datetime.now(), cache_key))
+
+        with self._stats_lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return row[0] if row else None
+
+    def put(self, cache_key: str, model_name: str, translated_text: str):
+        """번역 결과를 캐시에 저장하고 용량 제한을 넘으면 오래된 항목 제거"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            now = datetime.now()
+            # INSERT OR REPLACE는 삭제 트리거를 실행하지 않아 누적 값이 틀어지므로 UPSERT 사용
+            cursor.execute('''
+                INSERT INTO translation_cache
+                    (cache_key, model, translated_text, size_bytes, hit_count, created_at, last_accessed_at)
+                VALUES (?, ?, ?, ?, 0, ?, ?)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    model = excluded.model, translated_text = excluded.translated_text,
+                    size_bytes = excluded.size_bytes, hit_count = 0,
+                    created_at = excluded.created_at, last_accessed_at = excluded.last_accessed_at
+            ''', (cache_key, model_name, translated_text, len(translated_text.encode('utf-8')), now, now))
+
+            self._evict(cursor)
+
+    def _evict(self, cursor):
+        """항목 수/바이트 제한을 넘는 동안 가장 오래 사용되지 않은 항목부터 제거"""
+        cursor.execute('SELECT entries, size_bytes FROM translation_cache_totals WHERE id = 1')
+        count, total_bytes = cursor.fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+
+        # 인덱스 순서로 필요한 만큼만 읽음 (제거할 항목을 다 고르면 나머지는 읽지 않음)
+        oldest = cursor.connection.execute(
+            'SELECT cache_key, size_bytes FROM translation_cache ORDER BY last_accessed_at ASC'
+        )
+        victims = []
+        for cache_key, size_bytes in oldest:
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            victims.append((cache_key,))
+            count -= 1
+            total_bytes -= size_bytes
+
+        oldest.close()
+        cursor.executemany('DELETE FROM translation_cache WHERE cache_key = ?', victims)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self.pool.transaction() as conn:
+            conn.execute('DELETE FROM translation_cache')
+
+    def get_stats(self) -> Dict:
+        """캐시 적중/실패 횟수와 현재 용량 조회"""
+        with self.pool.connection() as conn:
+            entries, total_bytes = conn.execute(
+                'SELECT entries, size_bytes FROM translation_cache_totals WHERE id = 1'
+            ).fetchone()
+
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+        }
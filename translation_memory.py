@@ -0,0 +1,307 @@
+import hashlib
+import random
+import re
+import struct
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from database import get_connection_pool
+from translation_cache import hash_text, normalize_text
+
+# MinHash 서명 길이와 LSH 밴드 구성 (밴드 16개 x 4행, 유사도 0.8 이상이면 거의 항상 후보로 잡힘)
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+
+# 유사 문단 검색에 사용할 최소 단어 수 (이보다 짧은 문단은 정확히 같은 경우만 재사용)
+MIN_FUZZY_WORDS = 8
+
+# 단어 몇 개를 묶어 비교 단위(shingle)로 쓸지
+SHINGLE_WORDS = 3
+
+# 유사 문단이라도 숫자나 부정어가 다르면 뜻이 달라지므로 재사용하지 않음
+_NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)*')
+_NEGATION_PATTERN = re.compile(
+    r"\b(?:not|no|never|none|nor|neither|nobody|nothing|nowhere|without|cannot)\b|n['\u2019]t\b",
+    re.IGNORECASE,
+)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(MINHASH_PERMUTATIONS)]
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def minhash_signature(text: str) -> Optional[Tuple[int, ...]]:
+    """
+    텍스트의 MinHash 서명 계산 (단어 SHINGLE_WORDS개 묶음 기준)
+
+    Returns:
+        Optional[Tuple[int, ...]]: 서명 (단어가 MIN_FUZZY_WORDS개보다 적으면 None)
+    """
+    words = re.findall(r'\w+', normalize_text(text).lower())
+    if len(words) < MIN_FUZZY_WORDS:
+        return None
+
+    shingles = {_hash64(" ".join(words[i:i + SHINGLE_WORDS])) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return tuple(min((a * x + b) % _MERSENNE_PRIME for x in shingles) for a, b in _PERMUTATIONS)
+
+
+def guard_tokens(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    유사 문단 재사용 전에 같아야 하는 토큰 (숫자, 부정어)
+
+    Returns:
+        Tuple[Tuple[str, ...], Tuple[str, ...]]: (등장 순서대로의 숫자, 등장 순서대로의 부정어)
+    """
+    text = normalize_text(text)
+    numbers = tuple(_NUMBER_PATTERN.findall(text))
+    negations = tuple(token.lower().replace('\u2019', "'") for token in _NEGATION_PATTERN.findall(text))
+    return numbers, negations
+
+
+def estimate_similarity(signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+    """두 MinHash 서명으로 자카드 유사도 추정"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+
+def _band_keys(signature: Tuple[int, ...]) -> List[int]:
+    """LSH 밴드별 버킷 키 (밴드 번호를 섞어 밴드끼리 충돌하지 않도록 함, SQLite INTEGER 범위)"""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f'<I{LSH_ROWS}Q', band, *rows), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def pack_signature(signature: Tuple[int, ...]) -> bytes:
+    return struct.pack(f'<{MINHASH_PERMUTATIONS}Q', *signature)
+
+
+def unpack_signature(blob: bytes) -> Tuple[int, ...]:
+    return struct.unpack(f'<{MINHASH_PERMUTATIONS}Q', blob)
+
+
+class TranslationMemory:
+    """
+    문단 단위 원문-번역문 쌍을 저장하고 재사용하는 번역 메모리
+
+    정규화된 원문 해시로 같은 문단을 찾아 그 번역문을 재사용한다. fuzzy_enabled가 켜져 있으면
+    MinHash/LSH로 거의 같은 문단도 찾아, 유사도가 기준 이상이고 숫자와 부정어가 모두 같을 때만 재사용한다.
+    항목 수 제한을 넘으면 오래 사용되지 않은 항목부터 제거한다.
+    """
+
+    def __init__(self, db_path: str = "translations.db", similarity_threshold: float = 0.9,
+                 max_entries: int = 200000, fuzzy_enabled: bool = False):
+        self.db_path = db_path
+        self.pool = get_connection_pool(db_path)
+        self.similarity_threshold = similarity_threshold
+        self.fuzzy_enabled = fuzzy_enabled
+        self.max_entries = max_entries
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self.init_database()
+
+    def init_database(self):
+        """번역 메모리 테이블 초기화"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_memory (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source_hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    source_text TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    signature BLOB,
+                    hit_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_translation_memory_source
+                ON translation_memory (source_hash, model)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translation_memory_last_accessed
+                ON translation_memory (last_accessed_at)
+            ''')
+
+            # 항목 수 (저장할 때마다 테이블 전체를 세지 않도록 트리거로 누적)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_memory_totals (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    entries INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS translation_memory_totals_insert AFTER INSERT ON translation_memory BEGIN
+                    UPDATE translation_memory_totals SET entries = entries + 1 WHERE id = 1;
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS translation_memory_totals_delete AFTER DELETE ON translation_memory BEGIN
+                    UPDATE translation_memory_totals SET entries = entries - 1 WHERE id = 1;
+                END
+            ''')
+            # 누적 값이 없는 기존 메모리는 처음 한 번만 전체를 셈
+            cursor.execute('''
+                INSERT OR IGNORE INTO translation_memory_totals (id, entries)
+                SELECT 1, COUNT(*) FROM translation_memory
+            ''')
+
+            # LSH 버킷 (밴드 키 하나에 같은 버킷에 들어간 문단들)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS translation_memory_bands (
+                    band_key INTEGER NOT NULL,
+                    segment_id INTEGER NOT NULL,
+                    PRIMARY KEY (band_key, segment_id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_translation_memory_bands_segment
+                ON translation_memory_bands (segment_id)
+            ''')
+
+    def lookup(self, segments: List[str], model_name: str) -> List[Optional[str]]:
+        """
+        문단 목록의 번역문을 번역 메모리에서 찾는 함수
+
+        Args:
+            segments: 원문 문단 목록
+            model_name: 번역에 사용한 모델 이름 (모델이 다른 번역은 재사용하지 않음)
+
+        Returns:
+            List[Optional[str]]: 문단 순서대로 재사용할 번역문 (찾지 못한 문단은 None)
+        """
+        results = []
+        hit_ids = []
+        exact_hits = fuzzy_hits = 0
+
+        with self.pool.connection() as conn:
+            for segment in segments:
+                row = conn.execute('''
+                    SELECT id, translated_text FROM translation_memory
+                    WHERE source_hash = ? AND model = ?
+                ''', (hash_text(normalize_text(segment)), model_name)).fetchone()
+                if row:
+                    exact_hits += 1
+                elif self.fuzzy_enabled:
+                    row = self._find_similar(conn, segment, model_name)
+                    fuzzy_hits += 1 if row else 0
+
+                results.append(row[1] if row else None)
+                if row:
+                    hit_ids.append(row[0])
+
+        if hit_ids:
+            # LRU 순서를 위해 마지막 접근 시간 갱신
+            with self.pool.transaction() as conn:
+                conn.executemany('''
+                    UPDATE translation_memory
+                    SET last_accessed_at = ?, hit_count = hit_count + 1
+                    WHERE id = ?
+                ''', [(datetime.now(), segment_id) for segment_id in hit_ids])
+
+        with self._stats_lock:
+            self.exact_hits += exact_hits
+            self.fuzzy_hits += fuzzy_hits
+            self.misses += len(segments) - exact_hits - fuzzy_hits
+
+        return results
+
+    def _find_similar(self, conn, segment: str, model_name: str) -> Optional[Tuple[int, str]]:
+        """LSH 버킷이 겹치는 후보 중 숫자·부정어가 같고 유사도가 기준 이상이면서 가장 높은 문단의 (id, 번역문)"""
+        signature = minhash_signature(segment)
+        if signature is None:
+            return None
+        tokens = guard_tokens(segment)
+
+        keys = _band_keys(signature)
+        candidates = conn.execute(f'''
+            SELECT DISTINCT m.id, m.source_text, m.translated_text, m.signature
+            FROM translation_memory_bands b
+            JOIN translation_memory m ON m.id = b.segment_id
+            WHERE b.band_key IN ({", ".join("?" for _ in keys)}) AND m.model = ?
+        ''', (*keys, model_name)).fetchall()
+
+        best, best_similarity = None, self.similarity_threshold
+        for segment_id, source_text, translated_text, blob in candidates:
+            similarity = estimate_similarity(signature, unpack_signature(blob))
+            if similarity >= best_similarity and guard_tokens(source_text) == tokens:
+                best, best_similarity = (segment_id, translated_text), similarity
+        return best
+
+    def put(self, pairs: List[Tuple[str, str]], model_name: str):
+        """(원문 문단, 번역문) 쌍을 저장하고 항목 수 제한을 넘으면 오래된 항목 제거"""
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+
+            now = datetime.now()
+            for source_text, translated_text in pairs:
+                source_hash = hash_text(normalize_text(source_text))
+                cursor.execute('''
+                    UPDATE translation_memory SET translated_text = ?, last_accessed_at = ?
+                    WHERE source_hash = ? AND model = ?
+                ''', (translated_text, now, source_hash, model_name))
+                if cursor.rowcount:
+                    continue
+
+                signature = minhash_signature(source_text)
+                cursor.execute('''
+                    INSERT INTO translation_memory
+                        (source_hash, model, source_text, translated_text, signature, created_at, last_accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (source_hash, model_name, source_text, translated_text,
+                      pack_signature(signature) if signature else None, now, now))
+                if signature:
+                    segment_id = cursor.lastrowid
+                    cursor.executemany('INSERT OR IGNORE INTO translation_memory_bands VALUES (?, ?)',
+                                       [(key, segment_id) for key in _band_keys(signature)])
+
+            self._evict(cursor)
+
+    def _evict(self, cursor):
+        """항목 수 제한을 넘는 만큼 가장 오래 사용되지 않은 항목과 그 LSH 버킷 제거"""
+        cursor.execute('SELECT entries FROM translation_memory_totals WHERE id = 1')
+        excess = cursor.fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return
+
+        cursor.execute('SELECT id FROM translation_memory ORDER BY last_accessed_at ASC LIMIT ?', (excess,))
+        victims = cursor.fetchall()
+        cursor.executemany('DELETE FROM translation_memory_bands WHERE segment_id = ?', victims)
+        cursor.executemany('DELETE FROM translation_memory WHERE id = ?', victims)
+
+    def clear(self):
+        """번역 메모리 전체 삭제"""
+        with self.pool.transaction() as conn:
+            conn.execute('DELETE FROM translation_memory_bands')
+            conn.execute('DELETE FROM translation_memory')
+
+    def get_stats(self) -> Dict:
+        """정확/유사 재사용 횟수와 저장된 문단 수 조회"""
+        with self.pool.connection() as conn:
+            entries = conn.execute('SELECT entries FROM translation_memory_totals WHERE id = 1').fetchone()[0]
+
+        with self._stats_lock:
+            exact_hits, fuzzy_hits, misses = self.exact_hits, self.fuzzy_hits, self.misses
+        lookups = exact_hits + fuzzy_hits + misses
+
+        return {
+            'exact_hits': exact_hits,
+            'fuzzy_hits': fuzzy_hits,
+            'misses': misses,
+            'hit_rate': (exact_hits + fuzzy_hits) / lookups if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+        }
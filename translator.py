@@ -1,6 +1,17 @@
-import google.generativeai as genai
+import logging
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from dotenv import load_dotenv
+from translation_cache import TranslationCache, make_cache_key
+from translation_memory import TranslationMemory
+from passthrough import classify_segment
+from request_scheduler import get_scheduler
+import metrics
+
+logger = logging.getLogger(__name__)
 
 # 환경 변수 로드
 load_dotenv()
@@ -8,26 +19,54 @@ load_dotenv()
 # 구글 제미나이 API 키
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-def translate_text(text: str) -> str:
-    """
-    구글 제미나이 API를 사용하여 영어 텍스트를 한국어로 번역하는 함수
-    
-    Args:
-        text: 번역할 영어 텍스트
-        
-    Returns:
-        str: 번역된 한국어 텍스트
-    """
-    try:
-        # 구글 제미나이 API 설정
-        genai.configure(api_key=GOOGLE_API_KEY)
-        
-        # 모델 초기화
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        # 번역 프롬프트
-        prompt = f"""
-        다음 영어 논문을 한국어로 번역해주세요. 
+# 사용할 제미나이 모델
+MODEL_NAME = 'gemini-2.5-flash'
+
+# 번역 모델 백엔드 (gemini: 구글 제미나이 API, fake: 네트워크 없이 지연 시간만 흉내 내는 가짜 모델)
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "gemini")
+
+# 청크 하나에 담을 원문 토큰 수 상한 (입력 예산)
+MAX_INPUT_TOKENS = int(os.getenv("TRANSLATION_MAX_INPUT_TOKENS", "4000"))
+
+# 응답 하나의 출력 토큰 상한 (요청의 max_output_tokens로 전달)
+MAX_OUTPUT_TOKENS = int(os.getenv("TRANSLATION_MAX_OUTPUT_TOKENS", "16384"))
+
+# 원문 토큰 대비 예상 번역문 토큰 비율 (한국어 번역문은 영어 원문보다 토큰이 많음)
+OUTPUT_TOKEN_RATIO = float(os.getenv("TRANSLATION_OUTPUT_TOKEN_RATIO", "1.5"))
+
+# 청크 하나의 원문 토큰 수 (입력 예산과, 예상 번역문이 출력 상한의 80% 안에 들어가는 크기 중 작은 값)
+CHUNK_TOKEN_BUDGET = max(1, min(MAX_INPUT_TOKENS, int(MAX_OUTPUT_TOKENS * 0.8 / OUTPUT_TOKEN_RATIO)))
+
+# 원문이 이 문자 수 이상인데 번역문이 원문 길이의 MIN_OUTPUT_CHAR_RATIO배보다 짧으면 잘린 응답으로 간주
+TRUNCATION_CHECK_MIN_CHARS = 500
+MIN_OUTPUT_CHAR_RATIO = 0.2
+
+# 잘린 응답의 청크를 나누어 다시 번역하는 최대 횟수 (한 번에 절반씩)
+MAX_RESPLIT_DEPTH = 3
+
+# 동시에 번역할 최대 청크 수 (워커 풀 크기)
+MAX_CONCURRENCY = int(os.getenv("TRANSLATION_MAX_WORKERS", "4"))
+
+# 번역 캐시 설정
+CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "1") != "0"
+CACHE_DB_PATH = os.getenv("TRANSLATION_CACHE_DB", "translations.db")
+CACHE_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "5000"))
+CACHE_MAX_BYTES = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# 참고문헌, 표, 수식, URL 목록처럼 번역할 필요가 없는 문단을 원문 그대로 둘지 여부
+PASSTHROUGH_ENABLED = os.getenv("TRANSLATION_PASSTHROUGH_ENABLED", "1") != "0"
+
+# 번역 메모리 설정 (문단 단위로 원문이 같은 이전 번역 재사용)
+MEMORY_ENABLED = os.getenv("TRANSLATION_MEMORY_ENABLED", "1") != "0"
+
+# 거의 같은 문단의 번역도 재사용할지 여부 (기본 꺼짐, 켜도 숫자·부정어가 다르면 재사용하지 않음)
+MEMORY_FUZZY_ENABLED = os.getenv("TRANSLATION_MEMORY_FUZZY", "0") != "0"
+MEMORY_SIMILARITY = float(os.getenv("TRANSLATION_MEMORY_SIMILARITY", "0.9"))
+MEMORY_MAX_ENTRIES = int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "200000"))
+
+# 번역 프롬프트 템플릿
+TRANSLATION_PROMPT = """
+        다음 영어 논문을 한국어로 번역해주세요.
         번역 시 다음 사항을 준수해주세요:
         1. 학술 논문의 정확성과 전문성을 유지
         2. 모든 내용을 빠짐없이 번역 (생략하지 말 것)
@@ -38,15 +77,570 @@ def translate_text(text: str) -> str:
         7. 수식이 있다면 LaTeX 형식으로 유지
         8. 표와 그림 설명도 번역
         9. 번역 작업만 수행하고, 번역문 앞뒤에 지시사항을 수행했다는 문구를 추가하지 말 것 (예: "번역 작업을 완료했습니다.")
-        
+        10. 원문은 논문의 일부분일 수 있으므로, 주어진 부분만 번역하고 앞뒤 내용을 지어내지 말 것
+        11. 문단 앞의 [[숫자]] 표시는 번역문의 해당 문단 앞에도 그대로 남길 것
+
         영어 원문:
         {text}
         """
-        
-        # 번역 실행
-        response = model.generate_content(prompt)
-        
-        return response.text
-    
+
+# 섹션 제목으로 보이는 줄 (예: "1 Introduction", "2.3 Results", "ABSTRACT", "References")
+_SECTION_HEADING = re.compile(
+    r'^(?:\d+(?:\.\d+)*\.?\s+[A-Z][^\n]{0,80}'
+    r'|[A-Z][A-Z \-]{2,40}'
+    r'|(?:Abstract|Introduction|Conclusions?|References|Acknowledg(?:e)?ments?|Appendix)\b[^\n]{0,60})$'
+)
+
+# 번역문을 문단별로 나누기 위해 붙이는 문단 번호 표시 (예: "[[3]] ")
+_SEGMENT_MARKER = re.compile(r'\[\[(\d+)\]\]\s*')
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    텍스트를 문단 단위로 나누는 함수
+
+    빈 줄이 있으면 빈 줄을 문단 경계로 사용하고, 섹션 제목으로 보이는 줄은
+    항상 새 문단의 시작으로 취급한다.
+    """
+    paragraphs = []
+    for block in re.split(r'\n\s*\n', text):
+        current = []
+        for line in block.split('\n'):
+            if _SECTION_HEADING.match(line.strip()) and current:
+                paragraphs.append('\n'.join(current))
+                current = []
+            current.append(line)
+        if current:
+            paragraphs.append('\n'.join(current))
+    return [p.strip() for p in paragraphs if p.strip()]
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (영문 등 ASCII 문자는 약 4자당 1토큰, 한글 등 그 밖의 문자는 1자당 1토큰)"""
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+
+def _split_long_paragraph(paragraph: str, max_tokens: int) -> List[str]:
+    """토큰 예산을 넘는 문단을 줄/문장 경계에서 잘라내는 함수"""
+    pieces = []
+    current = ""
+    current_tokens = 0
+    for unit in re.split(r'(?<=[.!?])\s+|\n', paragraph):
+        if not unit:
+            continue
+        # 문장 하나가 예산을 넘는 경우 강제로 자름
+        unit_tokens = estimate_tokens(unit)
+        while unit_tokens > max_tokens:
+            if current:
+                pieces.append(current)
+                current, current_tokens = "", 0
+            cut = max(1, len(unit) * max_tokens // unit_tokens)
+            pieces.append(unit[:cut])
+            unit = unit[cut:]
+            unit_tokens = estimate_tokens(unit)
+        if current and current_tokens + unit_tokens > max_tokens:
+            pieces.append(current)
+            current, current_tokens = unit, unit_tokens
+        else:
+            current = f"{current} {unit}" if current else unit
+            current_tokens += unit_tokens
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_text_into_chunks(text: str, max_tokens: int = CHUNK_TOKEN_BUDGET) -> List[str]:
+    """
+    번역할 텍스트를 섹션/문단 경계에서 청크로 나누는 함수
+
+    문단마다 토큰 수를 추정해서 청크 하나가 토큰 예산을 최대한 채우도록 문단을 담는다.
+
+    Args:
+        text: 나눌 영어 텍스트
+        max_tokens: 청크 하나의 최대 원문 토큰 수 (추정치)
+
+    Returns:
+        List[str]: 원문 순서를 유지한 청크 목록
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for paragraph in split_paragraphs(text):
+        first_line = paragraph.split('\n', 1)[0].strip()
+        # 청크가 절반 이상 찼다면 새 섹션은 새 청크에서 시작
+        if current and _SECTION_HEADING.match(first_line) and current_tokens >= max_tokens // 2:
+            chunks.append('\n\n'.join(current))
+            current, current_tokens = [], 0
+
+        paragraph_tokens = estimate_tokens(paragraph)
+        if paragraph_tokens <= max_tokens:
+            parts = [(paragraph, paragraph_tokens)]
+        else:
+            parts = [(part, estimate_tokens(part)) for part in _split_long_paragraph(paragraph, max_tokens)]
+        for part, part_tokens in parts:
+            if current and current_tokens + part_tokens > max_tokens:
+                chunks.append('\n\n'.join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> Optional[TranslationCache]:
+    """프로세스 전체에서 공유하는 번역 캐시 (비활성화 시 None)"""
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranslationCache(CACHE_DB_PATH, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES)
+        return _cache
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """프로세스 전체에서 공유하는 번역 메모리 (비활성화 시 None)"""
+    global _memory
+    if not MEMORY_ENABLED:
+        return None
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory(CACHE_DB_PATH, similarity_threshold=MEMORY_SIMILARITY,
+                                        max_entries=MEMORY_MAX_ENTRIES, fuzzy_enabled=MEMORY_FUZZY_ENABLED)
+        return _memory
+
+
+_model_factory = None
+_backend_name = TRANSLATION_BACKEND
+
+# 프로세스 전체에서 재사용하는 제미나이 모델 (google.generativeai는 처음 필요할 때 불러옴)
+_gemini_model = None
+_gemini_model_lock = threading.Lock()
+_warm_up_thread = None
+
+
+def set_model_factory(factory: Optional[Callable[[], Any]], backend_name: str = "custom"):
+    """
+    번역 모델을 만드는 함수를 바꿔 끼우는 함수 (벤치마크/테스트용)
+
+    모델은 generate_content(prompt, generation_config=...)를 제공해야 한다. 번역 캐시 키에 백엔드 이름이
+    들어가므로 바꿔 끼운 모델의 결과가 실제 제미나이 번역과 섞이지 않는다.
+
+    Args:
+        factory: 모델을 만드는 함수 (None이면 TRANSLATION_BACKEND 설정으로 되돌림)
+        backend_name: 캐시 키에 넣을 백엔드 이름
+    """
+    global _model_factory, _backend_name
+    _model_factory = factory
+    _backend_name = backend_name if factory is not None else TRANSLATION_BACKEND
+
+
+def _cache_model_name() -> str:
+    """캐시 키/캐시 항목에 기록할 모델 이름 (제미나이가 아닌 백엔드는 이름을 붙여 구분)"""
+    return MODEL_NAME if _backend_name == "gemini" else f"{_backend_name}:{MODEL_NAME}"
+
+
+def _get_model():
+    """번역 모델을 만드는 함수 (기본은 제미나이 API)"""
+    if _model_factory is not None:
+        return _model_factory()
+
+    if TRANSLATION_BACKEND == "fake":
+        from fake_gemini import FakeGenerativeModel
+        return FakeGenerativeModel.from_env(MODEL_NAME)
+
+    return get_gemini_model()
+
+
+def get_gemini_model():
+    """
+    프로세스 전체에서 재사용하는 제미나이 모델
+
+    처음 호출할 때만 google.generativeai를 불러오고 API 키를 설정해서 모델을 만든다
+    (라이브러리를 불러오는 시간이 길어서 앱 시작이나 요청마다 반복하지 않음).
+    """
+    global _gemini_model
+    with _gemini_model_lock:
+        if _gemini_model is None:
+            import google.generativeai as genai
+
+            # 구글 제미나이 API 설정
+            genai.configure(api_key=GOOGLE_API_KEY)
+
+            # 모델 초기화
+            _gemini_model = genai.GenerativeModel(MODEL_NAME)
+        return _gemini_model
+
+
+def _warm_up():
+    try:
+        get_gemini_model()
+    except Exception:
+        logger.exception("제미나이 모델 미리 준비 중 오류 발생")
+        return
+
+    # 첫 요청에서 만들어질 API 클라이언트도 미리 만들어 둠 (라이브러리 버전에 따라 없으면 생략)
+    try:
+        from google.generativeai import client
+        client.get_default_generative_client()
+    except Exception:
+        pass
+
+
+def warm_up_model():
+    """
+    첫 번역 요청 전에 백그라운드 스레드에서 제미나이 모델을 미리 준비 (화면을 그린 뒤 호출)
+
+    이미 준비했거나 준비 중이면, 또는 제미나이가 아닌 백엔드를 쓰면 아무것도 하지 않는다.
+    """
+    global _warm_up_thread
+    if _model_factory is not None or TRANSLATION_BACKEND != "gemini":
+        return
+    with _gemini_model_lock:
+        if _gemini_model is not None or _warm_up_thread is not None:
+            return
+        _warm_up_thread = threading.Thread(target=_warm_up, name="gemini-warm-up", daemon=True)
+        _warm_up_thread.start()
+
+
+class TruncatedResponseError(Exception):
+    """응답이 출력 토큰 한도 등으로 중간에 잘린 경우 발생하는 오류"""
+
+
+def _estimate_request_tokens(chunk: str, prompt: str) -> int:
+    """요청 하나가 사용할 토큰 수 추정 (프롬프트 + 예상 번역문)"""
+    return estimate_tokens(prompt) + int(estimate_tokens(chunk) * OUTPUT_TOKEN_RATIO)
+
+
+def _record_usage(estimated_tokens: int, response):
+    """응답에 실제 토큰 사용량이 있으면 스케줄러의 토큰 버킷 보정 및 성능 지표 기록"""
+    usage = getattr(response, 'usage_metadata', None)
+    total_tokens = getattr(usage, 'total_token_count', None)
+    if total_tokens:
+        get_scheduler().record_usage(estimated_tokens, total_tokens)
+    metrics.count('input_tokens', getattr(usage, 'prompt_token_count', None) or 0)
+    metrics.count('output_tokens', getattr(usage, 'candidates_token_count', None) or 0)
+
+
+def _is_truncated(response, chunk: str, translated: str) -> bool:
+    """
+    응답이 중간에 잘렸는지 확인하는 함수
+
+    종료 이유가 MAX_TOKENS이면 잘린 것이고, 종료 이유가 정상이어도 긴 원문에 비해
+    번역문이 지나치게 짧으면 뒷부분이 빠진 것으로 본다.
+    """
+    candidates = getattr(response, 'candidates', None) or []
+    finish_reason = getattr(candidates[0], 'finish_reason', None) if candidates else None
+    if getattr(finish_reason, 'name', finish_reason) in ('MAX_TOKENS', 2):
+        return True
+    return len(chunk) >= TRUNCATION_CHECK_MIN_CHARS and len(translated.strip()) < len(chunk) * MIN_OUTPUT_CHAR_RATIO
+
+
+def _translate_chunk(model, chunk: str, session_id: str = "default",
+                     on_partial: Optional[Callable[[str], None]] = None) -> str:
+    """
+    청크 하나를 번역하는 함수 (스케줄러를 거쳐 요청 한도를 지키고, 잘린 응답이면 TruncatedResponseError)
+
+    on_partial을 주면 응답을 스트리밍으로 받으면서 지금까지 받은 번역문으로 호출한다 (진행 중 미리 보기용).
+    잘린 응답인지는 응답을 모두 받은 뒤에 확인하므로 미리 보기에는 나중에 버려지는 내용이 보일 수 있다.
+    """
+    with metrics.stage("prompt"):
+        prompt = TRANSLATION_PROMPT.format(text=chunk)
+        estimated_tokens = _estimate_request_tokens(chunk, prompt)
+    metrics.count('source_bytes', len(chunk.encode('utf-8')))
+    generation_config = {'max_output_tokens': MAX_OUTPUT_TOKENS}
+
+    def request():
+        # 요청 한도 대기(rate_limit_wait)와 재시도 백오프(retry_backoff)는 스케줄러가 따로 기록하므로
+        # 제미나이 호출 시간에는 실제 요청과 응답을 받는 시간만 넣음
+        with metrics.stage("gemini"):
+            if on_partial is None:
+                response = model.generate_content(prompt, generation_config=generation_config)
+                try:
+                    return response, response.text
+                except ValueError:
+                    # 텍스트가 없는 응답 (출력 한도를 모두 생각 토큰에 쓴 경우 등)
+                    return response, ""
+
+            # 스트리밍 중에 429 등으로 끊겨도 스케줄러가 처음부터 다시 요청하도록 응답을 이 안에서 모두 받음
+            response = model.generate_content(prompt, stream=True, generation_config=generation_config)
+            parts = []
+            for part in response:
+                try:
+                    piece = part.text
+                except ValueError:
+                    # 텍스트가 없는 조각 (종료 신호 등)
+                    continue
+                if piece:
+                    parts.append(piece)
+                    on_partial("".join(parts))
+            return response, "".join(parts)
+
+    response, translated = get_scheduler().execute(request, estimated_tokens=estimated_tokens,
+                                                   session_id=session_id)
+    _record_usage(estimated_tokens, response)
+
+    if _is_truncated(response, chunk, translated):
+        raise TruncatedResponseError(f"응답이 잘렸습니다 (원문 {len(chunk)}자, 번역문 {len(translated)}자)")
+    metrics.count('translated_bytes', len(translated.encode('utf-8')))
+    return translated
+
+
+def _translate_with_resplit(model, chunk: str, session_id: str = "default", depth: int = 0,
+                            on_partial: Optional[Callable[[str], None]] = None) -> str:
+    """
+    청크 하나를 번역하고, 응답이 잘리면 그 청크만 절반 크기로 나누어 다시 번역하는 함수
+
+    MAX_RESPLIT_DEPTH번 나누어도 잘리면 번역문 일부가 빠진 채 저장되지 않도록 오류를 낸다.
+    """
+    try:
+        return _translate_chunk(model, chunk, session_id, on_partial)
+    except TruncatedResponseError as e:
+        metrics.count('truncations')
+        pieces = split_text_into_chunks(chunk, max(1, estimate_tokens(chunk) // 2))
+        if depth >= MAX_RESPLIT_DEPTH or len(pieces) < 2:
+            raise Exception(f"청크를 나누어 다시 번역해도 응답이 잘립니다: {str(e)}")
+
+        done = []
+        for piece in pieces:
+            # 미리 보기에는 앞서 끝난 조각 뒤에 지금 번역 중인 조각을 이어 붙여서 보여줌
+            piece_partial = None
+            if on_partial:
+                piece_partial = lambda text, prefix=list(done): on_partial("\n\n".join(prefix + [text]))
+            done.append(_translate_with_resplit(model, piece, session_id, depth + 1, piece_partial))
+        return "\n\n".join(done)
+
+
+def _split_marked_output(output: str, count: int) -> Optional[List[str]]:
+    """번호 표시가 붙은 번역문을 문단별로 나누는 함수 (표시가 0..count-1 순서대로 없으면 None)"""
+    parts = _SEGMENT_MARKER.split(output)
+    if [int(number) for number in parts[1::2]] != list(range(count)):
+        return None
+    pieces = [piece.strip() for piece in parts[2::2]]
+    if not all(pieces):
+        return None
+    # 첫 표시 앞에 나온 내용(제목 등)은 첫 문단에 붙임
+    if parts[0].strip():
+        pieces[0] = f"{parts[0].strip()}\n{pieces[0]}"
+    return pieces
+
+
+def _translate_segments(model, chunk: str, session_id: str = "default",
+                       on_partial: Optional[Callable[[str], None]] = None) -> str:
+    """
+    청크를 문단 단위로 나누어 번역이 필요한 문단만 번역하는 함수
+
+    참고문헌, 표, 수식, URL 목록처럼 번역할 필요가 없는 문단은 원문 그대로 두고, 번역 메모리에
+    같거나 거의 같은 문단이 있으면 재사용한다. 나머지 문단에는 번호 표시를 붙여 보내고,
+    번역문을 표시 기준으로 나누어 원래 자리에 끼워 넣은 뒤 문단별로 번역 메모리에 저장한다.
+    on_partial은 스트리밍으로 받는 중인 번역문(번호 표시는 뺌)으로 호출된다.
+    """
+    segments = split_paragraphs(chunk)
+    translated = [None] * len(segments)
+    if PASSTHROUGH_ENABLED:
+        for i, segment in enumerate(segments):
+            if classify_segment(segment):
+                translated[i] = segment
+                metrics.count('passthrough_segments')
+                metrics.count('passthrough_tokens', estimate_tokens(segment))
+
+    memory = get_translation_memory()
+    model_name = _cache_model_name()
+    pending = [i for i, text in enumerate(translated) if text is None]
+    if memory and pending:
+        for i, text in zip(pending, memory.lookup([segments[i] for i in pending], model_name)):
+            translated[i] = text
+    missing = [i for i, text in enumerate(translated) if text is None]
+    metrics.count('memory_hits', len(pending) - len(missing))
+
+    if not missing:
+        return "\n\n".join(translated)
+    if memory is None and len(missing) == len(segments):
+        return _translate_with_resplit(model, chunk, session_id, on_partial=on_partial)
+
+    marked = "\n\n".join(f"[[{n}]] {segments[i]}" for n, i in enumerate(missing))
+    marked_partial = (lambda text: on_partial(_SEGMENT_MARKER.sub("", text))) if on_partial else None
+    output = _translate_with_resplit(model, marked, session_id, on_partial=marked_partial)
+    pieces = _split_marked_output(output, len(missing))
+    if pieces is None:
+        # 모델이 표시를 빠뜨려 문단별로 나눌 수 없으면 번역 메모리에 저장하지 않음
+        if len(missing) == len(segments):
+            return _SEGMENT_MARKER.sub("", output)
+        # 원문 그대로 두거나 재사용한 문단 사이에 끼워 넣을 수 없으므로 청크 전체를 다시 번역
+        return _translate_with_resplit(model, chunk, session_id, on_partial=on_partial)
+
+    for i, piece in zip(missing, pieces):
+        translated[i] = piece
+    if memory:
+        memory.put([(segments[i], piece) for i, piece in zip(missing, pieces)], model_name)
+    return "\n\n".join(translated)
+
+
+def _cache_key(chunk: str) -> str:
+    """청크의 캐시 키 (원문 해시 + 프롬프트 해시 + 모델 이름)"""
+    return make_cache_key(chunk, TRANSLATION_PROMPT, _cache_model_name())
+
+
+def translate_chunk(chunk: str, session_id: str = "default") -> str:
+    """
+    청크 하나를 번역하는 함수 (캐시에 있으면 API를 호출하지 않음)
+
+    Args:
+        chunk: 번역할 영어 청크
+        session_id: 요청 스케줄러의 공정 대기열에 사용할 세션 식별자
+
+    Returns:
+        str: 번역된 한국어 텍스트
+    """
+    cache = get_translation_cache()
+    if cache:
+        cached = cache.get(_cache_key(chunk))
+        if cached is not None:
+            metrics.count('cache_hits')
+            return cached
+
+    translated = _translate_segments(_get_model(), chunk, session_id)
+    if cache:
+        cache.put(_cache_key(chunk), _cache_model_name(), translated)
+    return translated
+
+
+def translate_text(text: str, session_id: str = "default") -> str:
+    """
+    구글 제미나이 API를 사용하여 영어 텍스트를 한국어로 번역하는 함수
+
+    긴 텍스트는 섹션/문단 경계에서 청크로 나누어 워커 풀에서 동시에 번역한 뒤
+    원문 순서대로 다시 합친다. 이미 번역된 청크는 캐시에서 바로 가져오고, 캐시에 없는 청크도
+    번역할 필요가 없는 문단(참고문헌, 표 등)이나 번역 메모리에 있는 문단은 보내지 않는다.
+
+    Args:
+        text: 번역할 영어 텍스트
+        session_id: 요청 스케줄러의 공정 대기열에 사용할 세션 식별자
+
+    Returns:
+        str: 번역된 한국어 텍스트
+    """
+    try:
+        # 청크 분할
+        chunks = split_text_into_chunks(text)
+        if not chunks:
+            return ""
+
+        # 캐시 조회
+        cache = get_translation_cache()
+        translated_chunks = [cache.get(_cache_key(chunk)) if cache else None for chunk in chunks]
+        missing = [i for i, translated in enumerate(translated_chunks) if translated is None]
+        metrics.count('cache_hits', len(chunks) - len(missing))
+
+        # 캐시에 없는 청크만 API로 번역
+        if missing:
+            model = _get_model()
+
+            # 번역 실행 (map은 입력 순서대로 결과를 돌려줌)
+            workers = max(1, min(MAX_CONCURRENCY, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    metrics.bind(lambda i: _translate_segments(model, chunks[i], session_id)), missing)
+                for i, translated in zip(missing, results):
+                    translated_chunks[i] = translated
+                    if cache:
+                        cache.put(_cache_key(chunks[i]), _cache_model_name(), translated)
+
+        return "\n\n".join(translated_chunks)
+
+    except Exception as e:
+        raise Exception(f"번역 중 오류가 발생했습니다: {str(e)}")
+
+
+def translate_text_stream(text: str, session_id: str = "default") -> Iterator[str]:
+    """
+    번역 결과를 청크가 끝나는 대로 조금씩 돌려주는 스트리밍 번역 함수
+
+    Args:
+        text: 번역할 영어 텍스트
+        session_id: 요청 스케줄러의 공정 대기열에 사용할 세션 식별자
+
+    Yields:
+        str: 번역된 한국어 텍스트 조각 (모두 이어 붙이면 translate_text 결과와 같은 형식)
+    """
+    yield from translate_chunks_stream(split_text_into_chunks(text), session_id=session_id)
+
+
+def translate_chunks_stream(chunks: List[str], completed: Optional[Dict[int, str]] = None,
+                            on_chunk_done: Optional[Callable[[int, str], None]] = None,
+                            session_id: str = "default",
+                            on_chunk_partial: Optional[Callable[[int, str], None]] = None) -> Iterator[str]:
+    """
+    미리 나눈 청크 목록을 번역하면서 원문 순서대로 결과를 내보내는 함수
+
+    번역이 필요한 청크는 워커 풀에서 동시에 번역하고, 앞쪽 청크부터 끝나는 대로 내보낸다.
+    잘린 응답은 다시 번역해야 하므로 응답 조각이 아니라 검사를 마친 청크 단위로 내보내고,
+    번역 중인 청크의 응답 조각은 on_chunk_partial로 따로 전달한다 (진행 중 미리 보기용).
+    이미 번역된 청크(completed)나 캐시에 있는 청크는 API 호출 없이 즉시 내보낸다.
+
+    Args:
+        chunks: 번역할 청크 목록
+        completed: 이전 실행에서 이미 번역된 청크 {청크 번호: 번역문} (작업 재개용)
+        on_chunk_done: 청크 하나의 번역이 끝날 때마다 (청크 번호, 번역문)으로 호출되는 콜백
+        session_id: 요청 스케줄러의 공정 대기열에 사용할 세션 식별자
+        on_chunk_partial: 번역 중인 청크의 응답을 받는 동안 (청크 번호, 지금까지 받은 번역문)으로 호출되는 콜백
+
+    Yields:
+        str: 번역된 한국어 텍스트 조각
+    """
+    try:
+        if not chunks:
+            return
+
+        completed = completed or {}
+        cache = get_translation_cache()
+        ready = []
+        for i, chunk in enumerate(chunks):
+            translated = completed.get(i)
+            if translated is None and cache:
+                translated = cache.get(_cache_key(chunk))
+                if translated is not None:
+                    metrics.count('cache_hits')
+                    # 캐시에서 찾은 청크도 체크포인트로 남김
+                    if on_chunk_done:
+                        on_chunk_done(i, translated)
+            ready.append(translated)
+
+        missing = [i for i, translated in enumerate(ready) if translated is None]
+        model = _get_model() if missing else None
+
+        def finish_chunk(i: int, translated: str):
+            if cache:
+                cache.put(_cache_key(chunks[i]), _cache_model_name(), translated)
+            if on_chunk_done:
+                on_chunk_done(i, translated)
+
+        def translate_in_background(i: int) -> str:
+            on_partial = (lambda text: on_chunk_partial(i, text)) if on_chunk_partial else None
+            translated = _translate_segments(model, chunks[i], session_id, on_partial)
+            finish_chunk(i, translated)
+            return translated
+
+        workers = max(1, min(MAX_CONCURRENCY, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {i: executor.submit(metrics.bind(translate_in_background), i) for i in missing}
+
+            for i in range(len(chunks)):
+                if i > 0:
+                    yield "\n\n"
+                yield ready[i] if ready[i] is not None else futures[i].result()
+
     except Exception as e:
         raise Exception(f"번역 중 오류가 발생했습니다: {str(e)}")